@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Benchmark rendering the configuration and compare it to a baseline.
+
+Timings are stored relative to a fixed pure Python workload measured right
+before each run, so a baseline recorded on one machine is roughly comparable
+to a run on another one or on a busy machine.
+"""
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from .shared.packages import TYPES
+
+
+BASELINE_PATH = pathlib.Path(__file__).parent / 'benchmark-baseline.json'
+#: Option combinations: `config-package` arguments and additional lines in
+#: the `[coverage]` section of `.meta.toml`. `overrides` uses an overridden
+#: `tox-lint.j2`.
+FLAGS = {
+    'default': ([], ''),
+    'docs': (['--with-docs'], ''),
+    'pypy': (['--with-pypy'], ''),
+    'windows': (['--with-windows'], ''),
+    'free-threaded': (['--with-free-threaded-python'], ''),
+    'coverage-combine': ([], 'combine = true\n'),
+    'overrides': ([], ''),
+}
+#: Slow down factor against the baseline which counts as a regression.
+THRESHOLD = 1.5
+#: Smaller slow downs in units of calibrate() are noise, not a regression.
+MIN_DIFFERENCE = 0.25
+
+
+def calibrate():
+    """Run the reference workload the timings are divided by."""
+    return sum(i * i for i in range(100_000))
+
+
+def make_package(parent, config_type, flag):
+    """Create a package to be configured with `flag` and return its args."""
+    from .config_package import handle_command_line_arguments
+
+    argv, coverage = FLAGS[flag]
+    path = pathlib.Path(parent) / f'{config_type}-{flag}'
+    (path / '.git').mkdir(parents=True)
+    (path / 'setup.py').write_text(
+        'from setuptools import setup\nsetup(name="foo.bar")\n')
+    (path / '.meta.toml').write_text(
+        f'[meta]\ntemplate = "{config_type}"\n\n'
+        f'[coverage]\nfail-under = 90\n{coverage}')
+    if config_type == 'toolkit':
+        # Its template does not contain the coverage settings the toolkit
+        # already has.
+        (path / 'pyproject.toml').write_text(
+            '[tool.coverage.run]\nbranch = true\n\n'
+            '[tool.coverage.report]\nexclude_lines = []\n')
+    if flag == 'overrides':
+        overrides = path.parent / 'overrides'
+        (overrides / 'default').mkdir(parents=True, exist_ok=True)
+        shutil.copy(pathlib.Path(__file__).parent / 'default' / 'tox-lint.j2',
+                    overrides / 'default')
+        argv = [*argv, f'--overrides={overrides}']
+    return handle_command_line_arguments([str(path), *argv])
+
+
+def render_cold(args):
+    """Render all files with new Jinja environments."""
+    from .config_package import PackageConfiguration
+    from .config_package import shared_jinja_env
+
+    shared_jinja_env.cache_clear()
+    PackageConfiguration(args).write_files()
+
+
+def render_warm(args):
+    """Render all files with the Jinja environment cached."""
+    from .config_package import PackageConfiguration
+
+    PackageConfiguration(args).write_files()
+
+
+def tomlkit_roundtrip(args):
+    """Parse and serialize the rendered `pyproject.toml`."""
+    import tomlkit
+
+    tomlkit.dumps(tomlkit.loads((args.path / 'pyproject.toml').read_text()))
+
+
+def write_meta_toml(args):
+    """Read and write back `.meta.toml`."""
+    from .config_package import PackageConfiguration
+
+    package = PackageConfiguration(args)
+    package.write_meta_toml()
+    package.project.save()
+
+
+def timeit(func, *args, repeat=5):
+    """Return the fastest of `repeat` runs of `func` in units of calibrate().
+    """
+    timings = []
+    units = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        calibrate()
+        middle = time.perf_counter()
+        func(*args)
+        units.append(middle - start)
+        timings.append(time.perf_counter() - middle)
+    return round(min(timings) / min(units), 2)
+
+
+def run(types=TYPES, flags=FLAGS, repeat=5):
+    """Run the benchmarks and return their timings."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, \
+            contextlib.redirect_stdout(io.StringIO()):
+        for config_type in types:
+            for flag in flags:
+                args = make_package(tmp, config_type, flag)
+                # The first rendering creates the files the others update.
+                render_cold(args)
+                name = f'{config_type}/{flag}'
+                results[f'{name}/render-cold'] = timeit(
+                    render_cold, args, repeat=repeat)
+                results[f'{name}/render-warm'] = timeit(
+                    render_warm, args, repeat=repeat)
+            results[f'{config_type}/tomlkit-roundtrip'] = timeit(
+                tomlkit_roundtrip, args, repeat=repeat)
+            results[f'{config_type}/write-meta-toml'] = timeit(
+                write_meta_toml, args, repeat=repeat)
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Return the regressions as `{name: (baseline, result)}`."""
+    return {
+        name: (baseline[name], value)
+        for name, value in results.items()
+        if name in baseline and value > baseline[name] * threshold
+        and value - baseline[name] > MIN_DIFFERENCE}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark rendering the configuration of packages and'
+                    ' compare the timings to a baseline.')
+    parser.add_argument(
+        '-t', '--type',
+        dest='types',
+        choices=TYPES,
+        action='append',
+        help='Only benchmark this configuration type. Can be given multiple'
+        ' times.')
+    parser.add_argument(
+        '--flag',
+        dest='flags',
+        choices=list(FLAGS),
+        action='append',
+        help='Only benchmark this option combination. Can be given multiple'
+        ' times.')
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Number of runs per benchmark, the fastest one counts.'
+        ' Defaults to: %(default)s')
+    parser.add_argument(
+        '--baseline',
+        type=pathlib.Path,
+        default=BASELINE_PATH,
+        help='Path of the baseline file. Defaults to the one stored in the'
+        ' repository.')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=THRESHOLD,
+        help='Slow down factor counting as a regression. Defaults to:'
+        ' %(default)s')
+    parser.add_argument(
+        '--update-baseline',
+        dest='update_baseline',
+        action='store_true',
+        default=False,
+        help='Store the results as the new baseline instead of comparing.')
+    args = parser.parse_args()
+
+    results = run(args.types or TYPES, args.flags or FLAGS, args.repeat)
+    if args.update_baseline:
+        baseline = {}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text())
+        baseline.update(results)
+        args.baseline.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        print(f'Stored {len(results)} results in {args.baseline}.')
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    for name, value in results.items():
+        expected = baseline.get(name)
+        ratio = f'{value / expected:5.2f}x' if expected else '  new'
+        print(f'{name:45} {value:9.2f} {ratio}')
+    regressions = compare(results, baseline, args.threshold)
+    compared = [n for n in results if n in baseline]
+    if compared:
+        change = statistics.geometric_mean(
+            results[n] / baseline[n] for n in compared)
+        print(f'Geometric mean against the baseline: {change:.2f}x')
+    if regressions:
+        print(f'{len(regressions)} benchmarks are more than'
+              f' {args.threshold}x slower than the baseline:')
+        for name, (expected, value) in regressions.items():
+            print(f'  {name}: {expected} -> {value}')
+        sys.exit(1)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""List the generated files in the packages a template change can affect."""
+import argparse
+import json
+import pathlib
+
+from .shared.packages import load_toml
+from .shared.packages import registry
+from .shared.templates import TemplateGraph
+from .shared.templates import template_folders
+
+
+def package_context(meta_toml_path):
+    """Return the known template context values of a package.
+
+    They are read from its `.meta.toml`, options which are not set there are
+    left out as `config-package` could still switch them on.
+    """
+    meta_cfg = load_toml(meta_toml_path)
+    context = {}
+    for key, value in meta_cfg.get('python', {}).items():
+        if key.startswith('with-'):
+            context[key.replace('-', '_')] = value
+    if 'combine' in meta_cfg.get('coverage', {}):
+        context['coverage_combine'] = meta_cfg['coverage']['combine']
+    if 'collect-in-matrix' in meta_cfg.get('coverage', {}):
+        context['coverage_in_matrix'] = (
+            meta_cfg['coverage']['collect-in-matrix'])
+    if 'shards' in meta_cfg.get('github-actions', {}):
+        context['shards'] = meta_cfg['github-actions']['shards']
+    if 'detect-changes' in meta_cfg.get('github-actions', {}):
+        context['detect_changes'] = (
+            meta_cfg['github-actions']['detect-changes'])
+    if 'build-once' in meta_cfg.get('github-actions', {}):
+        context['build_once'] = meta_cfg['github-actions']['build-once']
+    if 'importtime' in meta_cfg:
+        context['with_importtime'] = bool(
+            meta_cfg['importtime'].get('cumulative-budget')
+            or meta_cfg['importtime'].get('max-modules'))
+    if meta_cfg.get('github-actions', {}).get('matrix-mode') == 'full':
+        context['gha_edges_exclude'] = []
+    if 'trusted-publishing' in meta_cfg.get('pypi', {}):
+        context['use_trusted_publishing'] = (
+            meta_cfg['pypi']['trusted-publishing'])
+    return context
+
+
+def blast_radius(changed_files=(), variables=(), overrides_path=None,
+                 clones=None):
+    """Return the generated files which can change.
+
+    They can change because one of the template files in `changed_files`
+    changed or because one of the context `variables` is computed
+    differently. With a folder of `clones` their `.meta.toml` files are used
+    to rule out templates parts not used by a package.
+
+    Return a list of `(package, output file, template name)` tuples.
+    """
+    from .config_package import TEMPLATE_OUTPUTS
+    from .config_package import shared_jinja_env
+
+    variables = set(variables)
+    result = []
+    for config_type, names in registry(overrides_path).items():
+        graph = TemplateGraph(shared_jinja_env(
+            tuple(template_folders(config_type, overrides_path))))
+        templates = [
+            name for name in TEMPLATE_OUTPUTS
+            if graph.filename(name) is not None
+            and not (name == 'MANIFEST.in.j2' and config_type == 'toolkit')]
+        reading = {name for name in templates
+                   if variables & graph.variables(name)}
+        for package in names:
+            context = {'config_type': config_type}
+            if clones:
+                context.update(
+                    package_context(clones / package / '.meta.toml'))
+            affected = {
+                name for name in templates
+                if name in reading
+                or graph.affected_by(name, changed_files, context)}
+            if 'pyproject_defaults.toml.j2' in affected:
+                # `tox.ini` uses the build requirements from `pyproject.toml`.
+                affected.add('tox.ini.j2')
+            if not context.get('with_docs', True):
+                affected.discard('readthedocs.yaml.j2')
+            result.extend(
+                (package, TEMPLATE_OUTPUTS[name], name)
+                for name in templates if name in affected)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='List the generated files in all known packages which can'
+                    ' change when the given templates change.')
+    parser.add_argument(
+        'templates', metavar='TEMPLATE', type=pathlib.Path, nargs='*',
+        help='path to a changed template file')
+    parser.add_argument(
+        '--variable',
+        dest='variables',
+        metavar='NAME',
+        action='append',
+        default=[],
+        help='Also list the files rendered from templates reading the context'
+        ' variable NAME. Can be given multiple times.')
+    parser.add_argument(
+        '--clones',
+        type=pathlib.Path,
+        default=None,
+        help='Path to a folder containing clones of the packages. Their'
+        ' .meta.toml is used to leave out template parts they do not use.')
+    parser.add_argument(
+        '--overrides',
+        type=pathlib.Path,
+        dest='overrides_path',
+        default=None,
+        help='Filesystem path to a folder with subfolders for configuration '
+        'types. Used to override built-in configuration templates.')
+    parser.add_argument(
+        '--json',
+        dest='json',
+        action='store_true',
+        default=False,
+        help='Print a JSON mapping of package names to template names and'
+        ' output files.')
+    args = parser.parse_args()
+
+    pairs = blast_radius(args.templates, args.variables, args.overrides_path,
+                         args.clones)
+    known = sum(map(len, registry(args.overrides_path).values()))
+    if args.json:
+        result = {}
+        for package, output, template in pairs:
+            result.setdefault(package, {})[template] = output
+        print(json.dumps(result, indent=2))
+    else:
+        for package, output, _ in pairs:
+            print(f'{package}\t{output}')
+        print(f'{len(pairs)} files in {len({p[0] for p in pairs})} of'
+              f' {known} packages can change.')
@@ -15,35 +15,36 @@ import collections
 import pathlib
 import re
 import shutil
+from functools import cache
 from functools import cached_property
 
-import jinja2
-import tomlkit
-from packaging.version import InvalidVersion
-from packaging.version import parse as parse_version
-
-from .set_branch_protection_rules import set_branch_protection
 from .shared.call import abort
 from .shared.call import call
 from .shared.git import create_pull_request
 from .shared.git import get_branch_name
 from .shared.git import get_commit_id
 from .shared.git import git_branch
+from .shared.packages import AARCH64_TEST_PYTHON
+from .shared.packages import BUILD_ONCE_TYPES
+from .shared.packages import COVERAGE_IN_MATRIX_TYPES
 from .shared.packages import FUTURE_PYTHON_VERSION
 from .shared.packages import MANYLINUX_AARCH64
 from .shared.packages import MANYLINUX_I686
 from .shared.packages import MANYLINUX_PYTHON_VERSION
 from .shared.packages import MANYLINUX_X86_64
+from .shared.packages import MATRIX_MODES
 from .shared.packages import META_HINT
 from .shared.packages import META_HINT_MARKDOWN
 from .shared.packages import NEWEST_PYTHON_VERSION
 from .shared.packages import OLDEST_PYTHON_VERSION
 from .shared.packages import PYPY_VERSION
 from .shared.packages import SETUPTOOLS_VERSION_SPEC
-from .shared.packages import get_pyproject_toml
+from .shared.packages import SHARDS_TYPES
 from .shared.packages import parse_additional_config
 from .shared.packages import supported_python_versions
 from .shared.path import change_dir
+from .shared.project import ProjectFiles
+from .shared.rewrite import Rewriter
 from .shared.script_args import get_shared_parser
 
 
@@ -58,10 +59,53 @@ SETUP_PY_REPLACEMENTS = {
     'Framework :: Zope2': 'Framework :: Zope :: 2',
     'Framework :: Zope3': 'Framework :: Zope :: 3',
 }
+#: The methods of `PackageConfiguration` rendering the top-level templates.
+TEMPLATE_RENDERERS = {
+    'readthedocs.yaml.j2': 'readthedocs',
+    'pyproject_defaults.toml.j2': 'pyproject_toml',
+    'setup.cfg.j2': 'setup_cfg',
+    'gitignore.j2': 'gitignore',
+    'pre-commit-config.yaml.j2': 'pre_commit_config_yaml',
+    'editorconfig.txt': 'editorconfig',
+    'CONTRIBUTING.md': 'contributing_md',
+    'manylinux.sh': 'manylinux_sh',
+    'manylinux-install.sh.j2': 'manylinux_sh',
+    'tox.ini.j2': 'tox',
+    'importtime.py.j2': 'tox',
+    'tests.yml.j2': 'tests_yml',
+    'test-shards.py.j2': 'tests_yml',
+    'pre-commit.yml.j2': 'pre_commit_yml',
+    'benchmarks.yml.j2': 'benchmarks',
+    'benchmarks.py.j2': 'benchmarks',
+    'MANIFEST.in.j2': 'manifest_in',
+}
+#: The files in the package the top-level templates are rendered to.
+TEMPLATE_OUTPUTS = {
+    'readthedocs.yaml.j2': '.readthedocs.yaml',
+    'pyproject_defaults.toml.j2': 'pyproject.toml',
+    'setup.cfg.j2': 'setup.cfg',
+    'gitignore.j2': '.gitignore',
+    'pre-commit-config.yaml.j2': '.pre-commit-config.yaml',
+    'editorconfig.txt': '.editorconfig',
+    'CONTRIBUTING.md': 'CONTRIBUTING.md',
+    'manylinux.sh': '.manylinux.sh',
+    'manylinux-install.sh.j2': '.manylinux-install.sh',
+    'tox.ini.j2': 'tox.ini',
+    'importtime.py.j2': '.github/importtime.py',
+    'tests.yml.j2': '.github/workflows/tests.yml',
+    'test-shards.py.j2': '.github/test-shards.py',
+    'pre-commit.yml.j2': '.github/workflows/pre-commit.yml',
+    'benchmarks.yml.j2': '.github/workflows/benchmarks.yml',
+    'benchmarks.py.j2': '.github/benchmarks.py',
+    'MANIFEST.in.j2': 'MANIFEST.in',
+}
 
 
-def handle_command_line_arguments():
-    """Parse command line options"""
+def handle_command_line_arguments(argv=None):
+    """Parse command line options
+
+    `argv` defaults to the arguments of the current process.
+    """
     parser = get_shared_parser('Use configuration for a package.',
                                interactive=False)
     parser.add_argument(
@@ -120,6 +164,13 @@ def handle_command_line_arguments():
         default=False,
         help='Activate running tests with free-threaded Python (nogil) '
         'if not already configured in .meta.toml.')
+    parser.add_argument(
+        '--with-benchmarks',
+        dest='with_benchmarks',
+        action='store_true',
+        default=False,
+        help='Activate running the pyperf benchmarks in benchmarks/ '
+        'if not already configured in .meta.toml.')
     parser.add_argument(
         '-t', '--type',
         choices=[
@@ -133,8 +184,23 @@ def handle_command_line_arguments():
         dest='type',
         help='type of the configuration to be used, see README.rst. '
         'Only required when running on a repository for the first time.')
-
-    args = parser.parse_args()
+    parser.add_argument(
+        '--watch',
+        dest='watch',
+        action='store_true',
+        default=False,
+        help='Watch the templates and show how changing them changes the '
+        'configuration of the package instead of configuring it.')
+    parser.add_argument(
+        '--watch-also',
+        dest='watch_also',
+        metavar='PATH',
+        type=pathlib.Path,
+        nargs='+',
+        default=[],
+        help='Paths to further packages to be shown by --watch.')
+
+    args = parser.parse_args(argv)
     return args
 
 
@@ -150,6 +216,8 @@ def prepend_space(text):
 
 def make_jinja_env(template_folders):
     """Create the Jinja environment used to render the templates."""
+    import jinja2
+
     return jinja2.Environment(
         loader=jinja2.FileSystemLoader(template_folders),
         variable_start_string='%(',
@@ -160,6 +228,23 @@ def make_jinja_env(template_folders):
     )
 
 
+@cache
+def setup_py_rewriter():
+    """Return the `Rewriter` applying `SETUP_PY_REPLACEMENTS`."""
+    return Rewriter(SETUP_PY_REPLACEMENTS)
+
+
+@cache
+def shared_jinja_env(template_folders):
+    """Return the Jinja environment for the tuple `template_folders`.
+
+    The environment is created only once per process for the same folders,
+    so processes configuring several packages reuse the compiled templates.
+    Jinja still reloads a template if its file changed on disk.
+    """
+    return make_jinja_env(list(template_folders))
+
+
 def combined_coverage_envs(supported_versions, additional_envlist=(),
                            with_future_python=False,
                            with_free_threaded_python=False,
@@ -206,6 +291,7 @@ class PackageConfiguration:
     def __init__(self, args):
         self.args = args
         self.path = args.path.absolute()
+        self.project = ProjectFiles(self.path)
         self.meta_cfg = {}
 
         if not (self.path / '.git').exists():
@@ -219,11 +305,9 @@ class PackageConfiguration:
 
     def _read_meta_configuration(self):
         """Read and update meta configuration"""
-        meta_toml_path = self.path / '.meta.toml'
-        if meta_toml_path.exists():
-            with open(meta_toml_path, 'rb') as meta_f:
-                meta_cfg = tomlkit.load(meta_f)
-            meta_cfg = collections.defaultdict(dict, **meta_cfg)
+        if self.project.exists('.meta.toml'):
+            meta_cfg = collections.defaultdict(
+                dict, **self.project.toml('.meta.toml'))
         else:
             meta_cfg = collections.defaultdict(dict)
             if self.args.with_docs is None:
@@ -249,6 +333,9 @@ class PackageConfiguration:
 
     @cached_property
     def oldest_python(self):
+        from packaging.version import InvalidVersion
+        from packaging.version import parse as parse_version
+
         value = (self.args.oldest_python or
                  self.meta_cfg['python'].get('oldest-python') or
                  OLDEST_PYTHON_VERSION)
@@ -285,7 +372,7 @@ class PackageConfiguration:
 
     @cached_property
     def jinja_env(self):
-        return make_jinja_env(self.template_folders)
+        return shared_jinja_env(tuple(self.template_folders))
 
     @cached_property
     def with_macos(self):
@@ -320,6 +407,24 @@ class PackageConfiguration:
     def with_free_threaded_python(self):
         return self._set_python_config_value('free-threaded-python')
 
+    @cached_property
+    def with_benchmarks(self):
+        if self.config_type == 'toolkit':
+            return False
+        return self._set_python_config_value('benchmarks')
+
+    @cached_property
+    def importtime_module(self):
+        return self.cfg_option('importtime', 'module', self.path.name)
+
+    @cached_property
+    def with_importtime(self):
+        """Whether `[importtime]` configures a budget to be checked."""
+        if self.config_type == 'toolkit':
+            return False
+        return bool(self.cfg_option('importtime', 'cumulative-budget', 0)
+                    or self.cfg_option('importtime', 'max-modules', 0))
+
     @cached_property
     def coverage_run_source(self):
         return self.meta_cfg['coverage-run'].get('source', self.path.name)
@@ -330,7 +435,47 @@ class PackageConfiguration:
 
     @cached_property
     def coverage_combine(self):
-        return self.meta_cfg['coverage'].get('combine', False)
+        return (self.meta_cfg['coverage'].get('combine', False)
+                or self.coverage_in_matrix)
+
+    @cached_property
+    def coverage_in_matrix(self):
+        """Collect coverage in the test jobs and combine it in CI."""
+        return (self.meta_cfg['coverage'].get('collect-in-matrix', False)
+                and self.config_type in COVERAGE_IN_MATRIX_TYPES)
+
+    @cached_property
+    def testenv_parallel(self):
+        """Number of zope.testrunner subprocesses, 0 to run in-process."""
+        jobs = self.tox_option('testenv-parallel', 0)
+        return jobs if jobs > 1 else 0
+
+    @cached_property
+    def shards(self):
+        """Number of jobs the tests of a Python version are split into."""
+        if self.config_type not in SHARDS_TYPES:
+            return 0
+        shards = self.gh_option('shards', 0)
+        return shards if shards > 1 else 0
+
+    @cached_property
+    def build_once(self):
+        """Whether the test jobs install the package built by release-check.
+        """
+        if self.config_type not in BUILD_ONCE_TYPES:
+            return False
+        return self.gh_option('build-once', False)
+
+    @cached_property
+    def matrix_mode(self):
+        """`full` runs all Python versions on all OSes, `edges` only on Linux.
+        """
+        value = self.gh_option('matrix-mode', 'full')
+        if value not in MATRIX_MODES:
+            raise ValueError(
+                f'Invalid value {value!r} for [github-actions] matrix-mode,'
+                f' use one of {", ".join(MATRIX_MODES)}.')
+        return value
 
     @cached_property
     def branch_name(self):
@@ -418,11 +563,11 @@ class PackageConfiguration:
 
     def setup_py(self):
         """Update setup.py to current texts."""
-        setup_py = self.path / 'setup.py'
-        setup_py_content = setup_py.read_text()
-        for src, dest in SETUP_PY_REPLACEMENTS.items():
-            setup_py_content = setup_py_content.replace(src, dest)
-        setup_py.write_text(setup_py_content)
+        setup_py_content = self.project.read_text('setup.py')
+        if setup_py_content is None:
+            return
+        setup_py_content, _ = setup_py_rewriter().rewrite(setup_py_content)
+        self.project.write_text('setup.py', setup_py_content)
 
     def gitignore(self):
         git_ignore = self.meta_cfg['git'].get('ignore', [])
@@ -433,6 +578,15 @@ class PackageConfiguration:
             git_ignore=git_ignore,
         )
 
+    def editorconfig(self):
+        self.copy_with_meta(
+            'editorconfig.txt', self.path / '.editorconfig', self.config_type)
+
+    def contributing_md(self):
+        self.copy_with_meta(
+            'CONTRIBUTING.md', self.path / 'CONTRIBUTING.md', self.config_type,
+            meta_hint=META_HINT_MARKDOWN)
+
     def pre_commit_config_yaml(self):
         teyit_exclude = self.meta_cfg["pre-commit"].get("teyit-exclude", "")
         pyupgrade_exclude = self.meta_cfg["pre-commit"].get(
@@ -471,15 +625,30 @@ class PackageConfiguration:
                 '${PYBIN}/tox -e ${TOXENV}',
                 'cd ..',
             ])
+        manylinux_jobs = self.meta_cfg['c-code'].get('manylinux-jobs', 1)
+        manylinux_ccache = self.cfg_option('c-code', 'manylinux-ccache', False)
+        manylinux_aarch64_test_python = self.meta_cfg['c-code'].get(
+            'manylinux-aarch64-test-python', 'all')
+        if manylinux_aarch64_test_python not in AARCH64_TEST_PYTHON:
+            raise ValueError(
+                f'Invalid value {manylinux_aarch64_test_python!r} for'
+                ' [c-code] manylinux-aarch64-test-python, use one of'
+                f' {", ".join(AARCH64_TEST_PYTHON)}.')
 
         if self.template_exists('manylinux.sh'):
             self.copy_with_meta(
-                'manylinux.sh', self.path / '.manylinux.sh', self.config_type)
-            (self.path / '.manylinux.sh').chmod(0o755)
-            stop_at = None
-            if not self.with_future_python \
-                    and not self.with_free_threaded_python:
-                stop_at = NEWEST_PYTHON_SHORTVERSION
+                'manylinux.sh', self.path / '.manylinux.sh', self.config_type,
+                executable=True)
+            # The Python versions to build wheels for:
+            manylinux_python_versions = supported_python_versions(
+                self.oldest_python, short_version=True)
+            if self.with_free_threaded_python:
+                manylinux_python_versions.append(NEWEST_PYTHON_SHORTVERSION_T)
+            if self.with_future_python:
+                manylinux_python_versions.append(FUTURE_PYTHON_SHORTVERSION)
+                if self.with_free_threaded_python:
+                    manylinux_python_versions.append(
+                        f'{FUTURE_PYTHON_SHORTVERSION}t')
             pkg_name_pattern = re.sub(r"[-_.]+", "?", self.path.name).lower()
             self.copy_with_meta(
                 'manylinux-install.sh.j2', self.path / '.manylinux-install.sh',
@@ -488,15 +657,18 @@ class PackageConfiguration:
                 package_name_pattern=pkg_name_pattern,
                 manylinux_install_setup=manylinux_install_setup,
                 manylinux_aarch64_tests=manylinux_aarch64_tests,
+                manylinux_aarch64_test_python=manylinux_aarch64_test_python,
+                manylinux_ccache=manylinux_ccache,
+                manylinux_jobs=manylinux_jobs,
+                manylinux_python_versions=manylinux_python_versions,
                 with_future_python=self.with_future_python,
                 with_free_threaded_python=self.with_free_threaded_python,
                 future_python_shortversion=FUTURE_PYTHON_SHORTVERSION,
                 newest_python_shortversion=NEWEST_PYTHON_SHORTVERSION,
                 supported_python_versions=supported_python_versions(
                     self.oldest_python, short_version=True),
-                stop_at=stop_at,
+                executable=True,
             )
-            (self.path / '.manylinux-install.sh').chmod(0o755)
             self.add_manylinux = True
 
     def cfg_option(self, section, name, default=DEFAULT):
@@ -521,9 +693,10 @@ class PackageConfiguration:
         return self.cfg_option('github-actions', name, default)
 
     def tox(self):
-        toml_doc = get_pyproject_toml(self.path / 'pyproject.toml')
+        toml_doc = self.project.read_toml('pyproject.toml')
         build_requirements = toml_doc['build-system'].get('requires', [])
         additional_envlist = self.tox_option('additional-envlist')
+        additional_sections = self.tox_option('additional-sections')
         testenv_additional = self.tox_option('testenv-additional')
         testenv_additional_extras = self.tox_option(
             'testenv-additional-extras')
@@ -549,7 +722,11 @@ class PackageConfiguration:
                 testenv_setenv, '.coverage.{envname}')
             coverage_setenv = prepend_coverage_file(
                 coverage_setenv, '.coverage')
-            if not coverage_command:
+            if not coverage_command and self.testenv_parallel:
+                # `patch = ["subprocess"]` switches on the parallel mode, in
+                # which `coverage erase` deletes the data files to combine.
+                coverage_command = ['coverage combine']
+            elif not coverage_command:
                 coverage_command = ['coverage erase', 'coverage combine']
             if not any(line.startswith('depends')
                        for line in coverage_additional):
@@ -580,23 +757,31 @@ class PackageConfiguration:
             self.path / 'tox.ini',
             self.config_type,
             additional_envlist=additional_envlist,
+            additional_sections=additional_sections,
+            build_once=self.build_once,
             coverage_additional=coverage_additional,
             coverage_basepython=coverage_basepython,
             coverage_command=coverage_command,
+            coverage_in_matrix=self.coverage_in_matrix,
             coverage_run_source=self.coverage_run_source,
             coverage_setenv=coverage_setenv,
             coverage_fail_under=self.coverage_fail_under,
             flake8_additional_sources=flake8_additional_sources,
             isort_additional_sources=isort_additional_sources,
             lint_diff_on_failure=lint_diff_on_failure,
+            package_name=self.path.name,
             testenv_additional=testenv_additional,
             testenv_additional_extras=testenv_additional_extras,
             testenv_skip_test_extra=testenv_skip_test_extra,
             testenv_commands=testenv_commands,
             testenv_commands_pre=testenv_commands_pre,
             testenv_deps=testenv_deps,
+            testenv_parallel=self.testenv_parallel,
             testenv_setenv=testenv_setenv,
+            with_benchmarks=self.with_benchmarks,
             with_docs=self.with_docs,
+            with_importtime=self.with_importtime,
+            importtime_module=self.importtime_module,
             with_free_threaded_python=self.with_free_threaded_python,
             with_future_python=self.with_future_python,
             with_pypy=self.with_pypy,
@@ -609,11 +794,22 @@ class PackageConfiguration:
                 self.oldest_python, short_version=True),
             build_requirements=build_requirements,
         )
+        self.copy_with_meta(
+            'importtime.py.j2',
+            self.path / '.github' / 'importtime.py',
+            self.config_type,
+            importtime_cumulative_budget=self.cfg_option(
+                'importtime', 'cumulative-budget', 0),
+            importtime_max_modules=self.cfg_option(
+                'importtime', 'max-modules', 0),
+            importtime_module=self.importtime_module,
+            importtime_runs=self.cfg_option('importtime', 'runs', 5),
+            importtime_top=self.cfg_option('importtime', 'top', 10),
+            with_importtime=self.with_importtime,
+        )
 
     def tests_yml(self):
         workflows = self.path / '.github' / 'workflows'
-        workflows.mkdir(parents=True, exist_ok=True)
-
         gha_services = self.gh_option('services')
         gha_additional_config = self.gh_option('additional-config')
         gha_additional_exclude = self.gh_option('additional-exclude')
@@ -627,20 +823,35 @@ class PackageConfiguration:
                            supported_python_versions(self.oldest_python,
                                                      short_version=True))]
         pypi_tp = self.meta_cfg['pypi'].get('trusted-publishing', False)
+        # (Python version, tox env) of the configs run only on Linux:
+        gha_edges_exclude = []
+        if self.matrix_mode == 'edges':
+            gha_edges_exclude = [(long, f'py{short}')
+                                 for long, short in py_version_matrix[1:-1]]
+            if self.with_future_python:
+                gha_edges_exclude.append(
+                    (FUTURE_PYTHON_VERSION, f'py{FUTURE_PYTHON_SHORTVERSION}'))
+            if self.with_pypy:
+                gha_edges_exclude.append((f'pypy-{PYPY_VERSION}', 'pypy3'))
 
         self.copy_with_meta(
             'tests.yml.j2',
             workflows / 'tests.yml',
             self.config_type,
             package_name=self.path.name,
+            build_once=self.build_once,
             gha_additional_config=gha_additional_config,
             gha_additional_exclude=gha_additional_exclude,
             gha_additional_install=gha_additional_install,
+            gha_edges_exclude=gha_edges_exclude,
+            detect_changes=self.gh_option('detect-changes', False),
             gha_test_environment=gha_test_environment,
             gha_test_commands=gha_test_commands,
             gha_skip_env_regex=skip_env_regex(self.with_docs),
             gha_services=gha_services,
+            compiler_cache=self.cfg_option('c-code', 'compiler-cache', False),
             coverage_combine=self.coverage_combine,
+            coverage_in_matrix=self.coverage_in_matrix,
             gha_steps_before_checkout=gha_steps_before_checkout,
             with_docs=self.with_docs,
             with_sphinx_doctests=self.with_sphinx_doctests,
@@ -655,6 +866,8 @@ class PackageConfiguration:
             with_windows=self.with_windows,
             manylinux_python_version=MANYLINUX_PYTHON_VERSION,
             manylinux_aarch64=MANYLINUX_AARCH64,
+            manylinux_ccache=self.cfg_option(
+                'c-code', 'manylinux-ccache', False),
             manylinux_i686=MANYLINUX_I686,
             manylinux_x86_64=MANYLINUX_X86_64,
             pypy_version=PYPY_VERSION,
@@ -662,12 +875,23 @@ class PackageConfiguration:
             future_python_shortversion=FUTURE_PYTHON_SHORTVERSION,
             supported_python_versions=py_version_matrix,
             use_trusted_publishing=pypi_tp,
+            shards=self.shards,
+        )
+        self.copy_with_meta(
+            'test-shards.py.j2',
+            self.path / '.github' / 'test-shards.py',
+            self.config_type,
+            shards=self.shards,
         )
+        if self.shards and not (
+                self.path / '.github' / 'test-timings.json').exists():
+            print('XXX There are no test timings yet, the first shard runs'
+                  ' all tests.')
+            print('XXX Commit the artifact of the "test-timings" job as'
+                  ' .github/test-timings.json.')
 
     def pre_commit_yml(self):
         workflows = self.path / ".github" / "workflows"
-        workflows.mkdir(parents=True, exist_ok=True)
-
         self.copy_with_meta(
             "pre-commit.yml.j2",
             workflows / "pre-commit.yml",
@@ -675,6 +899,26 @@ class PackageConfiguration:
             package_name=self.path.name,
         )
 
+    def benchmarks(self):
+        """Add the workflow comparing the benchmarks of pull requests."""
+        self.copy_with_meta(
+            'benchmarks.yml.j2',
+            self.path / '.github' / 'workflows' / 'benchmarks.yml',
+            self.config_type,
+            newest_python_version=NEWEST_PYTHON_VERSION,
+            with_benchmarks=self.with_benchmarks,
+        )
+        self.copy_with_meta(
+            'benchmarks.py.j2',
+            self.path / '.github' / 'benchmarks.py',
+            self.config_type,
+            benchmarks_threshold=self.cfg_option(
+                'benchmarks', 'threshold', 5),
+            benchmarks_fail_threshold=self.cfg_option(
+                'benchmarks', 'fail-threshold', 0),
+            with_benchmarks=self.with_benchmarks,
+        )
+
     def manifest_in(self):
         """Modify MANIFEST.in with meta options."""
         manifest_additional_rules = self.meta_cfg['manifest'].get(
@@ -685,19 +929,24 @@ class PackageConfiguration:
         if self.config_type == 'c-code' \
                 and 'include *.sh' not in manifest_additional_rules:
             manifest_additional_rules.insert(0, 'include *.sh')
+        if (self.with_benchmarks and 'recursive-include benchmarks *.py'
+                not in manifest_additional_rules):
+            manifest_additional_rules.append(
+                'recursive-include benchmarks *.py')
         if self.config_type != 'toolkit':
             self.copy_with_meta(
                 'MANIFEST.in.j2', self.path / 'MANIFEST.in', self.config_type,
                 manifest_additional_rules=manifest_additional_rules,
                 with_docs=self.with_docs,
-                have_md_files=list(self.path.glob('*.md')),
-                have_docs_txt_files=list(self.path.glob('docs/*.txt')),
+                have_md_files=self.project.glob('*.md'),
+                have_docs_txt_files=self.project.glob('docs/*.txt'),
                 have_src_folder=(self.path / 'src').exists())
 
     def pyproject_toml(self):
         """Modify pyproject.toml with meta options."""
-        toml_path = self.path / 'pyproject.toml'
-        toml_doc = get_pyproject_toml(toml_path)
+        import tomlkit
+
+        toml_doc = self.project.toml('pyproject.toml')
 
         # Capture some pre-transformation data
         old_requires = toml_doc.get('build-system', {}).get('requires', [])
@@ -745,6 +994,13 @@ class PackageConfiguration:
             # Combining data files written on different machines only works
             # if the recorded file names are relative to the project root.
             coverage['run']['relative_files'] = True
+        if self.testenv_parallel:
+            # Layers run in subprocesses, they write their own data files.
+            coverage['run']['patch'] = ['subprocess']
+        if self.build_once and self.coverage_in_matrix:
+            # The test environments measure the installed wheel, map its
+            # files back to the sources when the data files are combined.
+            coverage['paths'] = {'source': ['src/', '*/site-packages/']}
         add_cfg = self.meta_cfg['coverage-run'].get('additional-config', [])
         for key, value in parse_additional_config(add_cfg).items():
             coverage['run'][key] = value
@@ -781,13 +1037,16 @@ class PackageConfiguration:
         if toml_doc['tool']['coverage'].get('paths'):
             toml_doc['tool']['coverage']['paths']['source'].multiline(True)
 
+        self.project.write_toml('pyproject.toml', self._dump_pyproject_toml)
+
+    def _dump_pyproject_toml(self, toml_doc):
+        import tomlkit
+
         preamble = META_HINT.format(config_type=self.config_type)
         toml_contents = tomlkit.dumps(toml_doc, sort_keys=True)
         if not toml_contents.startswith(preamble):
             toml_contents = f'{preamble}\n{toml_contents}'
-
-        with open(toml_path, 'w') as fp:
-            fp.write(toml_contents)
+        return toml_contents
 
     def render_with_meta(self, template_name, config_type, **kw):
         """Read and render a Jinja template source file"""
@@ -796,10 +1055,11 @@ class PackageConfiguration:
 
     def copy_with_meta(
             self, template_name, destination, config_type,
-            meta_hint=META_HINT, **kw):
+            meta_hint=META_HINT, executable=False, **kw):
         """Copy the source file to destination and a hint of origin.
 
-        If kwargs are given they are used as template arguments.
+        If kwargs are given they are used as template arguments. The file is
+        written by `self.project.save()`.
 
         If the rendered template output is an empty string, don't write it
         to disk. This allows package maintainers to prevent adding certain
@@ -819,30 +1079,60 @@ class PackageConfiguration:
         else:
             content = '\n'.join([meta_hint, rendered])
 
-        with open(destination, 'w') as f_:
-            f_.write(content)
+        self.project.write_text(
+            destination.relative_to(self.path).as_posix(), content,
+            executable=executable)
 
-    def configure(self):
-        self._add_project_to_config_type_list()
+    def write_meta_toml(self):
+        """Write the configuration back to `.meta.toml`."""
+        import tomlkit
+
+        # Remove empty sections:
+        meta_cfg = {k: v for k, v in self.meta_cfg.items() if v}
+        self.project.write_text('.meta.toml', '\n'.join([
+            META_HINT.format(config_type=self.config_type),
+            tomlkit.dumps(meta_cfg)]))
+
+    def write_files(self):
+        """Render all configuration files into the package.
+
+        This neither touches git nor asks any questions.
+        """
         self._clean_up_old_settings()
 
         if self.with_sphinx_doctests and not self.with_docs:
             print("The package is configured without sphinx docs, "
                   "but with sphinx doctests.  Is this a mistake?")
 
-        if self.with_docs:
-            self.readthedocs()
-
-        self.pyproject_toml()
-        self.setup_cfg()
         self.setup_py()
-        self.gitignore()
-        self.pre_commit_config_yaml()
-        self.copy_with_meta(
-            'editorconfig.txt', self.path / '.editorconfig', self.config_type)
-        self.copy_with_meta(
-            'CONTRIBUTING.md', self.path / 'CONTRIBUTING.md', self.config_type,
-            meta_hint=META_HINT_MARKDOWN)
+        self._render(TEMPLATE_RENDERERS)
+        self.write_meta_toml()
+        return self.project.save()
+
+    def render_templates(self, template_names):
+        """Render the files fed by the top-level `template_names`.
+
+        Return the names of the changed files.
+        """
+        self._render(template_names)
+        return self.project.save()
+
+    def _render(self, template_names):
+        renderers = {TEMPLATE_RENDERERS[name] for name in template_names}
+        if 'pyproject_toml' in renderers:
+            # `tox.ini` uses the build requirements from `pyproject.toml`.
+            renderers.add('tox')
+        if not self.with_docs:
+            renderers.discard('readthedocs')
+        for renderer in dict.fromkeys(TEMPLATE_RENDERERS.values()):
+            if renderer in renderers:
+                getattr(self, renderer)()
+
+    def configure(self):
+        from .set_branch_protection_rules import set_branch_protection
+
+        self._add_project_to_config_type_list()
+        self.write_files()
 
         if self.args.commit:
             with change_dir(self.path):
@@ -856,12 +1146,6 @@ class PackageConfiguration:
                              if pathlib.Path(x).exists()]
                 call('git', 'add', *early_add)
 
-        self.manylinux_sh()
-        self.tox()
-        self.tests_yml()
-        self.pre_commit_yml()
-        self.manifest_in()
-
         with change_dir(self.path) as cwd:
             if pathlib.Path('bootstrap.py').exists():
                 call('git', 'rm', 'bootstrap.py')
@@ -877,12 +1161,6 @@ class PackageConfiguration:
                 call('git', 'add', '.readthedocs.yaml')
             if self.add_manylinux and self.args.commit:
                 call('git', 'add', '.manylinux.sh', '.manylinux-install.sh')
-            # Remove empty sections:
-            meta_cfg = {k: v for k, v in self.meta_cfg.items() if v}
-            with open('.meta.toml', 'w') as meta_f:
-                meta_f.write(META_HINT.format(config_type=self.config_type))
-                meta_f.write('\n')
-                tomlkit.dump(meta_cfg, meta_f)
 
             if self.args.run_tests:
                 tox_path = shutil.which('tox') or (
@@ -908,6 +1186,13 @@ class PackageConfiguration:
             ]
             if self.config_type != 'toolkit':
                 to_add.append('MANIFEST.in')
+            if self.shards:
+                to_add.append('.github/test-shards.py')
+            if self.with_benchmarks:
+                to_add.extend(['.github/benchmarks.py',
+                               '.github/workflows/benchmarks.yml'])
+            if self.with_importtime:
+                to_add.append('.github/importtime.py')
             pushed = False
             if self.args.commit:
                 call('git', 'add', *to_add)
@@ -943,5 +1228,10 @@ class PackageConfiguration:
 def main():
     args = handle_command_line_arguments()
 
+    if args.watch:
+        from .watch import watch
+        watch(args, [args.path, *args.watch_also])
+        return
+
     package = PackageConfiguration(args)
     package.configure()
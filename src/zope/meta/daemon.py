@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Long-running process answering `config-package` requests over a socket.
+
+The daemon keeps the Jinja environments, the package registry and the
+overrides loaded, so a request does not pay for starting the interpreter and
+loading them again. Each request is a single line of JSON, the response is a
+single line of JSON, too.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import pathlib
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import traceback
+
+from .shared import packages
+from .shared.diff import configured_files
+from .shared.diff import scratch_copy
+from .shared.diff import unified_diffs
+from .shared.packages import TYPES
+from .shared.packages import list_packages
+
+
+def private_dir(path):
+    """Create the directory `path` only the current user can access.
+
+    Raise `PermissionError` if it already exists but is no such directory,
+    e. g. because another user created it first.
+    """
+    path.mkdir(mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+            or info.st_mode & 0o077):
+        raise PermissionError(
+            f'{path} is not a directory only accessible by the current user.')
+    return path
+
+
+def default_socket_path():
+    """Return the path of the socket if none is given.
+
+    Without `$XDG_RUNTIME_DIR` the socket is put into a private directory in
+    the world-writable temporary directory.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return pathlib.Path(runtime_dir) / f'zope-meta-{os.getuid()}.sock'
+    folder = pathlib.Path(tempfile.gettempdir()) / f'zope-meta-{os.getuid()}'
+    return private_dir(folder) / 'daemon.sock'
+
+
+class ConfigDaemon:
+    """Answer requests, keeping expensive state between them."""
+
+    def __init__(self):
+        self._registry = {}
+        self._registry_mtimes = {}
+
+    def registry(self):
+        """Return the packages per configuration type.
+
+        A `packages.txt` is only read again if it changed since the last
+        request.
+        """
+        for config_type in TYPES:
+            path = packages.BASE_PATH / config_type / 'packages.txt'
+            mtime = path.stat().st_mtime_ns if path.exists() else None
+            if self._registry_mtimes.get(config_type, False) != mtime:
+                self._registry[config_type] = (
+                    list_packages(path) if mtime is not None else [])
+                self._registry_mtimes[config_type] = mtime
+        return self._registry
+
+    def handle(self, request):
+        """Handle a decoded `request` and return the response."""
+        command = request.get('command')
+        handler = getattr(self, f'do_{command}', None)
+        if handler is None:
+            return {'ok': False, 'error': f'Unknown command {command!r}.'}
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                result = handler(request)
+        except SystemExit as e:
+            # argparse exits on invalid arguments
+            return {'ok': False, 'error': f'Exited with {e.code}.',
+                    'output': output.getvalue()}
+        except Exception:
+            return {'ok': False, 'error': traceback.format_exc(),
+                    'output': output.getvalue()}
+        return {'ok': True, 'result': result, 'output': output.getvalue()}
+
+    def _package_configuration(self, argv):
+        from .config_package import PackageConfiguration
+        from .config_package import handle_command_line_arguments
+
+        return PackageConfiguration(handle_command_line_arguments(argv))
+
+    def do_ping(self, request):
+        return 'pong'
+
+    def do_query(self, request):
+        """Answer questions about the known packages and Python versions.
+
+        `what` is one of `packages` (optionally restricted to a `type`),
+        `type` (of the package `name`) or `versions`.
+        """
+        what = request.get('what')
+        if what == 'packages':
+            registry = self.registry()
+            config_type = request.get('type')
+            if config_type:
+                return registry.get(config_type, [])
+            return registry
+        if what == 'type':
+            for config_type, names in self.registry().items():
+                if request.get('name') in names:
+                    return config_type
+            return None
+        if what == 'versions':
+            return {
+                'oldest': packages.OLDEST_PYTHON_VERSION,
+                'newest': packages.NEWEST_PYTHON_VERSION,
+                'future': packages.FUTURE_PYTHON_VERSION,
+                'pypy': packages.PYPY_VERSION,
+                'supported': packages.supported_python_versions(),
+            }
+        raise ValueError(f'Cannot query {what!r}.')
+
+    def do_configure(self, request):
+        """Write the configuration files into a package.
+
+        In contrast to `config-package` this neither touches git nor runs the
+        tests. If the request lists `templates` only their outputs are
+        rendered. Return the names of the changed files. The package is not
+        added to a `packages.txt`, so requests do not change this repository.
+        """
+        package = self._package_configuration(request['argv'])
+        before = configured_files(package.path)
+        if request.get('templates'):
+            package.render_templates(request['templates'])
+        else:
+            package.write_files()
+        return sorted(unified_diffs(before, configured_files(package.path)))
+
+    def do_diff(self, request):
+        """Return the changes `configure` would make as unified diffs.
+
+        The package is configured in a temporary copy, so the clone stays
+        untouched.
+        """
+        path, *argv = request['argv']
+        with scratch_copy(path) as copy:
+            package = self._package_configuration([str(copy), *argv])
+            before = configured_files(copy)
+            package.write_files()
+            return unified_diffs(before, configured_files(copy))
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response = {'ok': False, 'error': 'Invalid JSON.'}
+        else:
+            response = self.server.daemon.handle(request)
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serve requests one after another.
+
+    Requests are not handled concurrently as configuring changes the working
+    directory and redirects `sys.stdout`.
+    """
+
+    def __init__(self, socket_path, daemon):
+        self.daemon = daemon
+        super().__init__(str(socket_path), RequestHandler)
+
+    def server_bind(self):
+        super().server_bind()
+        # Only the current user may send requests.
+        os.chmod(self.server_address, 0o600)
+
+
+def serve(socket_path):
+    """Serve requests on `socket_path` until interrupted."""
+    socket_path = pathlib.Path(socket_path)
+    if socket_path.exists():
+        socket_path.unlink()
+    with DaemonServer(socket_path, ConfigDaemon()) as server:
+        print(f'Listening on {socket_path}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def send_request(socket_path, request):
+    """Send `request` to the daemon listening on `socket_path`.
+
+    Return the decoded response. Raise `PermissionError` if the socket belongs
+    to another user.
+    """
+    if os.stat(socket_path).st_uid != os.getuid():
+        raise PermissionError(f'{socket_path} belongs to another user.')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        with sock.makefile('rb') as response:
+            return json.loads(response.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Keep the state of `config-package` loaded and answer'
+                    ' requests over a Unix domain socket.')
+    parser.add_argument(
+        '--socket',
+        dest='socket_path',
+        type=pathlib.Path,
+        default=None,
+        help='Path of the Unix domain socket. Defaults to'
+        ' zope-meta-<uid>.sock in $XDG_RUNTIME_DIR or to a private directory'
+        ' in the temporary directory.')
+    parser.add_argument(
+        '--overrides',
+        type=pathlib.Path,
+        dest='overrides_path',
+        default=None,
+        help='Filesystem path to a folder with an `overrides.toml` applied'
+        ' for all requests. (Templates are overridden per request.)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('serve', help='Start the daemon.')
+    for command, help in (
+            ('configure', 'Write the configuration files into a package.'),
+            ('diff', 'Show the changes `configure` would make.')):
+        subparser = subparsers.add_parser(
+            command, help=help,
+            description=f'{help} Arguments are the ones of config-package.')
+        subparser.add_argument('argv', nargs=argparse.REMAINDER)
+    query = subparsers.add_parser('query', help='Query the package registry.')
+    query.add_argument('what', choices=['packages', 'type', 'versions'])
+    query.add_argument('name', nargs='?', help='Name of the package.')
+    query.add_argument('-t', '--type', dest='type', choices=TYPES)
+    args = parser.parse_args()
+    if args.socket_path is None:
+        args.socket_path = default_socket_path()
+
+    if args.command == 'serve':
+        serve(args.socket_path)
+        return
+
+    request = {'command': args.command}
+    if args.command == 'query':
+        request.update(what=args.what, name=args.name, type=args.type)
+    else:
+        argv = args.argv
+        if argv:
+            argv[0] = str(pathlib.Path(argv[0]).absolute())
+        request['argv'] = argv
+    try:
+        response = send_request(args.socket_path, request)
+    except OSError as e:
+        print(f'Cannot connect to {args.socket_path}: {e}')
+        print('Start the daemon via: zope-meta-daemon serve')
+        sys.exit(2)
+
+    print(response.get('output', ''), end='')
+    if not response['ok']:
+        print(response['error'])
+        sys.exit(1)
+    result = response['result']
+    if args.command == 'diff':
+        for diff in result.values():
+            print(diff, end='')
+    elif args.command == 'configure':
+        for name in result:
+            print(f'changed: {name}')
+    else:
+        print(json.dumps(result, indent=2))
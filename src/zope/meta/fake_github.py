@@ -0,0 +1,285 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Local stand-in for the parts of GitHub used by the scripts.
+
+`FakeGitHub` serves the REST endpoints the scripts call via `gh` and the raw
+file downloads for a synthetic fleet (see `zope.meta.fleet`). `gh()` is a
+replacement for the `gh` command line client sending these requests to the
+stand-in named in the environment variable `ZOPE_META_FAKE_GITHUB`.
+"""
+import collections
+import http.server
+import json
+import os
+import pathlib
+import re
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+
+class FakeGitHub:
+    """State of the repositories of a synthetic fleet on the fake GitHub."""
+
+    def __init__(self, fleet_path):
+        self.fleet_path = pathlib.Path(fleet_path)
+        fleet = json.loads((self.fleet_path / 'fleet.json').read_text())
+        self.org = fleet['org']
+        self.repos = {}
+        for name, repo in fleet['repos'].items():
+            self.repos[name] = {
+                'protection': repo['protection'],
+                'workflows': [{
+                    'id': repo['workflow-id'],
+                    'name': 'tests',
+                    'path': '.github/workflows/tests.yml',
+                    'state': repo['workflow-state'],
+                }],
+                'pulls': [],
+                'dispatches': 0,
+            }
+        self.requests = collections.Counter()
+        self.lock = threading.Lock()
+
+    def raw(self, repo, ref, path):
+        """Return the content of a file in the remote of `repo`."""
+        result = subprocess.run(
+            ['git', 'show', f'{ref}:{path}'], capture_output=True,
+            cwd=self.fleet_path / 'remotes' / self.org / f'{repo}.git')
+        if result.returncode != 0:
+            return 404, b'404: Not Found'
+        return 200, result.stdout
+
+    def protection(self, repo, method, body, path):
+        state = self.repos[repo]
+        if method == 'PUT' and not path:
+            state['protection'] = {
+                'required_status_checks':
+                    body['required_status_checks'],
+                'required_pull_request_reviews':
+                    body['required_pull_request_reviews'],
+            }
+            return 200, state['protection']
+        if state['protection'] is None:
+            return 404, {'message': 'Branch not protected'}
+        if not path:
+            return 200, state['protection']
+        if path == '/required_pull_request_reviews':
+            reviews = state['protection']['required_pull_request_reviews']
+            if reviews is None:
+                return 404, {
+                    'message': 'Required pull request reviews not enabled.'}
+            return 200, reviews
+        return 404, {'message': 'Not Found'}
+
+    def workflows(self, repo, method, body, path):
+        state = self.repos[repo]
+        if method == 'GET' and not path:
+            return 200, {'total_count': len(state['workflows']),
+                         'workflows': state['workflows']}
+        match = re.fullmatch(r'/([^/]+)/(enable|dispatches)', path)
+        if match is None:
+            return 404, {'message': 'Not Found'}
+        workflow_id, action = match.groups()
+        for workflow in state['workflows']:
+            file_name = pathlib.PurePosixPath(workflow['path']).name
+            if workflow_id in (str(workflow['id']), file_name):
+                break
+        else:
+            return 404, {'message': 'Not Found'}
+        if method == 'PUT' and action == 'enable':
+            workflow['state'] = 'active'
+            return 204, None
+        if method == 'POST' and action == 'dispatches':
+            if workflow['state'] != 'active':
+                return 422, {'message': 'Workflow is disabled.'}
+            state['dispatches'] += 1
+            return 204, None
+        return 404, {'message': 'Not Found'}
+
+    def pulls(self, repo, method, body, path):
+        state = self.repos[repo]
+        if method == 'GET':
+            return 200, state['pulls']
+        number = len(state['pulls']) + 1
+        pull = {
+            'number': number,
+            'title': body.get('title'),
+            'head': {'ref': body.get('head')},
+            'base': {'ref': body.get('base')},
+            'html_url':
+                f'https://github.com/{self.org}/{repo}/pull/{number}',
+        }
+        state['pulls'].append(pull)
+        return 201, pull
+
+    def handle(self, method, path, body):
+        """Answer a request, return the HTTP status and the response body."""
+        match = re.fullmatch(r'/raw/([^/]+)/([^/]+)/([^/]+)/(.+)', path)
+        if match is not None and method == 'GET':
+            org, repo, ref, file_path = match.groups()
+            route = 'GET /raw'
+            if org != self.org or repo not in self.repos:
+                return route, 404, b'404: Not Found'
+            return (route, *self.raw(repo, ref, file_path))
+        match = re.fullmatch(
+            r'/repos/([^/]+)/([^/]+)/(?:branches/[^/]+/(protection)'
+            r'|actions/(workflows)|(pulls))(/.*)?', path)
+        if match is None:
+            return f'{method} {path}', 404, {'message': 'Not Found'}
+        org, repo, *endpoints, rest = match.groups()
+        endpoint = next(filter(None, endpoints))
+        route = f'{method} {endpoint}{re.sub("/[^/]+/", "/*/", rest or "")}'
+        if org != self.org or repo not in self.repos:
+            return route, 404, {'message': 'Not Found'}
+        with self.lock:
+            handler = getattr(self, endpoint)
+            return (route, *handler(repo, method, body, rest or ''))
+
+
+class RequestHandler(http.server.BaseHTTPRequestHandler):
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'null') or {}
+        github = self.server.github
+        if self.path == '/_stats':
+            route, status, response = None, 200, {
+                'requests': dict(github.requests),
+                'repos': github.repos,
+            }
+        else:
+            route, status, response = github.handle(
+                self.command, self.path, body)
+        if route is not None:
+            with github.lock:
+                github.requests[route] += 1
+        if not isinstance(response, bytes):
+            response = b'' if response is None else json.dumps(
+                response).encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    do_GET = do_PUT = do_POST = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeGitHubServer(http.server.ThreadingHTTPServer):
+    """Serve the fake GitHub of the fleet in `fleet_path`."""
+
+    daemon_threads = True
+
+    def __init__(self, fleet_path, port=0):
+        self.github = FakeGitHub(fleet_path)
+        super().__init__(('127.0.0.1', port), RequestHandler)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+def request(method, path, body=None):
+    """Send a request to the fake GitHub, return status and response."""
+    url = os.environ['ZOPE_META_FAKE_GITHUB'] + path
+    data = None if body is None else body.encode()
+    req = urllib.request.Request(url, data=data, method=method)
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+def _option(args, *names, default=None):
+    """Remove the option `names` and its value from `args`."""
+    for name in names:
+        if name in args:
+            index = args.index(name)
+            value = args[index + 1]
+            del args[index:index + 2]
+            return value
+    return default
+
+
+def gh(argv):
+    """Run the subset of the `gh` commands used by the scripts.
+
+    Return the exit code.
+    """
+    args = list(argv)
+    command = args[:2] if args[:1] != ['api'] else ['api']
+    del args[:len(command)]
+    if command == ['api']:
+        method = _option(args, '--method', '-X', default='GET')
+        input_path = _option(args, '--input')
+        while _option(args, '-H', '--header'):
+            pass
+        body = None
+        if input_path:
+            body = pathlib.Path(input_path).read_text()
+        status, response = request(method, args[0], body)
+        print(response)
+        if status >= 400:
+            message = json.loads(response).get('message', '')
+            print(f'gh: {message} (HTTP {status})', file=sys.stderr)
+            return 1
+        return 0
+
+    repo = _option(args, '-R', '--repo')
+    if repo is None:
+        origin = subprocess.run(
+            ['git', 'remote', 'get-url', 'origin'], capture_output=True,
+            text=True).stdout.strip().removesuffix('.git')
+        repo = '/'.join(origin.split('/')[-2:])
+    if command == ['workflow', 'list']:
+        status, response = request('GET', f'/repos/{repo}/actions/workflows')
+        if status >= 400:
+            print(f'could not fetch workflows for {repo}', file=sys.stderr)
+            return 1
+        for workflow in json.loads(response)['workflows']:
+            print(f"{workflow['name']}\t{workflow['state']}\t"
+                  f"{workflow['id']}")
+        return 0
+    if command in (['workflow', 'enable'], ['workflow', 'run']):
+        action = 'enable' if command[1] == 'enable' else 'dispatches'
+        method = 'PUT' if action == 'enable' else 'POST'
+        body = None if action == 'enable' else '{"ref": "master"}'
+        status, response = request(
+            method, f'/repos/{repo}/actions/workflows/{args[0]}/{action}',
+            body)
+        if status >= 400:
+            print(f'could not {command[1]} workflow: {response}',
+                  file=sys.stderr)
+            return 1
+        return 0
+    if command == ['pr', 'create']:
+        head = subprocess.run(
+            ['git', 'branch', '--show-current'], capture_output=True,
+            text=True).stdout.strip()
+        title = _option(args, '--title', '-t', default=head)
+        status, response = request('POST', f'/repos/{repo}/pulls', json.dumps(
+            {'title': title, 'head': head, 'base': 'master'}))
+        if status >= 400:
+            print(f'pull request create failed: {response}', file=sys.stderr)
+            return 1
+        print(json.loads(response)['html_url'])
+        return 0
+    print(f'gh {" ".join(argv)}: not supported by the fake GitHub',
+          file=sys.stderr)
+    return 1
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Generate a synthetic fleet of packages to run the scripts on offline.
+
+A fleet folder contains:
+
+- `remotes/<org>/<name>.git`: bare repositories used as `file://` remotes
+- `overrides/<config type>/packages.txt`: the packages of the fleet
+- `overrides/overrides.toml`: points the scripts to the fleet
+- `bin/gh`: stand-in for the `gh` client talking to the fake GitHub
+- `fleet.json`: the GitHub state of the repositories
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import pathlib
+import random
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+from .shared.packages import META_HINT
+from .shared.packages import OLDEST_PYTHON_VERSION
+from .shared.packages import ORG
+from .shared.packages import TYPES
+from .shared.packages import supported_python_versions
+
+
+SHORT_NAMES = {
+    'buildout-recipe': 'recipe',
+    'c-code': 'ccode',
+    'pure-python': 'pure',
+    'zope-product': 'product',
+    'toolkit': 'toolkit',
+}
+#: Options in `.meta.toml` and the probability they are switched on.
+PYTHON_OPTIONS = {
+    'with-windows': 0.2,
+    'with-pypy': 0.4,
+    'with-future-python': 0.3,
+    'with-docs': 0.6,
+    'with-sphinx-doctests': 0.1,
+    'with-macos': 0.1,
+    'with-free-threaded-python': 0.1,
+}
+GH_SHIM = """\
+#!{executable}
+import sys
+
+sys.path.insert(0, {path!r})
+from zope.meta.fake_github import gh  # noqa: E402
+
+sys.exit(gh(sys.argv[1:]))
+"""
+
+
+def package_names(count, types=TYPES):
+    """Return the names of `count` packages per configuration type."""
+    return {
+        f'fleet.{SHORT_NAMES[config_type]}{number:04d}': config_type
+        for config_type in types for number in range(1, count + 1)}
+
+
+def package_files(name, config_type, rnd):
+    """Return the files of a package as `{path: content}`.
+
+    Also return the options of its `.meta.toml`.
+    """
+    module = name.split('.')[1]
+    options = {key: rnd.random() < probability
+               for key, probability in PYTHON_OPTIONS.items()}
+    # Most zopefoundation packages still use `pkg_resources` namespaces.
+    pep_420 = rnd.random() < 0.3
+    imports = ['setup']
+    setup_kw = [
+        f"name='{name}'",
+        f"version='{rnd.randint(1, 9)}.{rnd.randint(0, 20)}.dev0'",
+        f"url='https://github.com/{ORG}/{name}'",
+        f"description='Synthetic package {name}'",
+        "long_description=(\n"
+        "        read('README.rst') + '\\n\\n' + read('CHANGES.rst'))",
+        "author='Zope Foundation and contributors'",
+        "author_email='zope-dev@zope.dev'",
+        "license='ZPL-2.1'",
+        'classifiers=[\n' + ''.join(
+            f"        'Programming Language :: Python :: {version}',\n"
+            for version in supported_python_versions()) + '    ]',
+    ]
+    if pep_420:
+        imports.append('find_namespace_packages')
+        setup_kw.append("packages=find_namespace_packages('src')")
+    else:
+        imports.append('find_packages')
+        setup_kw.append("packages=find_packages('src')")
+        setup_kw.append("namespace_packages=['fleet']")
+    setup_kw.append("package_dir={'': 'src'}")
+    if config_type == 'c-code':
+        imports.append('Extension')
+        setup_kw.append(
+            f"ext_modules=[Extension('fleet.{module}._speedups',"
+            f" ['src/fleet/{module}/_speedups.c'])]")
+    if config_type == 'buildout-recipe':
+        setup_kw.append(
+            "entry_points={'zc.buildout': "
+            f"['default = fleet.{module}:Recipe']}}")
+    extras = "'test': ['zope.testrunner']"
+    if options['with-docs']:
+        extras += ", 'docs': ['Sphinx']"
+    setup_kw.extend([
+        f"python_requires='>={OLDEST_PYTHON_VERSION}'",
+        "install_requires=['setuptools', 'zope.interface']",
+        f'extras_require={{{extras}}}',
+        'include_package_data=True',
+        'zip_safe=False',
+    ])
+    files = {
+        'setup.py': ''.join(
+            f'from setuptools import {imported}\n'
+            for imported in sorted(imports))
+        + '\n\ndef read(name):\n    with open(name) as f:\n'
+        '        return f.read()\n\n\nsetup(\n'
+        + ''.join(f'    {kw},\n' for kw in setup_kw) + ')\n',
+        'pyproject.toml': textwrap.dedent('''\
+            [build-system]
+            requires = ["setuptools", "wheel"]
+            build-backend = "setuptools.build_meta"
+
+            [tool.coverage.run]
+            branch = true
+
+            [tool.coverage.report]
+            exclude_lines = []
+            '''),
+        'README.rst': f'{"=" * len(name)}\n{name}\n{"=" * len(name)}\n',
+        'CHANGES.rst': '==========\n Changes\n==========\n\n'
+                       '1.0 (unreleased)\n================\n\n'
+                       '- Initial release.\n',
+        '.github/workflows/tests.yml': 'name: tests\non: [push]\n',
+        f'src/fleet/{module}/__init__.py': (
+            '' if config_type != 'buildout-recipe' else
+            'class Recipe:\n\n    def __init__(self, buildout, name, options):'
+            '\n        self.options = options\n'),
+        f'src/fleet/{module}/interfaces.py':
+            'from zope.interface import Interface\n\n\n'
+            'class IThing(Interface):\n    """A thing."""\n',
+        f'src/fleet/{module}/tests/__init__.py': '',
+        f'src/fleet/{module}/tests/test_{module}.py':
+            'import unittest\n\n\nclass Tests(unittest.TestCase):\n\n'
+            '    def test_import(self):\n'
+            f'        import fleet.{module}  # noqa: F401\n',
+    }
+    if not pep_420:
+        files['src/fleet/__init__.py'] = (
+            "__import__('pkg_resources').declare_namespace(__name__)\n")
+    if config_type == 'c-code':
+        files[f'src/fleet/{module}/_speedups.c'] = (
+            '#include "Python.h"\n\nstatic struct PyModuleDef moduledef = {\n'
+            '    PyModuleDef_HEAD_INIT, "_speedups", NULL, -1, NULL\n};\n\n'
+            'PyMODINIT_FUNC PyInit__speedups(void)\n{\n'
+            '    return PyModule_Create(&moduledef);\n}\n')
+    if config_type == 'zope-product':
+        files[f'src/fleet/{module}/configure.zcml'] = (
+            '<configure xmlns="http://namespaces.zope.org/zope">\n'
+            '</configure>\n')
+    if options['with-docs']:
+        files['docs/conf.py'] = f'project = {name!r}\n'
+        files['docs/index.rst'] = files['README.rst']
+    python = ''.join(
+        f'{key} = {str(value).lower()}\n' for key, value in options.items())
+    files['.meta.toml'] = (
+        f'{META_HINT.format(config_type=config_type)}\n'
+        f'[meta]\ntemplate = "{config_type}"\n'
+        f'commit-id = "{rnd.getrandbits(32):08x}"\n\n'
+        f'[python]\n{python}\n'
+        f'[coverage]\nfail-under = {rnd.randint(70, 100)}\n')
+    return files, options
+
+
+def fast_import_stream(files):
+    """Return a `git fast-import` stream committing `files` to master."""
+    def data(content):
+        content = content.encode()
+        return b'data %d\n%s\n' % (len(content), content)
+
+    stream = [b'commit refs/heads/master\n'
+              b'committer Fleet <fleet@example.com> 1700000000 +0000\n',
+              data('Initial commit')]
+    for path, content in sorted(files.items()):
+        stream.append(f'M 100644 inline {path}\n'.encode())
+        stream.append(data(content))
+    return b''.join(stream)
+
+
+def create_remote(path, files):
+    """Create the bare repository `path` containing `files`."""
+    subprocess.run(
+        ['git', 'init', '--quiet', '--bare', '--template=',
+         '--initial-branch=master', str(path)], check=True)
+    subprocess.run(
+        ['git', 'fast-import', '--quiet'], cwd=path, check=True,
+        input=fast_import_stream(files))
+
+
+def generate(target, count, types=TYPES, seed=0, jobs=None):
+    """Create a fleet of `count` packages per configuration type in `target`.
+
+    Return the contents of `fleet.json`.
+    """
+    target = pathlib.Path(target).resolve()
+    remotes = target / 'remotes' / ORG
+    remotes.mkdir(parents=True)
+    names = package_names(count, types)
+    fleet = {'org': ORG, 'seed': seed, 'repos': {}}
+    with concurrent.futures.ThreadPoolExecutor(jobs) as executor:
+        futures = []
+        for name, config_type in names.items():
+            rnd = random.Random(f'{seed}-{name}')
+            files, options = package_files(name, config_type, rnd)
+            protection = None
+            if rnd.random() < 0.5:
+                protection = {
+                    'required_status_checks': {
+                        'contexts': ['linting'], 'strict': False},
+                    'required_pull_request_reviews': {
+                        'required_approving_review_count': 1},
+                }
+            fleet['repos'][name] = {
+                'type': config_type,
+                'options': options,
+                'protection': protection,
+                'workflow-id': rnd.randint(10**6, 10**8),
+                'workflow-state': rnd.choice(
+                    ['active', 'active', 'disabled_inactivity']),
+            }
+            futures.append(executor.submit(
+                create_remote, remotes / f'{name}.git', files))
+        for future in futures:
+            future.result()
+
+    # The scripts expect a `packages.txt` for each configuration type.
+    for config_type in TYPES:
+        folder = target / 'overrides' / config_type
+        folder.mkdir(parents=True)
+        (folder / 'packages.txt').write_text(''.join(
+            f'{name}\n' for name, type_ in names.items()
+            if type_ == config_type))
+    (target / 'fleet.json').write_text(json.dumps(fleet, indent=2) + '\n')
+    bin_path = target / 'bin'
+    bin_path.mkdir()
+    (bin_path / 'gh').write_text(GH_SHIM.format(
+        executable=sys.executable,
+        path=str(pathlib.Path(__file__).parent.parent.parent)))
+    (bin_path / 'gh').chmod(0o755)
+    return fleet
+
+
+def fleet_environ(target, url):
+    """Return the environment to run the scripts on the fleet in `target`.
+
+    `url` is the one of the fake GitHub. This also writes `overrides.toml`.
+    """
+    target = pathlib.Path(target).resolve()
+    overrides = target / 'overrides'
+    (overrides / 'overrides.toml').write_text(
+        f'BASE_PATH = {json.dumps(str(overrides))}\n'
+        f'GITHUB_URL = {json.dumps((target / "remotes").as_uri())}\n'
+        f'GITHUB_RAW_URL = "{url}/raw"\n')
+    return dict(
+        os.environ,
+        PATH=f'{target / "bin"}{os.pathsep}{os.environ.get("PATH", "")}',
+        ZOPE_META_OVERRIDES=str(overrides),
+        ZOPE_META_FAKE_GITHUB=url,
+        GIT_AUTHOR_NAME='Fleet',
+        GIT_AUTHOR_EMAIL='fleet@example.com',
+        GIT_COMMITTER_NAME='Fleet',
+        GIT_COMMITTER_EMAIL='fleet@example.com',
+    )
+
+
+def run(target, command):
+    """Run `command` on the fleet in `target` while serving its fake GitHub.
+
+    Return the exit code, the duration and the counts of the requests.
+    """
+    from .fake_github import FakeGitHubServer
+
+    with FakeGitHubServer(target) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            env = fleet_environ(target, server.url)
+            start = time.perf_counter()
+            result = subprocess.run(command, env=env)
+            duration = time.perf_counter() - start
+        finally:
+            server.shutdown()
+            thread.join()
+    return result.returncode, duration, dict(server.github.requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic fleet of packages with local git'
+                    ' remotes and a fake GitHub to run the scripts on.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    generate_parser = subparsers.add_parser(
+        'generate', help='Create a new fleet.')
+    generate_parser.add_argument(
+        'target', type=pathlib.Path, help='Folder to create the fleet in.')
+    generate_parser.add_argument(
+        '-n', '--count', type=int, default=40,
+        help='Number of packages per configuration type. Defaults to:'
+        ' %(default)s')
+    generate_parser.add_argument(
+        '-t', '--type', dest='types', choices=TYPES, action='append',
+        help='Only create packages of this configuration type. Can be given'
+        ' multiple times.')
+    generate_parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Seed for the options of the packages. Defaults to: %(default)s')
+    serve_parser = subparsers.add_parser(
+        'serve', help='Serve the fake GitHub of a fleet.')
+    serve_parser.add_argument('target', type=pathlib.Path)
+    serve_parser.add_argument('--port', type=int, default=0)
+    run_parser = subparsers.add_parser(
+        'run', help='Run a command on a fleet and measure its throughput.')
+    run_parser.add_argument('target', type=pathlib.Path)
+    run_parser.add_argument('cmd', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        start = time.perf_counter()
+        fleet = generate(args.target, args.count, args.types or TYPES,
+                         args.seed)
+        print(f'Created {len(fleet["repos"])} repositories in'
+              f' {time.perf_counter() - start:.1f} s.')
+    elif args.command == 'serve':
+        from .fake_github import FakeGitHubServer
+
+        with FakeGitHubServer(args.target, args.port) as server:
+            for key, value in fleet_environ(args.target, server.url).items():
+                if key.startswith(('ZOPE_META_', 'PATH', 'GIT_')):
+                    print(f'export {key}="{value}"')
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    else:
+        cmd = args.cmd[1:] if args.cmd[:1] == ['--'] else args.cmd
+        repos = json.loads((args.target / 'fleet.json').read_text())['repos']
+        returncode, duration, requests = run(args.target, cmd)
+        print(f'{duration:.1f} s for a fleet of {len(repos)} repositories:'
+              f' {len(repos) / duration:.1f} repositories/s')
+        for route, number in sorted(requests.items()):
+            print(f'  {number:6d} {route}')
+        sys.exit(returncode)
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Find code supporting Python versions which are no longer supported.
+
+The source is parsed, so comments, strings and docstrings do not cause
+findings. Each finding is a dict with the keys `path`, `line`, `column`,
+`kind`, `message` and `code` (the source line).
+"""
+import argparse
+import ast
+import bisect
+import collections
+import concurrent.futures
+import json
+import operator
+import os
+import pathlib
+import re
+import tokenize
+
+from .shared.packages import OLDEST_PYTHON_VERSION
+from .shared.packages import all_repos
+from .shared.packages import load_toml
+
+
+#: Names of flags telling the major Python version like `six.PY3`. Only the
+#: upper case spelling is matched, `python3` or `py3` are ordinary names.
+FLAG_NAME = re.compile(r'^PY(THON)?(2[0-9]*|3K?)$')
+#: Methods only called by Python 2.
+PY2_METHODS = {
+    '__cmp__', '__div__', '__getslice__', '__idiv__', '__nonzero__',
+    '__rdiv__', '__unicode__',
+}
+#: Modules imported in `try/except ImportError` blocks to support old Python
+#: versions: Python 2 names and backports of the standard library.
+COMPAT_MODULES = {
+    '__builtin__', 'backports', 'cPickle', 'cStringIO', 'ConfigParser',
+    'contextlib2', 'funcsigs', 'HTMLParser', 'httplib', 'importlib_metadata',
+    'importlib_resources', 'mock', 'Queue', 'StringIO', 'urllib2', 'urlparse',
+    'xmlrpclib',
+}
+COMPARE_OPERATORS = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt,
+    ast.GtE: operator.ge, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+#: Each finding spans a line matching this, only these lines are analysed.
+TRIGGER_WORDS = (
+    'version_info', 'hexversion', 'sys.version', 'python_version', 'py2',
+    'py3', 'python2', 'python3', 'six', 'importerror', 'modulenotfounderror',
+    *PY2_METHODS)
+TRIGGERS = re.compile(
+    r'version_info|hexversion|sys\.version|python_version|(?i:py(thon)?[23])'
+    r'|\bsix\b|ImportError|ModuleNotFoundError|'
+    + '|'.join(sorted(PY2_METHODS)))
+FLIPPED = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE,
+           ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+#: Larger than any Python version the package will support.
+HIGHEST = (3, 99, 99)
+
+
+def _is_version_info(node):
+    """Return whether `node` is `sys.version_info` or `version_info`."""
+    if isinstance(node, ast.Attribute):
+        return (node.attr == 'version_info'
+                and isinstance(node.value, ast.Name)
+                and node.value.id == 'sys')
+    return isinstance(node, ast.Name) and node.id == 'version_info'
+
+
+def _version_range(node, oldest):
+    """Return the lowest and highest value of the version expression `node`.
+
+    Return `None` if `node` is no version expression, `(None, None)` if its
+    range cannot be determined.
+    """
+    lowest = (*oldest, 0)
+    if _is_version_info(node):
+        return lowest, HIGHEST
+    if isinstance(node, ast.Attribute) and _is_version_info(node.value):
+        if node.attr in ('major', 'minor'):
+            index = ('major', 'minor').index(node.attr)
+            return lowest[index], HIGHEST[index]
+        return None, None
+    if isinstance(node, ast.Subscript) and _is_version_info(node.value):
+        index = node.slice
+        if isinstance(index, ast.Constant) and index.value in (0, 1):
+            return lowest[index.value], HIGHEST[index.value]
+        if (isinstance(index, ast.Slice) and index.lower is None
+                and index.step is None
+                and isinstance(index.upper, ast.Constant)
+                and isinstance(index.upper.value, int)):
+            return lowest[:index.upper.value], HIGHEST[:index.upper.value]
+        return None, None
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) \
+            and node.value.id == 'sys':
+        if node.attr == 'hexversion':
+            return lowest[0] << 24 | lowest[1] << 16, 0x03ffffff
+        if node.attr == 'version':
+            return None, None
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) \
+            and node.func.attr.startswith('python_version') \
+            and isinstance(node.func.value, ast.Name) \
+            and node.func.value.id == 'platform':
+        return None, None
+    return None
+
+
+def _constant(node):
+    """Return the value of an int or a tuple of ints, `None` otherwise."""
+    try:
+        value = ast.literal_eval(node)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(value, int) or (
+            isinstance(value, tuple)
+            and all(isinstance(v, int) for v in value)):
+        return value
+    return None
+
+
+def _is_decided(op, lowest, highest, constant):
+    """Return whether `version <op> constant` is the same for all versions
+    between `lowest` and `highest`."""
+    if isinstance(constant, tuple) != isinstance(lowest, tuple):
+        return False
+    if op in (ast.Eq, ast.NotEq):
+        if isinstance(constant, tuple):
+            lowest = lowest[:len(constant)]
+            highest = highest[:len(constant)]
+        return (constant < lowest or constant > highest
+                or lowest == highest == constant)
+    compare = COMPARE_OPERATORS[op]
+    return compare(lowest, constant) == compare(highest, constant)
+
+
+class LegacyPythonScanner:
+    """Collect the findings in a module."""
+
+    def __init__(self, oldest):
+        self.oldest = oldest
+        self.findings = []
+        self.handlers = {
+            ast.Attribute: self.visit_Attribute,
+            ast.Compare: self.visit_Compare,
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.Import: self.visit_Import,
+            ast.ImportFrom: self.visit_ImportFrom,
+            ast.Name: self.visit_Name,
+            ast.Try: self.visit_Try,
+        }
+
+    def visit(self, tree, lines):
+        """Visit the nodes of `tree` spanning one of the sorted `lines`."""
+        handlers = self.handlers
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            start = getattr(node, 'lineno', None)
+            if start is not None:
+                decorators = getattr(node, 'decorator_list', None)
+                if decorators:
+                    start = decorators[0].lineno
+                index = bisect.bisect_left(lines, start)
+                if index == len(lines) or lines[index] > node.end_lineno:
+                    continue
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(node)
+            stack.extend(ast.iter_child_nodes(node))
+
+    def add(self, node, kind, message):
+        self.findings.append({
+            'line': node.lineno,
+            'column': node.col_offset,
+            'kind': kind,
+            'message': message,
+        })
+
+    def visit_Compare(self, node):
+        operands = [node.left, *node.comparators]
+        for op, (left, right) in zip(node.ops, zip(operands, operands[1:])):
+            if type(op) not in COMPARE_OPERATORS:
+                continue
+            op = type(op)
+            version = _version_range(left, self.oldest)
+            other = right
+            if version is None:
+                version = _version_range(right, self.oldest)
+                op = FLIPPED[op]
+                other = left
+            if version is None:
+                continue
+            lowest, highest = version
+            constant = _constant(other)
+            if lowest is None or constant is None:
+                self.add(node, 'version-check',
+                         'Check of the Python version.')
+            elif _is_decided(op, lowest, highest, constant):
+                self.add(node, 'version-check',
+                         'Check of the Python version which has the same'
+                         ' result for all supported versions.')
+
+    def visit_Name(self, node):
+        if FLAG_NAME.match(node.id):
+            self.add(node, 'py2-flag',
+                     f'Flag {node.id} for the major Python version.')
+
+    def visit_Attribute(self, node):
+        if FLAG_NAME.match(node.attr):
+            self.add(node, 'py2-flag',
+                     f'Flag {node.attr} for the major Python version.')
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            if alias.name.partition('.')[0] == 'six':
+                self.add(node, 'six', f'Import of {alias.name}.')
+
+    def visit_ImportFrom(self, node):
+        if (node.module or '').partition('.')[0] == 'six':
+            self.add(node, 'six', f'Import from {node.module}.')
+
+    def visit_FunctionDef(self, node):
+        if node.name in PY2_METHODS:
+            self.add(node, 'py2-method',
+                     f'Method {node.name} is only used by Python 2.')
+
+    def visit_Try(self, node):
+        handles_import_error = any(
+            _names_import_error(handler.type) for handler in node.handlers)
+        if handles_import_error:
+            modules = {
+                module.partition('.')[0]
+                for part in (node.body, *(h.body for h in node.handlers))
+                for module in _imported_modules(part)}
+            compat = sorted(modules & COMPAT_MODULES)
+            if compat:
+                self.add(node, 'import-fallback',
+                         'Fallback import for old Python versions of'
+                         f' {", ".join(compat)}.')
+
+
+def _names_import_error(node):
+    if node is None:
+        return False
+    if isinstance(node, ast.Tuple):
+        return any(map(_names_import_error, node.elts))
+    return isinstance(node, ast.Name) and node.id in (
+        'ImportError', 'ModuleNotFoundError')
+
+
+def _imported_modules(statements):
+    for statement in statements:
+        if isinstance(statement, ast.Import):
+            yield from (alias.name for alias in statement.names)
+        elif isinstance(statement, ast.ImportFrom) and statement.module:
+            yield statement.module
+
+
+def _trigger_lines(source):
+    """Return the sorted numbers of the lines matching `TRIGGERS`."""
+    lowered = source.lower()
+    if not any(word in lowered for word in TRIGGER_WORDS):
+        return []
+    lines = []
+    position = 0
+    line = 1
+    for match in TRIGGERS.finditer(source):
+        line += source.count('\n', position, match.start())
+        position = match.start()
+        if lines and lines[-1] == line:
+            continue
+        line_start = source.rfind('\n', 0, position) + 1
+        if not source[line_start:position].lstrip().startswith('#'):
+            lines.append(line)
+    return lines
+
+
+def scan_file(path, oldest_python_version=OLDEST_PYTHON_VERSION):
+    """Return the findings in the Python file `path`."""
+    oldest = tuple(int(v) for v in oldest_python_version.split('.'))
+    try:
+        # `tokenize.open` honours the encoding declared in the file.
+        with tokenize.open(path) as f:
+            source = f.read()
+        lines = _trigger_lines(source)
+        if not lines:
+            return []
+        tree = ast.parse(source, filename=str(path))
+    except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+        return [{'path': str(path), 'line': getattr(e, 'lineno', None) or 0,
+                 'column': 0, 'kind': 'syntax-error', 'message': str(e),
+                 'code': ''}]
+    scanner = LegacyPythonScanner(oldest)
+    scanner.visit(tree, lines)
+    lines = source.splitlines()
+    for finding in scanner.findings:
+        finding['path'] = str(path)
+        finding['code'] = lines[finding['line'] - 1].strip()
+    return sorted(scanner.findings,
+                  key=lambda f: (f['line'], f['column'], f['kind']))
+
+
+def _scan_file(job):
+    return scan_file(*job)
+
+
+def python_files(path):
+    """Return the Python files of the package cloned at `path`."""
+    path = pathlib.Path(path)
+    files = sorted(
+        p for p in (path / 'src').rglob('*.py')
+        if '__pycache__' not in p.parts)
+    if (path / 'setup.py').exists():
+        files.append(path / 'setup.py')
+    return files
+
+
+def oldest_python(path):
+    """Return the oldest Python version supported by the package at `path`.
+    """
+    meta_toml = load_toml(pathlib.Path(path) / '.meta.toml')
+    return meta_toml.get('python', {}).get(
+        'oldest-python', OLDEST_PYTHON_VERSION)
+
+
+def scan(jobs, workers=None):
+    """Scan the files in `jobs` in a pool of `workers` processes.
+
+    `jobs` is a list of `(path, oldest_python_version)` pairs. Return the
+    findings of all files.
+    """
+    jobs = list(jobs)
+    if len(jobs) > 1 and workers != 1:
+        chunksize = max(1, len(jobs) // (4 * (workers or os.cpu_count())))
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_scan_file, jobs, chunksize=chunksize))
+    else:
+        results = [_scan_file(job) for job in jobs]
+    return [finding for findings in results for finding in findings]
+
+
+def scan_packages(clones, packages=None, workers=None,
+                  oldest_python_version=None):
+    """Scan the clones of `packages` (default: all known ones) in `clones`.
+
+    Unless `oldest_python_version` is given, each package uses the oldest
+    Python version of its `.meta.toml`. Return the findings with an
+    additional key `package`.
+    """
+    clones = pathlib.Path(clones)
+    if packages is None:
+        packages = [name for name in all_repos() if (clones / name).is_dir()]
+    jobs = []
+    package_of = {}
+    for package in packages:
+        oldest = oldest_python_version or oldest_python(clones / package)
+        for path in python_files(clones / package):
+            jobs.append((path, oldest))
+            package_of[str(path)] = package
+    findings = scan(jobs, workers)
+    for finding in findings:
+        finding['package'] = package_of[finding['path']]
+    return findings
+
+
+def format_findings(findings, relative_to=None):
+    """Return the findings as lines like compiler errors."""
+    lines = []
+    for finding in findings:
+        path = pathlib.Path(finding['path'])
+        if relative_to is not None:
+            path = path.relative_to(relative_to)
+        lines.append(
+            f'{path}:{finding["line"]}:{finding["column"]}:'
+            f' {finding["kind"]}: {finding["message"]}\n'
+            f'    {finding["code"]}')
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find code supporting Python versions which are no longer'
+                    ' supported.')
+    parser.add_argument(
+        'paths', metavar='PATH', type=pathlib.Path, nargs='*',
+        help='path to a package clone or a Python file')
+    parser.add_argument(
+        '--clones',
+        type=pathlib.Path,
+        default=None,
+        help='Path to a folder containing clones of the packages. Scan all'
+        ' known packages cloned there.')
+    parser.add_argument(
+        '--oldest-python',
+        dest='oldest_python',
+        default=None,
+        help='Oldest supported Python version. Defaults to the one in the'
+        ' .meta.toml of a package or to the currently oldest supported one.')
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Number of worker processes. Defaults to the number of CPUs.')
+    parser.add_argument(
+        '--json',
+        dest='json',
+        action='store_true',
+        default=False,
+        help='Print the findings as JSON.')
+    args = parser.parse_args()
+
+    if args.clones:
+        findings = scan_packages(
+            args.clones, workers=args.jobs,
+            oldest_python_version=args.oldest_python)
+    else:
+        jobs = []
+        for path in args.paths or [pathlib.Path('.')]:
+            if path.is_dir():
+                oldest = args.oldest_python or oldest_python(path)
+                jobs.extend((p, oldest) for p in python_files(path))
+            else:
+                jobs.append(
+                    (path, args.oldest_python or OLDEST_PYTHON_VERSION))
+        findings = scan(jobs, args.jobs)
+
+    if args.json:
+        print(json.dumps(findings, indent=2))
+        return
+    for line in format_findings(findings):
+        print(line)
+    kinds = collections.Counter(f['kind'] for f in findings)
+    summary = ', '.join(f'{n} {kind}' for kind, n in sorted(kinds.items()))
+    print(f'{len(findings)} findings{": " if summary else "."}{summary}')
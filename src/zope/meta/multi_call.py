@@ -15,6 +15,8 @@ import argparse
 import sys
 
 from .shared.call import call
+from .shared.packages import GITHUB_URL
+from .shared.packages import ORG
 from .shared.packages import list_packages
 from .shared.path import change_dir
 from .shared.path import path_factory
@@ -58,7 +60,7 @@ def main():
             with change_dir(args.clones):
                 print('Cloning repository …')
                 call('git', 'clone',
-                     f'https://github.com/zopefoundation/{package}')
+                     f'{GITHUB_URL}/{ORG}/{package}')
 
         call_args = [
             sys.executable,
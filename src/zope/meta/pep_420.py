@@ -11,27 +11,251 @@
 # FOR A PARTICULAR PURPOSE.
 #
 ##############################################################################
+import json
+import os
 import pathlib
+import re
 import shutil
+import subprocess
 
 from .shared.call import call
 from .shared.git import create_pull_request
 from .shared.git import git_branch
 from .shared.path import change_dir
+from .shared.rewrite import DELETE_LINE
+from .shared.rewrite import Rewriter
 from .shared.script_args import get_shared_parser
 
 
+#: Rules for `Rewriter` to remove the namespace declaration from `setup.py`.
+SETUP_PY_RULES = {
+    'from setuptools import find_packages': DELETE_LINE,
+    'namespace_packages': DELETE_LINE,
+    'packages=': DELETE_LINE,
+    'package_dir=': DELETE_LINE,
+    # Only requirements without a version specification:
+    re.compile(r'zope\.testrunner(?=[\'"])'): 'zope.testrunner >= 6.4',
+}
+
+
+def namespace_style(content):
+    """Return how the `__init__.py` `content` declares a namespace.
+
+    `content` is bytes. Return ``'pkg_resources'``, ``'pkgutil'`` or `None`.
+    """
+    if b'declare_namespace' in content:
+        return 'pkg_resources'
+    if b'extend_path' in content:
+        return 'pkgutil'
+    return None
+
+
+def _scan_folder(folder, prefix, namespaces):
+    """Collect the namespace packages in `folder` into `namespaces`.
+
+    Only namespace packages and folders without `__init__.py`, which might
+    already be native namespaces, are descended into.
+    """
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.name.isidentifier() or not entry.is_dir():
+                continue
+            name = f'{prefix}{entry.name}'
+            try:
+                with open(os.path.join(entry.path, '__init__.py'), 'rb') as f:
+                    style = namespace_style(f.read())
+            except FileNotFoundError:
+                _scan_folder(entry.path, f'{name}.', namespaces)
+                continue
+            if style:
+                namespaces.append({
+                    'name': name, 'depth': name.count('.') + 1,
+                    'style': style})
+                _scan_folder(entry.path, f'{name}.', namespaces)
+
+
+def _git_namespaces(path, ref):
+    """Return the namespace packages below `src` in `ref` of the clone.
+
+    The `__init__.py` files are read from the git objects level by level,
+    so the working tree is not needed.
+    """
+    files = subprocess.run(
+        ['git', 'ls-tree', '-r', '--name-only', ref, '--', 'src'],
+        cwd=path, capture_output=True, text=True, check=True).stdout.split()
+    packages = {
+        tuple(file_name.split('/')[1:-1]) for file_name in files
+        if file_name.endswith('/__init__.py')}
+    packages.discard(())
+    found = set()
+
+    def descend(parts):
+        # Like `_scan_folder`: only below namespaces and folders without
+        # `__init__.py`.
+        return not parts or parts in found or (
+            parts not in packages and descend(parts[:-1]))
+
+    namespaces = []
+    for depth in sorted({len(parts) for parts in packages}):
+        specs = sorted(parts for parts in packages
+                       if len(parts) == depth and descend(parts[:-1]))
+        if not specs:
+            continue
+        blobs = subprocess.run(
+            ['git', 'cat-file', '--batch'], cwd=path, check=True,
+            capture_output=True,
+            input=''.join(f'{ref}:src/{"/".join(parts)}/__init__.py\n'
+                          for parts in specs).encode()).stdout
+        for parts in specs:
+            header, _, blobs = blobs.partition(b'\n')
+            size = int(header.split()[2])
+            style = namespace_style(blobs[:size])
+            blobs = blobs[size + 1:]
+            if style:
+                namespaces.append({
+                    'name': '.'.join(parts), 'depth': depth,
+                    'style': style})
+                found.add(parts)
+    return namespaces
+
+
+def namespace_packages(path, ref=None):
+    """Return the namespace packages declared in `src` of the package.
+
+    They are read from the working tree or, if `ref` is given, from this git
+    ref of the clone. Each namespace is a dict with its dotted `name`, its
+    nesting `depth` and the `style` of the declaration.
+    """
+    path = pathlib.Path(path)
+    if ref is not None:
+        namespaces = _git_namespaces(path, ref)
+    elif (path / 'src').is_dir():
+        namespaces = []
+        _scan_folder(path / 'src', '', namespaces)
+    else:
+        return []
+    return sorted(namespaces, key=lambda namespace: namespace['name'])
+
+
+def _setup_py(path, ref=None):
+    """Return the content of `setup.py` of the package, empty if missing.
+
+    It is read from the working tree or, if `ref` is given, from this git ref
+    of the clone.
+    """
+    if ref is not None:
+        return subprocess.run(
+            ['git', 'show', f'{ref}:setup.py'], cwd=path,
+            capture_output=True).stdout
+    try:
+        with open(os.path.join(path, 'setup.py'), 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return b''
+
+
+def namespace_index(clones, names=None, ref=None):
+    """Return the namespace packages of the packages cloned in `clones`.
+
+    `names` restricts the scan to these packages. Nothing is changed, each
+    entry states whether the package still `needs_conversion`, either
+    because of namespaces in `src` or `namespace_packages` in `setup.py`.
+    """
+    index = []
+    with os.scandir(clones) as entries:
+        paths = sorted(
+            entry.path for entry in entries
+            if entry.is_dir() and (names is None or entry.name in names)
+            and os.path.exists(os.path.join(entry.path, '.git')))
+    for path in paths:
+        namespaces = namespace_packages(path, ref)
+        setup_py = b'namespace_packages' in _setup_py(path, ref)
+        index.append({
+            'package': os.path.basename(path),
+            'namespaces': namespaces,
+            'depth': max((ns['depth'] for ns in namespaces), default=0),
+            'setup_py': setup_py,
+            'needs_conversion': bool(namespaces) or setup_py,
+        })
+    return index
+
+
+def format_index(index):
+    """Return the packages of `index` which still need a conversion."""
+    lines = []
+    for entry in index:
+        if not entry['needs_conversion']:
+            continue
+        namespaces = ', '.join(
+            f'{ns["name"]} ({ns["style"]})' for ns in entry['namespaces'])
+        if entry['setup_py']:
+            namespaces = ', '.join(
+                filter(None, [namespaces, 'setup.py namespace_packages']))
+        lines.append(f'{entry["package"]}: depth {entry["depth"]}:'
+                     f' {namespaces}')
+    lines.append(
+        f'{len(lines)} of {len(index)} packages need a conversion.')
+    return '\n'.join(lines)
+
+
+def scan(args):
+    """Print the namespace index of the clones in `args.path`."""
+    index = namespace_index(args.path, ref=args.ref)
+    print(format_index(index))
+    if args.report:
+        args.report.write_text(json.dumps(index, indent=2) + '\n')
+    if args.packages_txt:
+        args.packages_txt.write_text(''.join(
+            f'{entry["package"]}\n'
+            for entry in index if entry['needs_conversion']))
+
+
 def main():
     parser = get_shared_parser(
         "Update a repository to PEP 420 native namespace.",
         interactive=True)
+    parser.add_argument(
+        '--scan',
+        dest='scan',
+        action='store_true',
+        default=False,
+        help='`path` is a folder with clones of the packages: only list the'
+        ' packages still declaring `pkg_resources` or `pkgutil` namespaces.'
+        ' Nothing is changed.')
+    parser.add_argument(
+        '--ref',
+        default=None,
+        help='With --scan read the files from this git ref of the clones'
+        ' instead of their working trees.')
+    parser.add_argument(
+        '--report',
+        type=pathlib.Path,
+        default=None,
+        help='With --scan also write the index as JSON to this file.')
+    parser.add_argument(
+        '--packages-txt',
+        dest='packages_txt',
+        type=pathlib.Path,
+        default=None,
+        help='With --scan write the packages needing a conversion to this'
+        ' file, to be used with `multi-call`.')
     args = parser.parse_args()
     path = args.path.absolute()
 
+    if args.scan:
+        scan(args)
+        return
+
     if not (path / ".git").exists():
         raise ValueError(
             "`path` does not point to a git clone of a repository!")
 
+    namespaces = namespace_packages(path)
+    if not namespaces and \
+            "namespace_packages" not in (path / "setup.py").read_text():
+        print("The package does not declare a namespace, nothing to do.")
+        return
+
     with change_dir(path) as cwd_str:
         cwd = pathlib.Path(cwd_str)
         bin_dir = cwd / "bin"
@@ -51,38 +275,15 @@ def main():
             " native namespace."
         )
 
-        setup_py = []
-        for line in (path / "setup.py").read_text().splitlines():
-            if "from setuptools import find_packages" in line:
-                continue
-            elif "namespace_packages" in line:
-                continue
-            elif "packages=" in line:
-                continue
-            elif "package_dir=" in line:
-                continue
-            elif "zope.testrunner" in line:
-                setup_py.append(
-                    line.replace("zope.testrunner", "zope.testrunner >= 6.4")
-                )
-            else:
-                setup_py.append(line)
+        setup_py, fired = Rewriter(SETUP_PY_RULES).rewrite(
+            (path / "setup.py").read_text())
+        (path / "setup.py").write_text(setup_py)
+        for rule, count in fired.items():
+            print(f"setup.py: applied {rule!r} {count} time(s).")
 
-        (path / "setup.py").write_text("\n".join(setup_py) + "\n")
-
-        for src_dir_cont in (path / "src").iterdir():
-            if not src_dir_cont.is_dir():
-                continue
-            pkg_init = src_dir_cont / "__init__.py"
-            if pkg_init.exists():
-                pkg_init.unlink()
-            for pkg_dir_cont in src_dir_cont.iterdir():
-                if not pkg_dir_cont.is_dir():
-                    continue
-                sub_pkg_init = pkg_dir_cont / "__init__.py"
-                if sub_pkg_init.exists():
-                    if "pkg_resources" in sub_pkg_init.read_text():
-                        sub_pkg_init.unlink()
+        for namespace in namespaces:
+            (path / "src" / namespace["name"].replace(".", "/")
+             / "__init__.py").unlink()
 
         if args.commit:
             print("Adding all changes ...")
@@ -15,11 +15,12 @@ import argparse
 import pathlib
 
 from .shared.call import call
-from .shared.packages import ALL_REPOS
+from .shared.packages import GITHUB_URL
 from .shared.packages import ORG
+from .shared.packages import all_repos
 
 
-base_url = f'https://github.com/{ORG}'
+base_url = f'{GITHUB_URL}/{ORG}'
 BASE_PATH = pathlib.Path(__file__).parent
 
 
@@ -46,7 +47,7 @@ def main():
 
     args = parser.parse_args()
 
-    for repo in ALL_REPOS:
+    for repo in all_repos():
         print(repo)
         wfs = call(
             'gh', 'workflow', 'list', '--all', '-R', f'{ORG}/{repo}',
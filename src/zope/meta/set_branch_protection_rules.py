@@ -5,12 +5,10 @@ import os
 import pathlib
 import tempfile
 
-import requests
-import tomlkit
-
 from .shared.call import abort
 from .shared.call import call
-from .shared.packages import ALL_REPOS
+from .shared.packages import COVERAGE_IN_MATRIX_TYPES
+from .shared.packages import GITHUB_RAW_URL
 from .shared.packages import MANYLINUX_AARCH64
 from .shared.packages import MANYLINUX_I686
 from .shared.packages import MANYLINUX_PYTHON_VERSION
@@ -19,9 +17,13 @@ from .shared.packages import NEWEST_PYTHON_VERSION
 from .shared.packages import OLDEST_PYTHON_VERSION
 from .shared.packages import ORG
 from .shared.packages import PYPY_VERSION
+from .shared.packages import SHARDS_TYPES
+from .shared.packages import all_repos
+from .shared.packages import load_toml
+from .shared.packages import loads_toml
 
 
-BASE_URL = f'https://raw.githubusercontent.com/{ORG}'
+BASE_URL = f'{GITHUB_RAW_URL}/{ORG}'
 NEWEST_PYTHON = f'py{NEWEST_PYTHON_VERSION.replace(".", "")}'
 DEFAULT_BRANCH = 'master'
 
@@ -40,32 +42,12 @@ def _call_gh(
         allowed_return_codes=allowed_return_codes)
 
 
-def set_branch_protection(
-        repo: str, meta_path: pathlib.Path | None = None) -> bool:
-    result = _call_gh(
-        'GET', 'protection/required_pull_request_reviews', repo,
-        allowed_return_codes=(0, 1))
-    required_pull_request_reviews = None
-    if result.returncode == 1:
-        if json.loads(result.stdout)['message'] != "Branch not protected":
-            # If there is no branch protection we create it later on using the
-            # PUT call, but if there is another error we show it:
-            print(result.stdout)
-            abort(result.returncode)
-    else:
-        required_approving_review_count = json.loads(
-            result.stdout)['required_approving_review_count']
-        required_pull_request_reviews = {
-            'required_approving_review_count': required_approving_review_count
-        }
+def required_checks(meta_toml: dict) -> list[str]:
+    """Return the names of the status checks a package has to pass.
 
-    if meta_path is None:
-        response = requests.get(
-            f'{BASE_URL}/{repo}/{DEFAULT_BRANCH}/.meta.toml', timeout=30)
-        meta_toml = tomlkit.loads(response.text)
-    else:
-        with open(meta_path) as f:
-            meta_toml = tomlkit.load(f)
+    They are computed from its `.meta.toml` the same way `config-package`
+    names the jobs.
+    """
     template = meta_toml['meta']['template']
     with_docs = meta_toml['python'].get('with-docs', False)
     with_pypy = meta_toml['python']['with-pypy']
@@ -76,6 +58,23 @@ def set_branch_protection(
         'with-free-threaded-python', False)
     with_windows = meta_toml['python']['with-windows']
     with_macos = meta_toml['python']['with-macos']
+    # The coverage is combined in a job of its own:
+    coverage_in_matrix = meta_toml.get('coverage', {}).get(
+        'collect-in-matrix', False) and template in COVERAGE_IN_MATRIX_TYPES
+    shards = meta_toml.get('github-actions', {}).get('shards', 0)
+    # Windows and macOS only run the oldest and the newest CPython:
+    edges = meta_toml.get('github-actions', {}).get(
+        'matrix-mode', 'full') == 'edges'
+    if template not in SHARDS_TYPES or shards < 2:
+        shards = 0
+
+    def sharded(*names):
+        """Return the names of the shards of the test jobs `names`."""
+        if not shards:
+            return list(names)
+        return [f'{name}-{number}'
+                for name in names for number in range(1, shards + 1)]
+
     required = ['linting']
     if template == 'c-code':
         required.extend([
@@ -96,7 +95,9 @@ def set_branch_protection(
                 f'docs ({MANYLINUX_PYTHON_VERSION}, ubuntu-latest)')
         if with_pypy:
             required.append(f'test (pypy-{PYPY_VERSION}, ubuntu-latest)')
-            required.append(f'test (pypy-{PYPY_VERSION}, windows-latest)')
+            if with_windows and not edges:
+                required.append(
+                    f'test (pypy-{PYPY_VERSION}, windows-latest)')
         if with_free_threaded_python:
             required.append(
                 f'test ({NEWEST_PYTHON_VERSION}t, ubuntu-latest)')
@@ -106,40 +107,71 @@ def set_branch_protection(
                 f'test ({NEWEST_PYTHON_VERSION}, windows-latest)',
             ])
     elif with_windows or with_macos:
-        required.extend([
-            'ubuntu-coverage',
+        required.append(
+            'coverage' if coverage_in_matrix else 'ubuntu-coverage')
+        required.extend(sharded(
             f'ubuntu-{oldest_python}',
             f'ubuntu-{NEWEST_PYTHON}',
-        ])
+        ))
         if with_windows:
-            required.extend([
+            required.extend(sharded(
                 f'windows-{oldest_python}',
                 f'windows-{NEWEST_PYTHON}',
-            ])
+            ))
         if with_macos:
-            required.extend([
+            required.extend(sharded(
                 f'macos-{oldest_python}',
                 f'macos-{NEWEST_PYTHON}',
-            ])
+            ))
         if with_pypy:
-            required.extend([
-                'ubuntu-pypy3',
-                'windows-pypy3',
-            ])
+            required.extend(sharded('ubuntu-pypy3'))
+            if with_windows and not edges:
+                required.extend(sharded('windows-pypy3'))
         if with_free_threaded_python:
-            required.append(f'ubuntu-py{NEWEST_PYTHON}t')
+            required.extend(sharded(f'ubuntu-py{NEWEST_PYTHON}t'))
         if with_docs:
             required.append('ubuntu-docs')
     else:  # default for most packages
-        required.extend([oldest_python, NEWEST_PYTHON])
+        required.extend(sharded(oldest_python, NEWEST_PYTHON))
         if template != 'toolkit':
             required.append('coverage')
         if with_docs:
             required.append('docs')
         if with_pypy:
-            required.append('pypy3')
+            required.extend(sharded('pypy3'))
         if with_free_threaded_python:
-            required.append(f'{NEWEST_PYTHON}t')
+            required.extend(sharded(f'{NEWEST_PYTHON}t'))
+    return required
+
+
+def set_branch_protection(
+        repo: str, meta_path: pathlib.Path | None = None) -> bool:
+    import requests
+
+    result = _call_gh(
+        'GET', 'protection/required_pull_request_reviews', repo,
+        allowed_return_codes=(0, 1))
+    required_pull_request_reviews = None
+    if result.returncode == 1:
+        if json.loads(result.stdout)['message'] != "Branch not protected":
+            # If there is no branch protection we create it later on using the
+            # PUT call, but if there is another error we show it:
+            print(result.stdout)
+            abort(result.returncode)
+    else:
+        required_approving_review_count = json.loads(
+            result.stdout)['required_approving_review_count']
+        required_pull_request_reviews = {
+            'required_approving_review_count': required_approving_review_count
+        }
+
+    if meta_path is None:
+        response = requests.get(
+            f'{BASE_URL}/{repo}/{DEFAULT_BRANCH}/.meta.toml', timeout=30)
+        meta_toml = loads_toml(response.text)
+    else:
+        meta_toml = load_toml(meta_path)
+    required = required_checks(meta_toml)
 
     data = {
         'allow_deletions': False,
@@ -184,7 +216,7 @@ def main():
         metavar='PATH', default=None, type=pathlib.Path)
 
     args = parser.parse_args()
-    repos = args.repos if args.repos else ALL_REPOS
+    repos = args.repos if args.repos else all_repos()
     meta_path = args.meta
 
     if meta_path and len(repos) > 1:
@@ -13,21 +13,27 @@
 ##############################################################################
 
 import ast
+import collections
+import concurrent.futures
 import contextlib
+import io
+import json
 import os
 import pathlib
 import shutil
 import sys
-from importlib.util import module_from_spec
-from importlib.util import spec_from_file_location
-
-import tomlkit
+import traceback
 
 from .shared.call import call
+from .shared.call import output_to
+from .shared.diff import unified_diffs
 from .shared.git import git_branch
 from .shared.packages import META_HINT
 from .shared.packages import OLDEST_PYTHON_VERSION
 from .shared.packages import get_pyproject_toml
+from .shared.packages import list_packages
+from .shared.packages import load_toml
+from .shared.packages import registry
 from .shared.path import change_dir
 from .shared.script_args import get_shared_parser
 
@@ -36,85 +42,270 @@ PROJECT_SIMPLE_KEYS = (
     'name', 'version', 'description',
 )
 IGNORE_KEYS = (
-    'zip_safe', 'long_description_content_type', 'package_dir',
-    'packages', 'include_package_data', 'test_suite', 'tests_require',
+    'zip_safe', 'long_description', 'long_description_content_type',
+    'package_dir', 'packages', 'include_package_data', 'test_suite',
+    'tests_require',
 )
 UNCONVERTIBLE_KEYS = (
     'cmdclass', 'ext_modules', 'headers', 'cffi_modules',
 )
+#: Keys moved to `pyproject.toml`, their values have to be known.
+CONVERTED_KEYS = PROJECT_SIMPLE_KEYS + (
+    'author', 'author_email', 'classifiers', 'entry_points', 'extras_require',
+    'install_requires', 'keywords', 'license', 'project_urls',
+    'python_requires', 'url',
+)
 
 
-def parse_setup_function(ast_node, assigned_names=None):
-    """ Parse values out of the setup call ast definition """
-    setup_kwargs = {}
-    assigned_names = assigned_names or {}
+class SetupPyError(Exception):
+    """The values in `setup.py` cannot be converted."""
 
-    for kw_arg in ast_node.keywords:
-        if isinstance(kw_arg.value, (ast.Constant, ast.List, ast.Tuple)):
-            setup_kwargs[kw_arg.arg] = ast.literal_eval(kw_arg.value)
-        elif isinstance(kw_arg.value, ast.Dict):
-            # This could hide variables
+
+class _Unresolvable(Exception):
+    """The value of an expression is not known without running `setup.py`.
+    """
+
+
+#: Methods of `str` which can be called on strings in `setup.py`.
+STR_METHODS = {
+    'format', 'join', 'lower', 'lstrip', 'replace', 'rstrip', 'split',
+    'splitlines', 'strip', 'upper',
+}
+#: Functions which are evaluated when called with known arguments.
+FUNCTIONS = {
+    'dict': dict,
+    'list': list,
+    'os.path.abspath': os.path.abspath,
+    'os.path.dirname': os.path.dirname,
+    'os.path.join': os.path.join,
+    'os.path.realpath': os.path.realpath,
+    'sorted': sorted,
+    'str': str,
+    'tuple': tuple,
+}
+#: Functions opening a file.
+OPEN_FUNCTIONS = {'codecs.open', 'io.open', 'open'}
+BINARY_OPERATORS = {
+    ast.Add: lambda left, right: left + right,
+    ast.Mod: lambda left, right: left % right,
+    ast.Mult: lambda left, right: left * right,
+}
+
+
+class SetupPyEvaluator:
+    """Evaluate the values in a `setup.py` without running it.
+
+    The module-level statements are evaluated in order, as far as their
+    values can be determined from the source: literals, names, string and
+    list operations, ``os.path`` functions and reading files relative to
+    `setup.py`, either directly or via a module-level helper function
+    containing ``open()``. Nothing is imported or executed, so `setup.py`
+    cannot have any side effects.
+    """
+
+    def __init__(self, path=None):
+        self.path = None if path is None else pathlib.Path(path).absolute()
+        self.names = {}
+        if self.path is not None:
+            self.names['__file__'] = str(self.path)
+        # local name -> qualified name of imported modules and functions
+        self.imports = {}
+        # names of the module-level functions reading a file
+        self.readers = set()
+
+    def run(self, tree):
+        """Evaluate the module-level statements of `tree`.
+
+        Return the `setup()` call node or `None`.
+        """
+        setup_node = None
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    name = alias.asname or alias.name.partition('.')[0]
+                    self.imports[name] = alias.asname and alias.name or name
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                for alias in node.names:
+                    self.imports[alias.asname or alias.name] = (
+                        f'{node.module}.{alias.name}')
+            elif isinstance(node, ast.FunctionDef):
+                self.names.pop(node.name, None)
+                if any(isinstance(child, ast.Call)
+                       and self.qualified_name(child.func) in OPEN_FUNCTIONS
+                       for child in ast.walk(node)):
+                    self.readers.add(node.name)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                self.assign(node)
+            elif isinstance(node, ast.Expr) and isinstance(
+                    node.value, ast.Call):
+                if self.qualified_name(node.value.func) in (
+                        'setup', 'setuptools.setup',
+                        'distutils.core.setup'):
+                    setup_node = node.value
+                else:
+                    self.mutate(node.value)
+        return setup_node
+
+    def assign(self, node):
+        targets = getattr(node, 'targets', None) or [node.target]
+        try:
+            if node.value is None:
+                return
+            value = self.evaluate(node.value)
+            if isinstance(node, ast.AugAssign):
+                operator = BINARY_OPERATORS.get(type(node.op))
+                if operator is None:
+                    raise _Unresolvable(node)
+                value = operator(self.evaluate(node.target), value)
+        except _Unresolvable:
+            value = _Unresolvable
+        for target in targets:
+            if isinstance(target, ast.Name):
+                if value is _Unresolvable:
+                    self.names.pop(target.id, None)
+                else:
+                    self.names[target.id] = value
+
+    def mutate(self, node):
+        """Apply `name.append(value)` or `name.extend(values)`."""
+        func = node.func
+        if not (isinstance(func, ast.Attribute)
+                and isinstance(func.value, ast.Name)
+                and func.attr in ('append', 'extend')
+                and isinstance(self.names.get(func.value.id), list)):
+            return
+        try:
+            args = [self.evaluate(arg) for arg in node.args]
+            getattr(self.names[func.value.id], func.attr)(*args)
+        except (_Unresolvable, TypeError):
+            del self.names[func.value.id]
+
+    def qualified_name(self, node):
+        """Return the dotted name of `node` resolving imports."""
+        if isinstance(node, ast.Name):
+            return self.imports.get(node.id, node.id)
+        if isinstance(node, ast.Attribute):
+            base = self.qualified_name(node.value)
+            if base is not None:
+                return f'{base}.{node.attr}'
+        return None
+
+    def read(self, *parts):
+        """Return the content of a file relative to `setup.py`."""
+        if self.path is None:
+            raise _Unresolvable(parts)
+        path = self.path.parent.joinpath(*parts)
+        return path.read_text() if path.exists() else ''
+
+    def evaluate(self, node):
+        """Return the value of the expression `node`.
+
+        Raise `_Unresolvable` if it cannot be determined statically.
+        """
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            values = []
+            for element in node.elts:
+                if isinstance(element, ast.Starred):
+                    values.extend(self.evaluate(element.value))
+                else:
+                    values.append(self.evaluate(element))
+            return {ast.List: list, ast.Tuple: tuple, ast.Set: set}[
+                type(node)](values)
+        if isinstance(node, ast.Dict):
+            result = {}
+            for key, value in zip(node.keys, node.values):
+                if key is None:
+                    result.update(self.evaluate(value))
+                else:
+                    result[self.evaluate(key)] = self.evaluate(value)
+            return result
+        if isinstance(node, ast.Name):
+            if node.id in self.names:
+                return self.names[node.id]
+            raise _Unresolvable(node)
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            try:
+                return BINARY_OPERATORS[type(node.op)](
+                    self.evaluate(node.left), self.evaluate(node.right))
+            except (TypeError, ValueError, KeyError):
+                raise _Unresolvable(node)
+        if isinstance(node, ast.JoinedStr):
+            return ''.join(map(str, map(self.evaluate, node.values)))
+        if isinstance(node, ast.FormattedValue):
+            value = self.evaluate(node.value)
+            if node.conversion != -1:
+                value = {'s': str, 'r': repr, 'a': ascii}[
+                    chr(node.conversion)](value)
+            spec = '' if node.format_spec is None else self.evaluate(
+                node.format_spec)
+            return format(value, spec)
+        if isinstance(node, ast.Subscript):
             try:
-                setup_kwargs[kw_arg.arg] = ast.literal_eval(kw_arg.value)
-            except ValueError:
-                # Need to crawl the dictionary
-                gathered = {}
-                for (key, value) in zip(kw_arg.value.keys,
-                                        kw_arg.value.values):
-                    if isinstance(value, ast.Name):
-                        gathered[key.value] = assigned_names.get(value.id, '')
-                    elif isinstance(value, ast.BinOp):
-                        if isinstance(value.left, ast.List):
-                            # e. g. "['Sphinx'] + BROWSER_REQUIRES"
-                            print('XXX Cannot convert list addition XXX')
-                            print('XXX Please fix setup.py manually first XXX')
-                            print('XXX list addition: '
-                                  f'{ast.unparse(value)} XXX')
-                            sys.exit(1)
-                        # Interpolated string 'x%sy' % foo
-                        unformatted = value.left.value
-                        variable = assigned_names.get(value.right.id, '')
-                        formatted = unformatted.replace('%s', variable)
-                        gathered[key.value] = formatted
-                    elif isinstance(value, (ast.List, ast.Tuple)):
-                        try:
-                            gathered[key.value] = ast.literal_eval(value)
-                        except ValueError:
-                            # Probably a variable in the list
-                            lst = []
-                            for member in value.elts:
-                                if isinstance(member,
-                                              (ast.Constant,
-                                               ast.List,
-                                               ast.Tuple)):
-                                    lst.append(ast.literal_eval(member.value))
-                                elif isinstance(member, ast.BinOp):
-                                    unformatted = member.left.value
-                                    variable = assigned_names.get(
-                                        member.right.id, '')
-                                    formatted = unformatted.replace(
-                                        '%s', variable)
-                                    lst.append(formatted)
-                                else:
-                                    lst.append(ast.literal_eval(member.value))
-                            gathered[key.value] = lst
-                    else:
-                        try:
-                            gathered[key.value] = ast.literal_eval(value)
-                        except ValueError:
-                            print('XXX Cannot convert dictionary value XXX')
-                            print('XXX Please fix setup.py manually first XXX')
-                            print(f'XXX Dictionary key: {key.value} XXX')
-                            print(ast.dump(value, indent=2))
-                            sys.exit(1)
-                setup_kwargs[kw_arg.arg] = gathered
-        elif isinstance(kw_arg.value, ast.Name):
-            if kw_arg.value.id in assigned_names:
-                value = assigned_names.get(kw_arg.value.id)
+                return self.evaluate(node.value)[self.evaluate(node.slice)]
+            except (TypeError, KeyError, IndexError):
+                raise _Unresolvable(node)
+        if isinstance(node, ast.Slice):
+            return slice(*(None if part is None else self.evaluate(part)
+                           for part in (node.lower, node.upper, node.step)))
+        if isinstance(node, ast.Call):
+            return self.call(node)
+        raise _Unresolvable(node)
+
+    def call(self, node):
+        func = node.func
+        args = []
+        for arg in node.args:
+            if isinstance(arg, ast.Starred):
+                args.extend(self.evaluate(arg.value))
             else:
-                value = kw_arg.value.id
-            setup_kwargs[kw_arg.arg] = value
-
+                args.append(self.evaluate(arg))
+        kwargs = {kw.arg: self.evaluate(kw.value)
+                  for kw in node.keywords if kw.arg is not None}
+        if len(kwargs) != len(node.keywords):
+            raise _Unresolvable(node)
+        name = self.qualified_name(func)
+        if name in FUNCTIONS:
+            return FUNCTIONS[name](*args, **kwargs)
+        if name in self.readers:
+            # e. g. `read('README.rst')`
+            return self.read(*args)
+        if isinstance(func, ast.Attribute):
+            if func.attr == 'read' and isinstance(func.value, ast.Call) \
+                    and self.qualified_name(func.value.func) in OPEN_FUNCTIONS:
+                # e. g. `open('README.rst').read()`
+                return self.read(self.evaluate(func.value.args[0]))
+            if func.attr in STR_METHODS:
+                value = self.evaluate(func.value)
+                if isinstance(value, str):
+                    return getattr(value, func.attr)(*args, **kwargs)
+        raise _Unresolvable(node)
+
+
+def parse_setup_function(ast_node, evaluator=None):
+    """ Parse values out of the setup call ast definition
+
+    Values which cannot be evaluated statically are returned as their source,
+    so they can be kept in `setup.py`. Raise `SetupPyError` if this is the
+    case for a value which would be moved to `pyproject.toml`.
+    """
+    evaluator = evaluator or SetupPyEvaluator()
+    setup_kwargs = {}
+    unresolved = []
+    for kw_arg in ast_node.keywords:
+        if kw_arg.arg is None:
+            continue
+        try:
+            setup_kwargs[kw_arg.arg] = evaluator.evaluate(kw_arg.value)
+        except _Unresolvable:
+            setup_kwargs[kw_arg.arg] = ast.unparse(kw_arg.value)
+            if kw_arg.arg in CONVERTED_KEYS:
+                unresolved.append(
+                    f'{kw_arg.arg}: {setup_kwargs[kw_arg.arg]}')
+    if unresolved:
+        raise SetupPyError(
+            f'Cannot determine the value of {", ".join(unresolved)}')
     return setup_kwargs
 
 
@@ -122,6 +313,8 @@ def setup_args_to_toml_dict(setup_py_path, setup_kwargs):
     """ Iterate over setup_kwargs and generate a dictionary of values suitable
     for pyproject.toml and a dictionary with unconverted arguments
     """
+    import tomlkit
+
     toml_dict = {'project': {}}
     p_data = toml_dict['project']
 
@@ -232,12 +425,6 @@ def setup_args_to_toml_dict(setup_py_path, setup_kwargs):
         p_data['entry-points'] = entry_points
 
     extras = setup_kwargs.pop('extras_require', {})
-    if isinstance(extras, str):
-        print(' XXX Error converting setup.py XXX')
-        print(' XXX Clean up setup.py manually first:')
-        print(f' Change extras_require value to not use variable {extras}!')
-        print(f' Instead, insert the actual value of variable {extras}.')
-        sys.exit(1)
     opt_deps = {}
     for e_name, e_list in extras.items():
         opt_deps[e_name] = e_list
@@ -274,40 +461,18 @@ def setup_args_to_toml_dict(setup_py_path, setup_kwargs):
 
 
 def parse_setup_py(path):
-    """ Parse values out of setup.py """
-    setup_kwargs = {}
-    assigned_names = {}
-
-    # Nasty: Import the setup module file to get at the resolved variables
-    import_spec = spec_from_file_location('setup', path)
-    setup_module = module_from_spec(import_spec)
-    try:
-        with open(os.devnull, 'w') as fp:
-            with contextlib.redirect_stderr(fp):
-                import_spec.loader.exec_module(setup_module)
-    except (FileNotFoundError, SystemExit):
-        pass
-
-    for key in dir(setup_module):
-        assigned_names[key] = getattr(setup_module, key)
+    """ Parse values out of setup.py
 
+    `setup.py` is evaluated statically, so it is neither imported nor run.
+    """
+    setup_kwargs = {}
     with open(path) as fp:
         file_contents = fp.read()
 
-    # Create the ast tree for the setup module to find the setup call
-    # definition in order to parse out the call arguments.
-    ast_tree = ast.parse(file_contents)
-    setup_node = None
-
-    for ast_node in ast_tree.body:
-        if isinstance(ast_node, ast.Expr) and \
-           isinstance(ast_node.value, ast.Call) and \
-           ast_node.value.func.id == 'setup':
-            setup_node = ast_node.value
-            break
-
+    evaluator = SetupPyEvaluator(path)
+    setup_node = evaluator.run(ast.parse(file_contents))
     if setup_node is not None:
-        setup_kwargs = parse_setup_function(setup_node, assigned_names)
+        setup_kwargs = parse_setup_function(setup_node, evaluator)
     (leftover_setup_kwargs,
      toml_dict) = setup_args_to_toml_dict(path, setup_kwargs)
 
@@ -315,6 +480,8 @@ def parse_setup_py(path):
 
 
 def rewrite_pyproject_toml(path, toml_dict):
+    import tomlkit
+
     p_toml = get_pyproject_toml(path)
 
     def recursive_merge(dict1, dict2):
@@ -355,8 +522,7 @@ def rewrite_pyproject_toml(path, toml_dict):
         p_toml['project']['requires-python'] = f'>={OLDEST_PYTHON_VERSION}'
 
     # Create a fresh TOMLDocument instance so I can control section sorting
-    with open(path.absolute().parent / '.meta.toml', 'rb') as fp:
-        meta_cfg = tomlkit.load(fp)
+    meta_cfg = load_toml(path.absolute().parent / '.meta.toml')
     config_type = meta_cfg['meta'].get('template')
     new_doc = tomlkit.loads(META_HINT.format(config_type=config_type))
     for key in sorted(p_toml.keys()):
@@ -396,27 +562,189 @@ def rewrite_setup_py(path, leftover_setup_kwargs):
     return ''.join(new_setup_py)
 
 
-def package_sanity_check(path):
-    """ Sanity checks for the provided path """
-    sane = True
+def sanity_problems(path):
+    """Return the reasons why the package at `path` cannot be converted."""
+    problems = []
 
     if not path.exists():
-        print(f' - no such path {path}.')
-        sane = False
+        problems.append(f'no such path {path}')
 
     if not path.is_dir():
-        print(f' - {path} is not a folder')
-        sane = False
+        problems.append(f'{path} is not a folder')
 
     if not (path / 'setup.py').exists():
-        print(' - no setup.py found, cannot convert package.')
-        sane = False
+        problems.append('no setup.py found, cannot convert package')
 
     if not (path / '.meta.toml').exists():
-        print(' - no .meta.toml found, cannot convert package.')
-        sane = False
+        problems.append('no .meta.toml found, cannot convert package')
+
+    return problems
+
+
+def package_sanity_check(path):
+    """ Sanity checks for the provided path """
+    problems = sanity_problems(path)
+    for problem in problems:
+        print(f' - {problem}.')
+    return not problems
+
 
-    return sane
+#: Order of the statuses in the batch report.
+STATUSES = ('failed', 'manual', 'converted', 'already-converted')
+BRANCH_NAME = 'convert-setup-py-to-pyproject-toml'
+COMMIT_MSG = 'Move package metadata from setup.py to pyproject.toml.'
+
+
+def convert_package(path, dry_run=True, branch_name=None, commit_msg=None,
+                    commit=True):
+    """Convert the package at `path` without asking anything.
+
+    With `dry_run` nothing is changed, otherwise the changes are written to a
+    branch and committed unless `commit` is false. Return a report containing
+    the diff and the status of the package, one of `STATUSES`. Packages
+    needing a manual fix get the status `manual` and the reasons why.
+    """
+    path = pathlib.Path(path).absolute()
+    report = {'package': path.name, 'status': 'manual', 'reasons': [],
+              'warnings': [], 'diff': ''}
+    report['reasons'] = sanity_problems(path)
+    if report['reasons']:
+        return report
+
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            (leftover_setup_kwargs,
+             toml_dict) = parse_setup_py(path / 'setup.py')
+            if 'name' not in toml_dict['project'] and \
+               'version' not in toml_dict['project']:
+                report['status'] = 'already-converted'
+                return report
+            new_files = {
+                'pyproject.toml': rewrite_pyproject_toml(
+                    path / 'pyproject.toml', toml_dict),
+                'setup.py': rewrite_setup_py(
+                    path / 'setup.py', leftover_setup_kwargs),
+            }
+    except SetupPyError as e:
+        report['reasons'].append(str(e))
+        return report
+    except SyntaxError as e:
+        report['reasons'].append(f'setup.py cannot be parsed: {e}')
+        return report
+    finally:
+        report['warnings'] = [
+            line.strip() for line in output.getvalue().splitlines()
+            if line.startswith('XXX')]
+
+    old_files = {
+        name: (path / name).read_text() if (path / name).exists() else ''
+        for name in new_files}
+    report['diff'] = ''.join(unified_diffs(old_files, new_files).values())
+    report['status'] = 'converted'
+    if dry_run:
+        return report
+
+    from zest.releaser import utils as zest_utils
+    from zest.releaser.addchangelogentry import AddChangelogEntry
+
+    with change_dir(path):
+        report['branch'] = branch_name or BRANCH_NAME
+        git_branch(report['branch'])
+        start = call('git', 'rev-parse', 'HEAD',
+                     capture_output=True).stdout.strip()
+        # zest.releaser still needs the old `setup.py` to get the name.
+        zest_utils.AUTO_RESPONSE = True
+        AddChangelogEntry(message=COMMIT_MSG).run()
+        # It commits the changelog entry, combine it with the conversion:
+        call('git', 'reset', '--soft', start)
+        for name, content in new_files.items():
+            (path / name).write_text(content)
+        if commit:
+            call('git', 'add', *new_files)
+            call('git', 'commit', '-a', '-m', commit_msg or COMMIT_MSG)
+    return report
+
+
+def _convert_package_logged(path, log_path, **kw):
+    """Call `convert_package()` writing all output to `log_path`.
+
+    Failures are returned as reports with the status `failed`.
+    """
+    with open(log_path, 'w') as log, output_to(log):
+        try:
+            report = convert_package(path, **kw)
+        except (Exception, SystemExit):
+            traceback.print_exc()
+            report = {
+                'package': pathlib.Path(path).name,
+                'status': 'failed',
+                'error': traceback.format_exc().strip().splitlines()[-1]}
+    report['log'] = str(log_path)
+    return report
+
+
+def convert_packages(paths, result_dir, jobs=None, **kw):
+    """Convert the packages at `paths` in a pool of `jobs` processes.
+
+    The keyword arguments are passed to `convert_package()`. The output and
+    the diff of each package are written to `result_dir`. Return the reports
+    of the packages.
+    """
+    result_dir = pathlib.Path(result_dir)
+    result_dir.mkdir(parents=True, exist_ok=True)
+    reports = []
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = [
+            pool.submit(_convert_package_logged, path,
+                        result_dir / f'{pathlib.Path(path).name}.log', **kw)
+            for path in paths]
+        for future in concurrent.futures.as_completed(futures):
+            report = future.result()
+            if report.get('diff'):
+                diff_path = result_dir / f'{report["package"]}.diff'
+                diff_path.write_text(report['diff'])
+                report['diff_file'] = str(diff_path)
+            reports.append(report)
+            print(f'[{len(reports)}/{len(futures)}] {report["package"]}:'
+                  f' {report["status"]}')
+    return sorted(reports, key=lambda report: report['package'])
+
+
+def format_report(reports):
+    """Return the consolidated report of `convert_package()` results."""
+    lines = []
+    for status in STATUSES:
+        for report in reports:
+            if report['status'] != status or status == 'already-converted':
+                continue
+            lines.append(f'{report["package"]}: {status}')
+            if report.get('error'):
+                lines.append(f'  error: {report["error"]}')
+            for reason in report.get('reasons', []):
+                lines.append(f'  reason: {reason}')
+            for warning in report.get('warnings', []):
+                lines.append(f'  warning: {warning}')
+            if report.get('diff_file'):
+                lines.append(f'  diff: {report["diff_file"]}')
+            if status == 'failed' and report.get('log'):
+                lines.append(f'  log: {report["log"]}')
+    counts = collections.Counter(report['status'] for report in reports)
+    lines.append(
+        f'{len(reports)} packages: '
+        + ', '.join(f'{counts[status]} {status}' for status in STATUSES))
+    return '\n'.join(lines)
+
+
+def batch_paths(args):
+    """Return the paths of the clones to be converted in batch mode."""
+    if args.packages:
+        names = list_packages(args.packages)
+    else:
+        names = [name for names in registry(args.overrides_path).values()
+                 for name in names]
+    return [args.path / name for name in dict.fromkeys(names)
+            if (args.path / name / 'setup.py').exists()]
 
 
 def main():
@@ -431,15 +759,59 @@ def main():
         help='Do not make any changes but output contents for the changed'
              ' setup.py and pyproject.toml files.',
     )
+    parser.add_argument(
+        '--fleet',
+        dest='fleet',
+        action='store_true',
+        default=False,
+        help='`path` is a folder with clones of the packages: convert all'
+        ' packages of the registry cloned there in parallel. Without'
+        ' --dry-run the changes are committed to a branch, nothing is pushed.')
+    parser.add_argument(
+        '--packages',
+        type=pathlib.Path,
+        default=None,
+        help='Convert the packages listed in this packages.txt file which are'
+        ' cloned in `path` instead of all packages. Implies --fleet.')
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Number of packages converted in parallel with --fleet. Defaults'
+        ' to the number of CPUs.')
+    parser.add_argument(
+        '--report',
+        type=pathlib.Path,
+        default=None,
+        help='Also write the report of a --fleet run as JSON to this file.')
     args = parser.parse_args()
 
+    if args.fleet or args.packages:
+        args.path = args.path.absolute()
+        reports = convert_packages(
+            batch_paths(args), args.path / 'setup-to-pyproject-results',
+            args.jobs, dry_run=args.dry_run, branch_name=args.branch_name,
+            commit_msg=args.commit_msg, commit=args.commit)
+        print(format_report(reports))
+        if args.report:
+            args.report.write_text(json.dumps(reports, indent=2) + '\n')
+        if any(report['status'] == 'failed' for report in reports):
+            sys.exit(1)
+        return
+
     print(f'Converting package {args.path.name}')
 
     if not package_sanity_check(args.path):
         print('Conversion not possible, exiting.')
         sys.exit()
 
-    (leftover_setup_kwargs, toml_dict) = parse_setup_py(args.path / 'setup.py')
+    try:
+        (leftover_setup_kwargs,
+         toml_dict) = parse_setup_py(args.path / 'setup.py')
+    except SetupPyError as e:
+        print(f'XXX Error converting setup.py: {e} XXX')
+        print('XXX Please fix setup.py manually first XXX')
+        sys.exit(1)
 
     # Sanity check - if project has been converted already, give up.
     if 'name' not in toml_dict['project'] and \
@@ -463,8 +835,7 @@ def main():
     with change_dir(args.path) as cwd:
         bin_dir = pathlib.Path(cwd) / "bin"
 
-        call(bin_dir / "addchangelogentry",
-             'Move package metadata from setup.py to pyproject.toml.')
+        call(bin_dir / "addchangelogentry", COMMIT_MSG)
 
         with open(args.path / 'pyproject.toml', 'w') as fp:
             fp.write(toml_content)
@@ -484,16 +855,11 @@ def main():
                 pathlib.Path(cwd) / 'bin' / 'tox')
             call(tox_path, '-p', 'auto')
 
-        branch_name = args.branch_name or "convert-setup-py-to-pyproject-toml"
+        branch_name = args.branch_name or BRANCH_NAME
         updating = git_branch(branch_name)
 
         if args.commit:
-            if args.commit_msg:
-                commit_msg = args.commit_msg
-            else:
-                commit_msg = ('Move package metadata from setup.py'
-                              ' to pyproject.toml.')
-            call('git', 'commit', '-m', commit_msg)
+            call('git', 'commit', '-m', args.commit_msg or COMMIT_MSG)
             if args.push:
                 call('git', 'push', '--set-upstream', 'origin', branch_name)
 
@@ -10,6 +10,8 @@
 # FOR A PARTICULAR PURPOSE.
 #
 ##############################################################################
+import contextlib
+import os
 import subprocess
 import sys
 import textwrap
@@ -46,3 +48,30 @@ def call(*args, capture_output=False, cwd=None, allowed_return_codes=(0, )):
             abort_text = result.returncode
         abort(abort_text)
     return result
+
+
+@contextlib.contextmanager
+def output_to(log):
+    """Write all output, also of subprocesses, to the open file `log`.
+
+    Questions are answered with EOF, so `call()` fails instead of waiting.
+    """
+    stdin = sys.stdin
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = os.dup(1), os.dup(2)
+    # Subprocesses write to the file descriptors, Python to `sys.stdout`.
+    os.dup2(log.fileno(), 1)
+    os.dup2(log.fileno(), 2)
+    try:
+        with open(os.devnull) as sys.stdin, \
+                contextlib.redirect_stdout(log), \
+                contextlib.redirect_stderr(log):
+            yield
+            log.flush()
+    finally:
+        sys.stdin = stdin
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        os.close(saved[0])
+        os.close(saved[1])
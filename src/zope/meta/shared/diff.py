@@ -0,0 +1,68 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import contextlib
+import difflib
+import pathlib
+import shutil
+import tempfile
+
+
+COPY_IGNORE = shutil.ignore_patterns(
+    '.git', '.tox', '__pycache__', '*.egg-info', 'build', 'dist')
+
+
+@contextlib.contextmanager
+def scratch_copy(path):
+    """Copy the clone at `path` into a temporary directory.
+
+    Yields the path of the copy, which has the same name as `path` and an empty
+    `.git` directory, so it can be configured instead of the clone.
+    """
+    path = pathlib.Path(path).absolute()
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = pathlib.Path(tmp) / path.name
+        shutil.copytree(path, copy, ignore=COPY_IGNORE, symlinks=True)
+        (copy / '.git').mkdir()
+        yield copy
+
+
+def configured_files(path):
+    """Return the contents of the files `config-package` writes in `path`.
+
+    These are the top-level files and the files below `.github`, i. e. the
+    GitHub workflows and the helper scripts they call.
+    """
+    candidates = [p for p in path.iterdir() if p.is_file()]
+    github = path / '.github'
+    if github.is_dir():
+        candidates.extend(sorted(p for p in github.rglob('*') if p.is_file()))
+    contents = {}
+    for candidate in candidates:
+        try:
+            contents[str(candidate.relative_to(path))] = candidate.read_text()
+        except UnicodeDecodeError:
+            pass
+    return contents
+
+
+def unified_diffs(before, after):
+    """Return the unified diffs between two results of `configured_files`."""
+    diffs = {}
+    for name in sorted(set(before) | set(after)):
+        old = before.get(name, '')
+        new = after.get(name, '')
+        if old != new:
+            diffs[name] = ''.join(difflib.unified_diff(
+                old.splitlines(keepends=True), new.splitlines(keepends=True),
+                f'a/{name}', f'b/{name}'))
+    return diffs
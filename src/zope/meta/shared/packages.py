@@ -10,22 +10,36 @@
 # FOR A PARTICULAR PURPOSE.
 #
 ##############################################################################
+import argparse
 import configparser
 import contextlib
+import functools
+import io
 import itertools
 import os
 import pathlib
 import sys
+from typing import TYPE_CHECKING
 
-import tomlkit
-from packaging.version import parse as parse_version
-from tomlkit.toml_document import TOMLDocument
 
-from .script_args import get_shared_parser
+if TYPE_CHECKING:  # pragma: no cover
+    from tomlkit.toml_document import TOMLDocument
 
 
 TYPES = ['buildout-recipe', 'c-code', 'pure-python', 'zope-product', 'toolkit']
+#: The configuration types supporting `[coverage] collect-in-matrix`.
+COVERAGE_IN_MATRIX_TYPES = ('pure-python', 'zope-product')
+#: The configuration types supporting `[github-actions] shards`.
+SHARDS_TYPES = ('buildout-recipe', 'pure-python', 'zope-product')
+#: The values of `[github-actions] matrix-mode`.
+MATRIX_MODES = ('full', 'edges')
+#: The configuration types supporting `[github-actions] build-once`.
+BUILD_ONCE_TYPES = ('pure-python',)
+#: The values of `[c-code] manylinux-aarch64-test-python`.
+AARCH64_TEST_PYTHON = ('all', 'newest')
 ORG = 'zopefoundation'
+GITHUB_URL = 'https://github.com'
+GITHUB_RAW_URL = 'https://raw.githubusercontent.com'
 BASE_PATH = pathlib.Path(__file__).parent.parent
 OLDEST_PYTHON_VERSION = '3.10'
 NEWEST_PYTHON_VERSION = '3.14'
@@ -47,9 +61,37 @@ https://github.com/zopefoundation/meta/tree/master/src/zope/meta/{config_type}
 -->"""
 
 
-def get_pyproject_toml(path: pathlib.Path) -> TOMLDocument:
+def loads_toml(text: str) -> dict:
+    """Parse TOML `text` which is only read, not written back.
+
+    Uses the fast ``tomllib``, falling back to ``tomlkit`` on Python 3.10.
+    Return plain Python values.
+    """
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10
+        import tomlkit
+        return tomlkit.loads(text).unwrap()
+    return tomllib.loads(text)
+
+
+def load_toml(path: pathlib.Path) -> dict:
+    """Parse the TOML file `path` which is only read, not written back.
+
+    Return an empty dict if the file does not exist.
+    """
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as fp:
+        return loads_toml(fp.read())
+
+
+def get_pyproject_toml(path: pathlib.Path) -> 'TOMLDocument':
     """Parse ``pyproject.toml`` and return its values as ``TOMLDocument``.
 
+    Use it for files which are written back, as it keeps their formatting,
+    otherwise use the faster `load_toml`.
+
     Args:
         path (str, pathlib.Path): Filesystem path to a pyproject.toml file.
 
@@ -62,6 +104,7 @@ def get_pyproject_toml(path: pathlib.Path) -> TOMLDocument:
     else:
         toml_contents = ''
 
+    import tomlkit
     return tomlkit.loads(toml_contents)
 
 
@@ -110,6 +153,8 @@ def supported_python_versions(oldest_version=OLDEST_PYTHON_VERSION,
         short_version (bool):
             Return short versions like "313" instead of "3.13". Default False.
     """
+    from packaging.version import parse as parse_version
+
     minor_versions = []
     oldest_python = parse_version(oldest_version)
     newest_python = parse_version(NEWEST_PYTHON_VERSION)
@@ -133,36 +178,81 @@ def list_packages(path: pathlib.Path) -> list:
     ]
 
 
-ALL_REPOS = itertools.chain(
-    *[list_packages(BASE_PATH / type / 'packages.txt') for type in TYPES])
+@functools.cache
+def all_repos() -> tuple:
+    """Return the names of all packages listed in the `packages.txt` files.
 
+    The files are only read on the first call.
+    """
+    return tuple(itertools.chain.from_iterable(
+        list_packages(BASE_PATH / type / 'packages.txt') for type in TYPES))
 
-def load_overrides():
-    overrides_path = None
-    overrides = {}
-    arg_parser = get_shared_parser('')
 
-    # Prevent blowups when this is called during unit testing
+def registry(overrides_path=None):
+    """Return the names of the packages per configuration type.
+
+    The `packages.txt` files below `overrides_path` are read, too.
+    """
+    result = {}
+    for config_type in TYPES:
+        paths = [BASE_PATH / config_type / 'packages.txt']
+        if overrides_path:
+            paths.append(overrides_path / config_type / 'packages.txt')
+        names = []
+        for path in paths:
+            if path.exists():
+                names.extend(list_packages(path))
+        result[config_type] = list(dict.fromkeys(names))
+    return result
+
+
+def __getattr__(name):
+    # `ALL_REPOS` used to be computed at import time, keep it importable
+    # without reading all `packages.txt` files on every import.
+    if name == 'ALL_REPOS':
+        return all_repos()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def get_overrides_path(argv=None):
+    """Return the value of the `--overrides` argument in `argv`.
+
+    `argv` defaults to `sys.argv`. The other arguments of the script being
+    called are ignored, abbreviations like `--overr` are accepted.
+    """
+    if argv is None:
+        argv = sys.argv
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--overrides', type=pathlib.Path)
     try:
-        with open(os.devnull, 'w') as fp:
-            with contextlib.redirect_stderr(fp):
-                args = arg_parser.parse_args()
-        overrides_path = args.overrides_path
+        with contextlib.redirect_stderr(io.StringIO()):
+            args, _ = parser.parse_known_args(argv[1:])
     except SystemExit:
-        # This will happen during unit tests because the parser here collides
-        # with the parser for the test runner.
-        pass
+        # `--overrides` without a value
+        return None
+    return args.overrides
+
+
+def load_overrides():
+    """Apply the values in `overrides.toml` to the constants of this module.
+
+    The folder containing it is taken from the `--overrides` argument or from
+    the environment variable `ZOPE_META_OVERRIDES`.
+    """
+    overrides_path = get_overrides_path()
+    if overrides_path is None and os.environ.get('ZOPE_META_OVERRIDES'):
+        overrides_path = pathlib.Path(os.environ['ZOPE_META_OVERRIDES'])
+    overrides = {}
 
     if overrides_path:
-        path = overrides_path / 'overrides.toml'
-        if path.exists():
-            with open(path) as fp:
-                overrides = tomlkit.load(fp).unwrap()
+        overrides = load_toml(overrides_path / 'overrides.toml')
 
     if overrides:
         this_module = sys.modules[__name__]
         for key, value in overrides.items():
             if hasattr(this_module, key):
+                if isinstance(getattr(this_module, key), pathlib.Path):
+                    value = pathlib.Path(value)
                 setattr(this_module, key, value)
 
 
@@ -0,0 +1,136 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import fnmatch
+import pathlib
+
+from .packages import loads_toml
+
+
+class ProjectFiles:
+    """In-memory model of the configuration files of a package.
+
+    Each file is read from disk and parsed at most once. Changes are kept in
+    memory and written by `save()`, which only touches the files whose
+    content changed. File names are relative to `path` using forward slashes.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        # name -> content on disk, `None` if the file does not exist
+        self._on_disk = {}
+        # name -> content to be written
+        self._changed = {}
+        # name -> TOML document
+        self._documents = {}
+        # name -> function serializing the changed TOML document
+        self._serializers = {}
+        # name -> values parsed by `loads_toml`
+        self._values = {}
+        self._executable = set()
+
+    def _read_disk(self, name):
+        if name not in self._on_disk:
+            path = self.path / name
+            self._on_disk[name] = path.read_text() if path.exists() else None
+        return self._on_disk[name]
+
+    def read_text(self, name):
+        """Return the current content of `name`, `None` if it is missing."""
+        if name in self._serializers:
+            return self._serializers[name](self._documents[name])
+        if name in self._changed:
+            return self._changed[name]
+        return self._read_disk(name)
+
+    def write_text(self, name, content, executable=False):
+        """Replace the content of `name`."""
+        self._documents.pop(name, None)
+        self._serializers.pop(name, None)
+        self._values.pop(name, None)
+        self._changed[name] = content
+        if executable:
+            self._executable.add(name)
+
+    def exists(self, name):
+        return self.read_text(name) is not None
+
+    def glob(self, pattern):
+        """Return the paths of the files matching `pattern`.
+
+        Files which are only written by `save()` are included.
+        """
+        folder, _, file_pattern = pattern.rpartition('/')
+        names = {
+            path.relative_to(self.path).as_posix()
+            for path in self.path.glob(pattern) if path.is_file()}
+        names.update(
+            name for name in self._changed.keys() | self._serializers.keys()
+            if name.rpartition('/')[0] == folder
+            and fnmatch.fnmatch(name.rpartition('/')[2], file_pattern))
+        return sorted(
+            self.path / name for name in names if self.exists(name))
+
+    def toml(self, name):
+        """Return the TOML document `name` keeping the formatting of the file.
+
+        It is parsed only once, use `write_toml()` to save changes to it.
+        """
+        if name not in self._documents:
+            import tomlkit
+
+            self._documents[name] = tomlkit.loads(self.read_text(name) or '')
+        return self._documents[name]
+
+    def write_toml(self, name, serialize=None):
+        """Let `save()` write the changed TOML document `name`.
+
+        `serialize` converts the document to text, it defaults to
+        `tomlkit.dumps`.
+        """
+        if serialize is None:
+            import tomlkit
+            serialize = tomlkit.dumps
+        self.toml(name)
+        self._changed.pop(name, None)
+        self._values.pop(name, None)
+        self._serializers[name] = serialize
+
+    def read_toml(self, name):
+        """Return the values in the TOML file `name` for reading only.
+
+        If the file is being changed via `toml()`, its document is returned.
+        """
+        if name in self._documents:
+            return self._documents[name]
+        if name not in self._values:
+            self._values[name] = loads_toml(self.read_text(name) or '')
+        return self._values[name]
+
+    def save(self):
+        """Write the changed files, return their names."""
+        written = []
+        names = dict.fromkeys([*self._changed, *self._serializers])
+        for name in names:
+            content = self.read_text(name)
+            if content != self._read_disk(name):
+                path = self.path / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(content)
+                self._on_disk[name] = content
+                written.append(name)
+            if name in self._executable:
+                (self.path / name).chmod(0o755)
+        self._changed.clear()
+        self._serializers.clear()
+        self._executable.clear()
+        return written
@@ -0,0 +1,88 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+# Rewriting source files like `setup.py` using rules
+import collections
+import re
+
+
+#: Replacement of a rule deleting the whole line containing a match.
+DELETE_LINE = object()
+#: Flags of compiled patterns and their letters in a scoped inline group.
+INLINE_FLAGS = {re.A: 'a', re.I: 'i', re.M: 'm', re.S: 's', re.X: 'x'}
+
+
+def pattern_source(pattern):
+    """Return the source of a rule `pattern` for the combined expression.
+
+    The flags of a compiled pattern are kept by an inline group like
+    `(?i-m:...)`, as the combined expression is compiled with `re.M` only.
+    """
+    if not isinstance(pattern, re.Pattern):
+        return re.escape(pattern)
+    source = pattern.pattern
+    if pattern.flags & re.X:
+        # A comment at the end must not swallow the closing parenthesis.
+        source += '\n'
+    flags = ''.join(letter for flag, letter in INLINE_FLAGS.items()
+                    if pattern.flags & flag)
+    if not pattern.flags & re.M:
+        flags += '-m'
+    return f'(?{flags}:{source})'
+
+
+class Rewriter:
+    """Apply rewrite rules to a text in a single pass.
+
+    `rules` maps patterns to replacements. A pattern is either a literal
+    string or a compiled regular expression (its flags are kept), a
+    replacement is a string, a function getting the matched text or
+    `DELETE_LINE`. All rules are combined into one regular expression: line
+    deletions win over the other rules matching in the same line, otherwise
+    the first matching rule in the order of `rules` wins.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules.items())
+        deletions = []
+        replacements = []
+        for index, (pattern, replacement) in enumerate(self.rules):
+            group = f'(?P<rule{index}>{pattern_source(pattern)})'
+            if replacement is DELETE_LINE:
+                deletions.append(group)
+            else:
+                replacements.append(group)
+        alternatives = []
+        if deletions:
+            alternatives.append(
+                rf'^[^\n]*?(?:{"|".join(deletions)})[^\n]*(?:\n|\Z)')
+        alternatives.extend(replacements)
+        self.regex = re.compile('|'.join(alternatives) or r'(?!)', re.M)
+
+    def rewrite(self, text):
+        """Return the rewritten `text` and how often each rule fired.
+
+        The rules are identified by their pattern strings.
+        """
+        fired = collections.Counter()
+
+        def substitute(match):
+            group = match.lastgroup
+            pattern, replacement = self.rules[int(group[4:])]
+            fired[getattr(pattern, 'pattern', pattern)] += 1
+            if replacement is DELETE_LINE:
+                return ''
+            if callable(replacement):
+                return replacement(match.group(group))
+            return replacement
+
+        return self.regex.sub(substitute, text), fired
@@ -0,0 +1,222 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+# Static analysis of the configuration templates
+import collections
+import pathlib
+
+
+def referenced_templates(env, name):
+    """Return the names of the templates `name` includes or extends.
+
+    Templates included by included templates are returned, too. References
+    which cannot be resolved statically or do not exist are left out.
+    """
+    import jinja2
+    from jinja2 import meta
+
+    found = set()
+    todo = [name]
+    while todo:
+        try:
+            source = env.loader.get_source(env, todo.pop())[0]
+        except jinja2.TemplateNotFound:
+            continue
+        for reference in meta.find_referenced_templates(env.parse(source)):
+            if reference is not None and reference not in found:
+                found.add(reference)
+                todo.append(reference)
+    return found
+
+
+def templates_fed_by(env, top_level_names, changed_names):
+    """Return those of the `top_level_names` which use `changed_names`.
+
+    A top-level template uses a template if it is the template itself or if
+    it includes it, directly or not.
+    """
+    changed_names = set(changed_names)
+    return {
+        name for name in top_level_names
+        if name in changed_names
+        or changed_names & referenced_templates(env, name)
+    }
+
+
+def template_folders(config_type, overrides_path=None):
+    """Return the template folders `config-package` uses for a config type.
+
+    Earlier folders take precedence.
+    """
+    base_path = pathlib.Path(__file__).parent.parent
+    folders = []
+    if overrides_path:
+        overrides_path = pathlib.Path(overrides_path)
+        folders.extend([overrides_path / config_type,
+                        overrides_path / 'default'])
+    folders.extend([base_path / config_type, base_path / 'default'])
+    return folders
+
+
+def _guards(test):
+    """Return the conditions the `test` of an ``{% if %}`` consists of.
+
+    Only names, negated names and `and` combinations of both are understood,
+    other tests result in `None`. A condition is a tuple of the name and
+    whether it has to be true.
+    """
+    from jinja2 import nodes
+
+    if isinstance(test, nodes.Name):
+        return {(test.name, True)}
+    if isinstance(test, nodes.Not) and isinstance(test.node, nodes.Name):
+        return {(test.node.name, False)}
+    if isinstance(test, nodes.And):
+        left, right = _guards(test.left), _guards(test.right)
+        if left is not None and right is not None:
+            return left | right
+    return None
+
+
+def _is_blank(node):
+    from jinja2 import nodes
+
+    return isinstance(node, nodes.Output) and all(
+        isinstance(child, nodes.TemplateData) and not child.data.strip()
+        for child in node.nodes)
+
+
+class TemplateGraph:
+    """Dependencies between the templates of a Jinja environment.
+
+    The graph knows which template files a template uses via ``include`` and
+    ``extends`` and under which conditions, as well as which context
+    variables it reads.
+    """
+
+    def __init__(self, env):
+        self.env = env
+        self._parsed = {}
+
+    def _parse(self, name):
+        """Return the file name and the AST of `name` or `None`."""
+        import jinja2
+
+        if name not in self._parsed:
+            try:
+                source, filename, _ = self.env.loader.get_source(
+                    self.env, name)
+            except jinja2.TemplateNotFound:
+                self._parsed[name] = None
+            else:
+                self._parsed[name] = (
+                    str(pathlib.Path(filename).resolve()),
+                    self.env.parse(source))
+        return self._parsed[name]
+
+    def filename(self, name):
+        """Return the resolved path of the file `name` is loaded from."""
+        parsed = self._parse(name)
+        return parsed[0] if parsed else None
+
+    def _references(self, node, guards):
+        """Yield the names of the templates `node` references.
+
+        Each with the conditions it is guarded by.
+        """
+        from jinja2 import nodes
+
+        for child in node.iter_child_nodes():
+            if isinstance(child, nodes.If):
+                test_guards = _guards(child.test)
+                body_guards = guards | (test_guards or set())
+                for body_node in child.body:
+                    yield from self._references_of(body_node, body_guards)
+                for other in child.elif_ + child.else_:
+                    yield from self._references_of(other, guards)
+            else:
+                yield from self._references_of(child, guards)
+
+    def _references_of(self, node, guards):
+        from jinja2 import nodes
+
+        if isinstance(node, (nodes.Include, nodes.Extends, nodes.Import,
+                             nodes.FromImport)):
+            if isinstance(node.template, nodes.Const):
+                yield node.template.value, frozenset(guards)
+        else:
+            yield from self._references(node, guards)
+
+    def file_guards(self, name):
+        """Return the conditions the whole template `name` is guarded by.
+
+        This is the case if it consists of a single ``{% if %}`` block.
+        """
+        from jinja2 import nodes
+
+        parsed = self._parse(name)
+        if not parsed:
+            return frozenset()
+        body = [node for node in parsed[1].body if not _is_blank(node)]
+        if (len(body) == 1 and isinstance(body[0], nodes.If)
+                and not body[0].elif_ and not body[0].else_):
+            return frozenset(_guards(body[0].test) or ())
+        return frozenset()
+
+    def uses(self, name):
+        """Return the files the template `name` uses, including its own.
+
+        Map each resolved file name to the list of condition sets under one of
+        which the file is used.
+        """
+        uses = collections.defaultdict(list)
+        todo = [(name, frozenset(), ())]
+        while todo:
+            current, guards, seen = todo.pop()
+            parsed = self._parse(current)
+            if parsed is None or current in seen:
+                continue
+            uses[parsed[0]].append(guards | self.file_guards(current))
+            for reference, reference_guards in self._references(
+                    parsed[1], set(guards)):
+                todo.append(
+                    (reference, reference_guards, seen + (current, )))
+        return dict(uses)
+
+    def variables(self, name):
+        """Return the names of the context variables `name` reads."""
+        from jinja2 import meta
+
+        names = set()
+        for current in [name, *referenced_templates(self.env, name)]:
+            parsed = self._parse(current)
+            if parsed:
+                names |= meta.find_undeclared_variables(parsed[1])
+        return names
+
+    def affected_by(self, name, changed_files, context=None):
+        """Tell whether `changed_files` can change the output of `name`.
+
+        `context` maps the names of context variables to their values. Usages
+        guarded by a condition which is not met in `context` are ignored,
+        variables not in `context` are assumed to meet any condition.
+        """
+        context = context or {}
+        changed_files = {str(pathlib.Path(f).resolve()) for f in changed_files}
+        for filename, guard_sets in self.uses(name).items():
+            if filename not in changed_files:
+                continue
+            for guards in guard_sets:
+                if all(bool(context.get(variable, expected)) == expected
+                       for variable, expected in guards):
+                    return True
+        return False
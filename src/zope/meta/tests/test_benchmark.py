@@ -0,0 +1,44 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import json
+import unittest
+
+from zope.meta.benchmark import BASELINE_PATH
+from zope.meta.benchmark import compare
+from zope.meta.benchmark import run
+
+
+class BenchmarkTests(unittest.TestCase):
+
+    def test_benchmark__run__1(self):
+        """It returns the timings of all benchmarks of the selection."""
+
+        results = run(['toolkit', 'c-code'], ['overrides', 'coverage-combine'],
+                      repeat=1)
+
+        self.assertEqual(12, len(results))
+        self.assertGreater(results['c-code/overrides/render-cold'], 0)
+        self.assertEqual(set(results) - set(json.loads(
+            BASELINE_PATH.read_text())), set())
+
+    def test_benchmark__compare__1(self):
+        """It returns the benchmarks slower than the threshold."""
+
+        self.assertEqual(
+            {'a': (1.0, 1.6)},
+            compare({'a': 1.6, 'b': 1.4, 'c': 9.0}, {'a': 1.0, 'b': 1.0}))
+        self.assertEqual(
+            {}, compare({'a': 1.6}, {'a': 1.0}, threshold=2))
+        # Tiny timings are too noisy to be compared by their ratio:
+        self.assertEqual({}, compare({'a': 0.3}, {'a': 0.1}))
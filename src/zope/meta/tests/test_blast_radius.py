@@ -0,0 +1,116 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import pathlib
+import tempfile
+import unittest
+
+from zope.meta.blast_radius import blast_radius
+from zope.meta.blast_radius import package_context
+from zope.meta.config_package import make_jinja_env
+from zope.meta.shared.templates import TemplateGraph
+
+
+TEMPLATES = pathlib.Path(__file__).parent.parent
+DEFAULT = TEMPLATES / 'default'
+
+
+def graph(config_type):
+    return TemplateGraph(
+        make_jinja_env([TEMPLATES / config_type, DEFAULT]))
+
+
+class TemplateGraphTests(unittest.TestCase):
+
+    def test_templates__TemplateGraph__uses__1(self):
+        """It returns the used files with the conditions guarding them."""
+
+        uses = graph('pure-python').uses('tox.ini.j2')
+
+        self.assertEqual([frozenset()],
+                         uses[str(DEFAULT / 'tox-release-check.j2')])
+        self.assertEqual([frozenset({('with_docs', True)})],
+                         uses[str(DEFAULT / 'tox-docs.j2')])
+        self.assertIn(str(TEMPLATES / 'pure-python' / 'tox.ini.j2'), uses)
+
+    def test_templates__TemplateGraph__affected_by__1(self):
+        """It ignores changes to template parts a package does not use."""
+
+        docs = [DEFAULT / 'tox-docs.j2']
+        tox = graph('pure-python')
+
+        self.assertTrue(tox.affected_by('tox.ini.j2', docs))
+        self.assertTrue(
+            tox.affected_by('tox.ini.j2', docs, {'with_docs': True}))
+        self.assertFalse(
+            tox.affected_by('tox.ini.j2', docs, {'with_docs': False}))
+        self.assertFalse(tox.affected_by('setup.cfg.j2', docs))
+
+    def test_templates__TemplateGraph__variables__1(self):
+        """It returns the variables read, also by included templates."""
+
+        variables = graph('pure-python').variables('tox.ini.j2')
+
+        self.assertIn('lint_diff_on_failure', variables)
+        self.assertIn('docs_deps', variables)
+        self.assertNotIn('with_macos', variables)
+
+
+class BlastRadiusTests(unittest.TestCase):
+
+    def test_blast_radius__blast_radius__1(self):
+        """It lists the packages and files a template change affects."""
+
+        pairs = blast_radius([TEMPLATES / 'c-code' / 'tests-cache.j2'])
+
+        self.assertIn(
+            ('zope.interface', '.github/workflows/tests.yml', 'tests.yml.j2'),
+            pairs)
+        self.assertEqual({'.github/workflows/tests.yml'},
+                         {output for _, output, _ in pairs})
+
+    def test_blast_radius__blast_radius__2(self):
+        """It uses the `.meta.toml` of the clones."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            clones = pathlib.Path(tmp)
+            (clones / 'zope.interface').mkdir()
+            (clones / 'zope.interface' / '.meta.toml').write_text(
+                '[python]\nwith-docs = false\n')
+            pairs = blast_radius([DEFAULT / 'tox-docs.j2'], clones=clones)
+
+        packages = {package for package, _, _ in pairs}
+        self.assertIn('zope.proxy', packages)
+        self.assertNotIn('zope.interface', packages)
+
+    def test_blast_radius__blast_radius__3(self):
+        """It lists the files rendered from templates reading a variable."""
+
+        pairs = blast_radius(variables=['manylinux_aarch64'])
+
+        self.assertEqual({'.github/workflows/tests.yml'},
+                         {output for _, output, _ in pairs})
+
+    def test_blast_radius__package_context__1(self):
+        """It reads the options set in `.meta.toml`."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            meta_toml = pathlib.Path(tmp) / '.meta.toml'
+            self.assertEqual({}, package_context(meta_toml))
+            meta_toml.write_text(
+                '[python]\nwith-pypy = true\n\n[coverage]\ncombine = true\n')
+            self.assertEqual({'with_pypy': True, 'coverage_combine': True},
+                             package_context(meta_toml))
+            meta_toml.write_text('[importtime]\nmax-modules = 0\n')
+            self.assertEqual({'with_importtime': False},
+                             package_context(meta_toml))
@@ -12,6 +12,11 @@
 ##############################################################################
 
 import pathlib
+import re
+import runpy
+import subprocess
+import sys
+import tempfile
 import unittest
 
 from zope.meta.config_package import FUTURE_PYTHON_SHORTVERSION
@@ -37,11 +42,14 @@ def render(template_name, **context):
 #: i. e. the values `PackageConfiguration.tox()` passes to `tox.ini.j2`.
 TOX_CONTEXT = {
     'additional_envlist': [],
+    'additional_sections': [],
+    'build_once': False,
     'build_requirements': ['setuptools >= 78.1.1,< 82'],
     'config_type': 'pure-python',
     'coverage_additional': [],
     'coverage_basepython': 'python3',
     'coverage_command': [],
+    'coverage_in_matrix': False,
     'coverage_setenv': [],
     'docs_deps': [],
     'flake8_additional_sources': '',
@@ -49,6 +57,7 @@ TOX_CONTEXT = {
     'isort_additional_sources': '',
     'lint_diff_on_failure': True,
     'newest_python_shortversion_t': '314t',
+    'package_name': 'testpackage',
     'setuptools_version_spec': '>= 78.1.1,< 82',
     'supported_python_versions': ['310', '311'],
     'testenv_additional': [],
@@ -56,24 +65,31 @@ TOX_CONTEXT = {
     'testenv_commands': [],
     'testenv_commands_pre': [],
     'testenv_deps': [],
+    'testenv_parallel': 0,
     'testenv_setenv': [],
     'testenv_skip_test_extra': False,
+    'with_benchmarks': False,
     'with_docs': True,
     'with_free_threaded_python': False,
     'with_future_python': True,
+    'with_importtime': False,
     'with_pypy': False,
     'with_sphinx_doctests': True,
 }
 
 #: The same package as `TOX_CONTEXT`, for `tests.yml.j2`.
 TESTS_YML_CONTEXT = {
+    'build_once': False,
     'config_type': 'pure-python',
     'coverage_combine': False,
+    'coverage_in_matrix': False,
+    'detect_changes': False,
     'future_python_shortversion': '315',
     'future_python_version': '3.15',
     'gha_additional_config': [],
     'gha_additional_exclude': [],
     'gha_additional_install': [],
+    'gha_edges_exclude': [],
     'gha_services': [],
     'gha_skip_env_regex': '(docs|lint|release-check)',
     'gha_steps_before_checkout': [],
@@ -85,6 +101,7 @@ TESTS_YML_CONTEXT = {
     'package_name': 'testpackage',
     'pypy_version': '3.11',
     'setuptools_version_spec': '>= 78.1.1,< 82',
+    'shards': 0,
     'supported_python_versions': [('3.10', '310'), ('3.11', '311')],
     'use_trusted_publishing': False,
     'with_docs': True,
@@ -96,6 +113,25 @@ TESTS_YML_CONTEXT = {
     'with_windows': False,
 }
 
+#: A `c-code` package, the values `PackageConfiguration.manylinux_sh()`
+#: passes to `manylinux-install.sh.j2`.
+MANYLINUX_CONTEXT = {
+    'config_type': 'c-code',
+    'future_python_shortversion': '315',
+    'manylinux_aarch64_test_python': 'all',
+    'manylinux_aarch64_tests': ['cd /io/', '${PYBIN}/tox -e py', 'cd ..'],
+    'manylinux_ccache': False,
+    'manylinux_install_setup': [],
+    'manylinux_jobs': 1,
+    'manylinux_python_versions': ['313', '314', '315'],
+    'newest_python_shortversion': '314',
+    'package_name': 'zope.foo',
+    'package_name_pattern': 'zope?foo',
+    'supported_python_versions': ['313', '314'],
+    'with_free_threaded_python': False,
+    'with_future_python': True,
+}
+
 #: The values `PackageConfiguration.pre_commit_config_yaml()` passes to
 #: `pre-commit-config.yaml.j2`.
 PRE_COMMIT_CONTEXT = {
@@ -124,6 +160,28 @@ class ConfigPackageTests(unittest.TestCase):
         self.assertEqual('', prepend_space(''))
         self.assertEqual(' foobar', prepend_space('foobar'))
 
+    def test_config_package__tox__1(self):
+        """It adds the `additional-sections` at the end of `tox.ini`."""
+        from zope.meta.benchmark import make_package
+        from zope.meta.config_package import PackageConfiguration
+        from zope.meta.shared.packages import TYPES
+
+        for config_type in TYPES:
+            with self.subTest(config_type), \
+                    tempfile.TemporaryDirectory() as tmp:
+                args = make_package(tmp, config_type, 'default')
+                with (args.path / '.meta.toml').open('a') as meta_toml:
+                    meta_toml.write(
+                        '\n[tox]\nadditional-sections = [\n'
+                        '    "[testenv:foo]",\n'
+                        '    "commands =",\n'
+                        '    "    foo",\n'
+                        '    ]\n')
+                PackageConfiguration(args).write_files()
+                tox_ini = (args.path / 'tox.ini').read_text()
+                self.assertTrue(tox_ini.endswith(
+                    '\n\n[testenv:foo]\ncommands =\n    foo\n'), tox_ini)
+
 
 class PreCommitAdditionalConfigTests(unittest.TestCase):
     """Tests for the ``[pre-commit] additional-config`` option."""
@@ -264,3 +322,665 @@ class CombinedCoverageTests(unittest.TestCase):
 
         self.assertIn('      run: |\n        make test\n', tests_yml)
         self.assertNotIn('--skip-env', tests_yml)
+
+
+class CoverageInMatrixTests(unittest.TestCase):
+    """Tests for the ``[coverage] collect-in-matrix`` option."""
+
+    def test_config_package__tox_ini__1(self):
+        """It measures the coverage in the test environments."""
+
+        tox_ini = render('tox.ini.j2', **dict(
+            TOX_CONTEXT, coverage_in_matrix=True))
+        testenv = tox_ini.split('[testenv]')[1].split('[testenv:')[0]
+
+        self.assertIn('    coverage[toml]\n', testenv)
+        self.assertIn(
+            '    coverage run -m zope.testrunner --test-path=src'
+            ' {posargs:-vc}\n'
+            '    coverage run -a -m sphinx -b doctest', testenv)
+        self.assertNotIn('zope-testrunner', testenv)
+
+    def test_config_package__tox_ini__2(self):
+        """It keeps the test commands configured by the package."""
+
+        tox_ini = render('tox.ini.j2', **dict(
+            TOX_CONTEXT, coverage_in_matrix=True,
+            testenv_commands=['zope-testrunner --all']))
+
+        self.assertIn('commands =\n    zope-testrunner --all\n', tox_ini)
+
+    def test_config_package__tests_yml__1(self):
+        """It uploads the data of each job and combines it in a fan-in job."""
+
+        tests_yml = render('tests.yml.j2', **dict(
+            TESTS_YML_CONTEXT, coverage_combine=True,
+            coverage_in_matrix=True, with_windows=True))
+        build, coverage_job = tests_yml.split('\n  coverage:\n')
+
+        self.assertNotIn('"coverage"]', build)
+        self.assertIn(DEFAULT_TEST_COMMAND, build)
+        self.assertIn(
+            'name: coverage-data-${{ matrix.os[0] }}-${{ matrix.config[1] }}',
+            build)
+        self.assertNotIn('coveralls', build)
+        self.assertIn('    needs: [build]\n', coverage_job)
+        self.assertIn('        uvx --with tox-uv tox -e coverage\n',
+                      coverage_job)
+        self.assertIn('uvx coveralls --service=github', coverage_job)
+
+
+class TestenvParallelTests(unittest.TestCase):
+    """Tests for the ``[tox] testenv-parallel`` option."""
+
+    def test_config_package__tox_ini__1(self):
+        """It runs the layers in subprocesses and combines their coverage."""
+
+        tox_ini = render('tox.ini.j2', **dict(
+            TOX_CONTEXT, testenv_parallel=4))
+        testenv, coverage = tox_ini.split('[testenv:coverage]')
+
+        self.assertIn(
+            '    zope-testrunner --test-path=src -j4 {posargs:-vc}\n', testenv)
+        self.assertIn(
+            '    coverage run --parallel-mode -m zope.testrunner'
+            ' --test-path=src -j4 {posargs:-vc}\n'
+            '    coverage run --parallel-mode -m sphinx -b doctest', coverage)
+        self.assertIn('    coverage combine\n    coverage html', coverage)
+
+    def test_config_package__tox_ini__2(self):
+        """It writes parallel data files in the test environments.
+
+        Collecting the coverage in the matrix does not combine in the
+        `testenv`, the `coverage` environment does it for all of them. It
+        does not run `coverage erase`, which deletes all data files in
+        parallel mode.
+        """
+        from zope.meta.benchmark import make_package
+        from zope.meta.config_package import PackageConfiguration
+
+        with tempfile.TemporaryDirectory() as tmp:
+            args = make_package(tmp, 'pure-python', 'default')
+            meta_toml = args.path / '.meta.toml'
+            meta_toml.write_text(
+                meta_toml.read_text().replace(
+                    '[coverage]\n', '[coverage]\ncollect-in-matrix = true\n')
+                + '\n[tox]\ntestenv-parallel = 4\n')
+            PackageConfiguration(args).write_files()
+            tox_ini = (args.path / 'tox.ini').read_text()
+            pyproject_toml = (args.path / 'pyproject.toml').read_text()
+        testenv, coverage = tox_ini.split('[testenv:coverage]')
+
+        self.assertIn('patch = ["subprocess"]\n', pyproject_toml)
+        self.assertIn(
+            '    coverage run --parallel-mode -m zope.testrunner'
+            ' --test-path=src -j4 {posargs:-vc}\n', testenv)
+        self.assertNotIn('combine', testenv)
+        self.assertIn('    COVERAGE_FILE=.coverage.{envname}\n', testenv)
+        self.assertIn(
+            'commands =\n'
+            '    mkdir -p {toxinidir}/parts/htmlcov\n'
+            '    coverage combine\n'
+            '    coverage html\n', coverage)
+        self.assertNotIn('erase', coverage)
+        self.assertNotIn('--parallel-mode', coverage)
+        self.assertNotIn('-j4', coverage)
+
+    def test_config_package__tox_ini__3(self):
+        """It supports the other package types."""
+
+        for config_type in ('c-code', 'buildout-recipe', 'zope-product'):
+            with self.subTest(config_type=config_type):
+                tox_ini = render('tox.ini.j2', **dict(
+                    TOX_CONTEXT, config_type=config_type, testenv_parallel=2))
+                testenv, coverage = tox_ini.split('[testenv:coverage]')
+                self.assertIn(' -j2 {posargs:', testenv)
+                self.assertIn('coverage run --parallel-mode', coverage)
+                self.assertIn('    coverage combine\n', coverage)
+
+    def test_config_package__tox_ini__4(self):
+        """It renders the serial commands by default."""
+
+        tox_ini = render('tox.ini.j2', **TOX_CONTEXT)
+
+        self.assertNotIn('--parallel-mode', tox_ini)
+        self.assertNotIn(' -j', tox_ini)
+
+
+class ShardsTests(unittest.TestCase):
+    """Tests for the ``[github-actions] shards`` option."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.folder = pathlib.Path(self.tmp.name)
+        script = self.folder / '.github' / 'test-shards.py'
+        script.parent.mkdir()
+        script.write_text(render(
+            'test-shards.py.j2', config_type='pure-python', shards=3))
+        self.script = runpy.run_path(str(script))
+
+    def test_config_package__tests_yml__1(self):
+        """It splits the jobs of each Python version into shards."""
+
+        tests_yml = render('tests.yml.j2', **dict(
+            TESTS_YML_CONTEXT, shards=2, with_pypy=True))
+
+        self.assertIn('        - ["3.10", "py310", "1"]\n'
+                      '        - ["3.10", "py310", "2"]\n', tests_yml)
+        self.assertIn('        - ["pypy-3.11", "pypy3", "2"]\n', tests_yml)
+        self.assertIn('        - ["3.11", "docs"]\n', tests_yml)
+        self.assertIn(
+            "    name: ${{ matrix.config[1] }}${{ matrix.config[2]"
+            " && format('-{0}', matrix.config[2]) || '' }}\n", tests_yml)
+        self.assertIn(
+            '.github/test-shards.py select ${{ matrix.config[2] }})',
+            tests_yml)
+        self.assertEqual(3, tests_yml.count("&& matrix.config[2] == '1'"))
+        self.assertIn('\n  test-timings:\n', tests_yml)
+        self.assertIn('.github/test-shards.py record uvx --with tox-uv tox'
+                      ' -e py314 -- -vc', tests_yml)
+
+    def test_config_package__tests_yml__2(self):
+        """It does not change the matrix without shards."""
+
+        tests_yml = render('tests.yml.j2', **TESTS_YML_CONTEXT)
+
+        self.assertIn('        - ["3.10", "py310"]\n', tests_yml)
+        self.assertIn('    name: ${{ matrix.config[1] }}\n', tests_yml)
+        self.assertNotIn('test-shards', tests_yml)
+        self.assertEqual(
+            '', render('test-shards.py.j2', config_type='pure-python',
+                       shards=0).strip())
+
+    def test_test_shards__balance__1(self):
+        """It adds the longest module to the shortest shard first."""
+
+        timings = {'a': 5, 'b': 4, 'c': 3, 'd': 3, 'e': 2, 'f': 1}
+        self.assertEqual(
+            [(6, ['a', 'f']), (6, ['b', 'e']), (6, ['c', 'd'])],
+            self.script['balance'](timings))
+
+    def test_test_shards__select__1(self):
+        """It selects the modules of a shard.
+
+        The shortest shard runs all modules the other ones do not run.
+        """
+
+        select = self.script['select']
+        timings = {'a.tests': 5, 'b.tests': 4, 'c.tests': 2}
+        self.assertEqual(['--module=^a\\.tests$'], select(1, timings))
+        self.assertEqual(['--module=^b\\.tests$'], select(2, timings))
+        self.assertEqual(['--module=!^a\\.tests$', '--module=!^b\\.tests$'],
+                         select(3, timings))
+        # zope.testrunner searches using the options as regular expressions:
+        pattern = select(1, timings)[0].partition('=')[2]
+        self.assertTrue(re.search(pattern, 'a.tests'))
+        self.assertFalse(re.search(pattern, 'a_tests'))
+        self.assertFalse(re.search(pattern, 'a.tests.test_b'))
+
+    def test_test_shards__select__2(self):
+        """It runs all tests in the first shard without timings."""
+
+        select = self.script['select']
+        self.assertEqual([], select(1, {}))
+        self.assertEqual(['--module=!.'], select(2, {}))
+
+    def test_test_shards__record__1(self):
+        """It measures each test module zope.testrunner finds on its own."""
+
+        tests = self.folder / 'src' / 'zope' / 'foo' / 'tests'
+        tests.mkdir(parents=True)
+        for name in ('__init__.py', 'test_a.py', 'test_b.py', 'helper.py'):
+            (tests / name).write_text('')
+        (tests.parent / 'tests.py').write_text('')
+        (tests.parent / 'testing.py').write_text('')
+        log = self.folder / 'log'
+        command = [sys.executable, '-c',
+                   f'import sys; open({str(log)!r}, "a").write('
+                   'sys.argv[-1] + "\\n")']
+
+        timings = self.script['record'](command)
+
+        self.assertEqual(
+            ['zope.foo.tests', 'zope.foo.tests.test_a',
+             'zope.foo.tests.test_b'], sorted(timings))
+        self.assertEqual(
+            '--module=^zope\\.foo\\.tests$\n'
+            '--module=^zope\\.foo\\.tests\\.test_a$\n'
+            '--module=^zope\\.foo\\.tests\\.test_b$\n', log.read_text())
+        self.assertEqual(
+            timings, self.script['read_timings']())
+
+    def test_test_shards__main__1(self):
+        """It prints the options of a shard."""
+
+        (self.folder / '.github' / 'test-timings.json').write_text(
+            '{"a.tests": 3, "b.tests": 1}')
+        result = subprocess.run(
+            [sys.executable, '.github/test-shards.py', 'select', '1'],
+            cwd=self.folder, capture_output=True, text=True, check=True)
+        self.assertEqual('--module=^a\\.tests$\n', result.stdout)
+
+
+class MatrixModeTests(unittest.TestCase):
+    """Tests for the ``[github-actions] matrix-mode`` option."""
+
+    edges_exclude = [('3.11', 'py311'), ('pypy-3.11', 'pypy3')]
+
+    def test_config_package__tests_yml__1(self):
+        """It runs the edges on Windows and macOS outside the schedule."""
+
+        tests_yml = render('tests.yml.j2', **dict(
+            TESTS_YML_CONTEXT, with_windows=True, with_macos=True,
+            with_pypy=True, supported_python_versions=[
+                ('3.10', '310'), ('3.11', '311'), ('3.12', '312')],
+            gha_edges_exclude=self.edges_exclude))
+        exclude = tests_yml.split('        exclude:\n')[1].split('\n\n')[0]
+
+        self.assertIn(
+            "          - os: ${{ (github.event_name == 'schedule'"
+            " || startsWith(github.ref, 'refs/tags/')) && 'none'"
+            " || fromJSON('[\"windows\", \"windows-latest\"]') }}\n"
+            '            config: ["3.11", "py311"]\n', exclude)
+        self.assertIn("fromJSON('[\"macos\", \"macos-latest\"]') }}\n"
+                      '            config: ["pypy-3.11", "pypy3"]', exclude)
+        self.assertEqual(4, exclude.count("&& 'none'"))
+        self.assertNotIn('py310', exclude)
+        self.assertNotIn('py312', exclude)
+
+    def test_config_package__tests_yml__2(self):
+        """It excludes each shard and nothing without Windows or macOS."""
+
+        context = dict(TESTS_YML_CONTEXT, shards=2,
+                       gha_edges_exclude=self.edges_exclude)
+        tests_yml = render('tests.yml.j2', **dict(context, with_macos=True))
+        self.assertIn('            config: ["3.11", "py311", "2"]\n',
+                      tests_yml)
+        self.assertEqual(4, tests_yml.count("&& 'none'"))
+
+        self.assertNotIn('exclude:', render('tests.yml.j2', **context))
+
+    def test_config_package__tests_strategy__1(self):
+        """It runs the edges on macOS and Windows in `c-code` packages."""
+
+        strategy = render(
+            'tests-strategy.j2', config_type='c-code', with_windows=True,
+            supported_python_versions=[('3.10', '310'), ('3.11', '311')],
+            gha_additional_exclude=[], gha_edges_exclude=self.edges_exclude)
+
+        for os in ('macos-latest', 'windows-latest', 'windows-11-arm'):
+            self.assertIn(
+                "          - os: ${{ (github.event_name == 'schedule'"
+                " || startsWith(github.ref, 'refs/tags/')) && 'none'"
+                f" || '{os}' }}}}\n"
+                '            python-version: "3.11"\n', strategy)
+        self.assertEqual(6, strategy.count("&& 'none'"))
+
+
+class DetectChangesTests(unittest.TestCase):
+    """Tests for the ``[github-actions] detect-changes`` option."""
+
+    def test_config_package__tests_yml__1(self):
+        """It skips the steps of the jobs the changes cannot affect."""
+
+        tests_yml = render('tests.yml.j2', **dict(
+            TESTS_YML_CONTEXT, detect_changes=True,
+            with_sphinx_doctests=False))
+        changes, build = tests_yml.split('\n  build:\n')
+
+        self.assertIn('  changes:\n', changes)
+        self.assertIn(
+            '          files=$(gh api "repos/$REPO/pulls/$PR/files"', changes)
+        self.assertIn('            docs/*|*.rst|*.md|LICENSE*|COPYRIGHT*'
+                      '|.readthedocs.yaml) docs=true;;\n', changes)
+        self.assertNotIn('doctests', changes)
+        self.assertIn(
+            '        if [ $run_tests = true ] || [ $run_docs = true ]; then\n'
+            '          run_release_check=true\n', changes)
+        self.assertIn(
+            '    needs: [changes]\n'
+            '    env:\n'
+            '      # `false` if the changes cannot affect this job.\n'
+            "      RUN: ${{ matrix.config[1] == 'docs'"
+            ' && needs.changes.outputs.run-docs'
+            " || matrix.config[1] == 'release-check'"
+            ' && needs.changes.outputs.run-release-check'
+            ' || needs.changes.outputs.run-tests }}\n', build)
+        self.assertIn("    - name: Test\n      if: env.RUN == 'true'\n",
+                      build)
+        self.assertIn("      if: matrix.config[1] == 'coverage'"
+                      " && env.RUN == 'true'\n", build)
+        self.assertEqual(3, build.count("        && env.RUN == 'true'\n"))
+
+    def test_config_package__tests_yml__2(self):
+        """It runs the tests for documentation changes with doctests."""
+
+        tests_yml = render('tests.yml.j2', **dict(
+            TESTS_YML_CONTEXT, detect_changes=True))
+        self.assertIn('        [ $docs = true ] && run_tests=true\n',
+                      tests_yml)
+
+    def test_config_package__tests_yml__3(self):
+        """It is switched off by default."""
+
+        tests_yml = render('tests.yml.j2', **TESTS_YML_CONTEXT)
+
+        self.assertNotIn('changes', tests_yml)
+        self.assertNotIn('env.RUN', tests_yml)
+
+
+class BuildOnceTests(unittest.TestCase):
+    """Tests for the ``[github-actions] build-once`` option."""
+
+    def test_config_package__tests_yml__1(self):
+        """It tests the wheel built by the release-check job."""
+
+        tests_yml = render('tests.yml.j2', **dict(
+            TESTS_YML_CONTEXT, build_once=True, use_trusted_publishing=True))
+        release_check, build = tests_yml.split('\n  build:\n')
+
+        self.assertIn('      run: uvx --with tox-uv tox -e release-check\n'
+                      '    - name: Upload package wheel\n', release_check)
+        self.assertIn('    needs: [release-check]\n', build)
+        self.assertNotIn('"release-check"', build)
+        self.assertNotIn('Build package artifacts', build)
+        self.assertIn('        name: testpackage.whl\n'
+                      '        path: dist/\n', build)
+        self.assertIn(
+            '      run: uvx --with tox-uv tox -e ${{ matrix.config[1] }}'
+            ' --installpkg dist/*.whl\n', build)
+        self.assertIn('    needs: [release-check, build]\n', build)
+
+    def test_config_package__tests_yml__2(self):
+        """It installs the wheel in each shard."""
+
+        tests_yml = render('tests.yml.j2', **dict(
+            TESTS_YML_CONTEXT, build_once=True, shards=2))
+        self.assertIn('        wheel=$(echo dist/*.whl)\n        set -f\n',
+                      tests_yml)
+        self.assertEqual(2, tests_yml.count(
+            ' -e ${{ matrix.config[1] }} --installpkg "$wheel"'))
+
+    def test_config_package__build_once__1(self):
+        """It is only supported by the `pure-python` template."""
+        from zope.meta.benchmark import make_package
+        from zope.meta.config_package import PackageConfiguration
+
+        with tempfile.TemporaryDirectory() as tmp:
+            args = make_package(tmp, 'zope-product', 'default')
+            with (args.path / '.meta.toml').open('a') as meta_toml:
+                meta_toml.write('\n[github-actions]\nbuild-once = true\n')
+            self.assertFalse(PackageConfiguration(args).build_once)
+
+    def test_config_package__tox__1(self):
+        """It builds the wheel in release-check from the sdist."""
+
+        self.assertIn('    python -m build --sdist --no-isolation\n',
+                      render('tox.ini.j2', **TOX_CONTEXT))
+        tox_ini = render('tox.ini.j2', **dict(TOX_CONTEXT, build_once=True))
+        self.assertIn('    python -m build --no-isolation\n'
+                      '    twine check dist/*\n', tox_ini)
+
+    def test_config_package__tox__2(self):
+        """It runs the tests of the installed wheel."""
+
+        tox_ini = render('tox.ini.j2', **TOX_CONTEXT)
+        self.assertIn('usedevelop = true\n', tox_ini)
+        self.assertIn('    zope-testrunner --test-path=src {posargs:-vc}\n',
+                      tox_ini)
+        tox_ini = render('tox.ini.j2', **dict(TOX_CONTEXT, build_once=True))
+        self.assertNotIn('usedevelop', tox_ini)
+        self.assertIn(
+            '    zope-testrunner --test-path={envsitepackagesdir}'
+            ' --package=testpackage {posargs:-vc}\n', tox_ini)
+        # The coverage environment still measures the sources:
+        self.assertIn(
+            '    coverage run -m zope.testrunner --test-path=src'
+            ' {posargs:-vc}\n', tox_ini)
+
+    def test_config_package__pyproject_toml__1(self):
+        """It maps the coverage of the installed wheel to the sources."""
+        from zope.meta.benchmark import make_package
+        from zope.meta.config_package import PackageConfiguration
+
+        with tempfile.TemporaryDirectory() as tmp:
+            args = make_package(tmp, 'pure-python', 'default')
+            meta_toml = args.path / '.meta.toml'
+            meta_toml.write_text(
+                meta_toml.read_text().replace(
+                    '[coverage]\n', '[coverage]\ncollect-in-matrix = true\n')
+                + '\n[github-actions]\nbuild-once = true\n')
+            PackageConfiguration(args).write_files()
+            pyproject_toml = (args.path / 'pyproject.toml').read_text()
+            tox_ini = (args.path / 'tox.ini').read_text()
+
+        self.assertIn('[tool.coverage.paths]\nsource = [\n    "src/",\n'
+                      '    "*/site-packages/",\n]\n', pyproject_toml)
+        self.assertIn(
+            'zope.testrunner --test-path={envsitepackagesdir}'
+            ' --package=pure-python-default {posargs:-vc}\n', tox_ini)
+
+
+class ManylinuxTests(unittest.TestCase):
+    """Tests for the options of ``manylinux-install.sh``."""
+
+    def test_config_package__manylinux_sh__1(self):
+        """It builds the wheels one after another by default."""
+
+        script = render('manylinux-install.sh.j2', **MANYLINUX_CONTEXT)
+        self.assertIn(
+            '        *"cp313/"*|*"cp314/"*|*"cp315/"*) return 0;;\n', script)
+        self.assertIn(
+            '    "${PYBIN}/pip" wheel /io/ $(pip_pre) -w wheelhouse/\n',
+            script)
+        self.assertIn('    if supported_python; then\n'
+                      '        build_wheel\n', script)
+        self.assertIn('        if supported_python; then\n'
+                      '            test_wheel\n', script)
+        self.assertNotIn('ccache', script)
+        self.assertNotIn('wait', script)
+
+    def test_config_package__manylinux_sh__2(self):
+        """It can build in parallel using ccache and test one version."""
+
+        script = render('manylinux-install.sh.j2', **dict(
+            MANYLINUX_CONTEXT, manylinux_jobs=3, manylinux_ccache=True,
+            manylinux_aarch64_test_python='newest'))
+        self.assertIn('export CCACHE_DIR="/cache/ccache"\n', script)
+        self.assertIn('    export CCACHE_BASEDIR="${src}"\n', script)
+        self.assertIn(
+            '        while [ "$(jobs -pr | wc -l)" -ge 3 ]; do\n', script)
+        self.assertIn('        build_wheel > "${log}" 2>&1 &\n', script)
+        self.assertIn(
+            '    mv "${src}"/wheelhouse/zope?foo*.whl wheelhouse/\n', script)
+        self.assertIn(
+            '        if [[ "${PYBIN}" == *"cp314/"* ]]; then\n'
+            '            test_wheel\n', script)
+        self.assertTrue(script.endswith('ccache --show-stats\n'))
+
+
+class CompilerCacheTests(unittest.TestCase):
+    """Tests for the ``[c-code] compiler-cache`` option."""
+
+    def test_config_package__tests_yml__1(self):
+        """It sets up ccache keyed by OS, architecture and Python version."""
+
+        self.assertEqual('', render('tests-ccache.j2', config_type='c-code'))
+        steps = render('tests-ccache.j2', config_type='c-code',
+                       compiler_cache=True)
+        self.assertIn(
+            "        if: ${{ !startsWith(runner.os, 'Windows') }}\n", steps)
+        self.assertIn(
+            '          key: ${{ runner.os }}-${{ runner.arch }}-ccache-'
+            '${{ matrix.python-version }}-'
+            '${{ steps.pip-cache-epoch.outputs.week }}\n', steps)
+
+    def test_config_package__tests_yml__2(self):
+        """It caches the ccache directory of the manylinux containers."""
+        from zope.meta.benchmark import make_package
+        from zope.meta.config_package import PackageConfiguration
+
+        with tempfile.TemporaryDirectory() as tmp:
+            args = make_package(tmp, 'c-code', 'default')
+            with (args.path / '.meta.toml').open('a') as meta_toml:
+                meta_toml.write('\n[c-code]\ncompiler-cache = true\n'
+                                'manylinux-ccache = true\n')
+            PackageConfiguration(args).write_files()
+            tests_yml = (
+                args.path / '.github' / 'workflows' / 'tests.yml').read_text()
+
+        self.assertEqual(2, tests_yml.count('      - name: Set up ccache\n'))
+        self.assertIn('          path: ${{ steps.ccache.outputs.dir }}\n',
+                      tests_yml)
+        self.assertIn(
+            '          sudo chown -R $(whoami)'
+            ' ${{ steps.ccache.outputs.dir }}\n', tests_yml)
+
+
+class BenchmarksTests(unittest.TestCase):
+    """Tests for the ``[python] with-benchmarks`` option."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.folder = pathlib.Path(self.tmp.name)
+        script = self.folder / '.github' / 'benchmarks.py'
+        script.parent.mkdir()
+        script.write_text(render(
+            'benchmarks.py.j2', config_type='pure-python',
+            with_benchmarks=True, benchmarks_threshold=5,
+            benchmarks_fail_threshold=20))
+        self.script = runpy.run_path(str(script))
+
+    def test_config_package__tox__1(self):
+        """It adds a `bench` environment not run by default."""
+
+        self.assertNotIn('bench', render('tox.ini.j2', **TOX_CONTEXT))
+        tox_ini = render('tox.ini.j2', **dict(
+            TOX_CONTEXT, with_benchmarks=True))
+        self.assertIn(
+            '[testenv:bench]\n'
+            'description = run the pyperf benchmarks in benchmarks/\n',
+            tox_ini)
+        self.assertIn('    python .github/benchmarks.py run'
+                      ' {posargs:{envdir}/benchmarks.json}\n', tox_ini)
+        self.assertNotIn('    bench\n', tox_ini)
+
+    def test_config_package__benchmarks__1(self):
+        """It compares the mean durations of two runs."""
+
+        lines, failed = self.script['compare'](
+            {'a': 1e-6, 'b': 2e-3, 'c': 1.0, 'old': 1.0},
+            {'a': 1.03e-6, 'b': 2.2e-3, 'c': 0.5, 'new': 5e-9})
+        self.assertEqual([
+            '| Benchmark | Base | Head | Change |',
+            '| :-- | --: | --: | --: |',
+            '| a | 1.00 us | 1.03 us | +3.0 % |',
+            '| b | 2.00 ms | 2.20 ms | +10.0 % :warning: |',
+            '| c | 1.00 s | 500.00 ms | -50.0 % :rocket: |',
+            '| new | | 5.00 ns | new |',
+            '| old | 1.00 s | | removed |',
+        ], lines)
+        self.assertFalse(failed)
+
+    def test_config_package__benchmarks__2(self):
+        """It fails for a change over the fail threshold."""
+
+        lines, failed = self.script['compare']({'a': 1.0}, {'a': 1.25})
+        self.assertEqual('| a | 1.00 s | 1.25 s | +25.0 % :x: |', lines[-1])
+        self.assertTrue(failed)
+        self.assertEqual({}, self.script['means'](self.folder / 'x.json'))
+
+    def test_config_package__benchmarks__3(self):
+        """It runs the benchmark scripts appending to one file."""
+
+        benchmarks = self.folder / 'benchmarks'
+        benchmarks.mkdir()
+        (benchmarks / 'bench_a.py').write_text(
+            'import sys\nopen(sys.argv[2], "a").write("a")\n')
+        (benchmarks / 'bench_b.py').write_text('raise SystemExit(1)\n')
+        (benchmarks / 'helpers.py').write_text('raise SystemExit(1)\n')
+        output = self.folder / 'out.json'
+        output.write_text('old')
+
+        self.assertEqual(['bench_b.py'], self.script['run'](output))
+        self.assertEqual('a', output.read_text())
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:       900 |       1020 | json.decoder
+import time:       300 |        300 |   json.scanner
+import time:       400 |       1720 | json
+"""
+
+
+class ImporttimeTests(unittest.TestCase):
+    """Tests for the ``[importtime]`` budget."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        script = pathlib.Path(self.tmp.name) / 'importtime.py'
+        script.write_text(render(
+            'importtime.py.j2', config_type='pure-python',
+            with_importtime=True, importtime_module='json',
+            importtime_runs=2, importtime_top=2,
+            importtime_cumulative_budget=1, importtime_max_modules=10))
+        self.script = runpy.run_path(str(script))
+
+    def test_config_package__tox__1(self):
+        """It adds an `importtime` environment not run by default."""
+
+        self.assertNotIn('importtime', render('tox.ini.j2', **TOX_CONTEXT))
+        tox_ini = render('tox.ini.j2', **dict(
+            TOX_CONTEXT, with_importtime=True, importtime_module='json'))
+        self.assertIn(
+            '[testenv:importtime]\n'
+            'description = check the import time of json against its'
+            ' budget\n', tox_ini)
+        self.assertIn('    python .github/importtime.py\n', tox_ini)
+        self.assertNotIn('    importtime\n', tox_ini)
+
+    def test_config_package__importtime__1(self):
+        """It parses the output of `python -X importtime`."""
+
+        self.assertEqual({
+            '_json': (120, 120, 1),
+            'json.decoder': (900, 1020, 0),
+            'json.scanner': (300, 300, 1),
+            'json': (400, 1720, 0),
+        }, self.script['parse'](IMPORTTIME_OUTPUT))
+
+    def test_config_package__importtime__2(self):
+        """It reports the top modules and whether the budget is exceeded."""
+
+        timings = self.script['parse'](IMPORTTIME_OUTPUT)
+        lines, exceeded = self.script['report'](timings)
+        self.assertEqual([
+            'Cumulative import time: 2.7 ms (budget: 1 ms)',
+            'Imported modules: 4 (budget: 10)',
+            '',
+            'Top 2 modules by self time:',
+            '    self [ms]  cumulative [ms]  module',
+            '         0.90             1.02  json.decoder',
+            '         0.40             1.72  json',
+            '',
+            'Over budget: the cumulative import time.',
+        ], lines)
+        self.assertTrue(exceeded)
+
+        lines, exceeded = self.script['report'](
+            timings, cumulative_budget=0, max_modules=0)
+        self.assertEqual('Cumulative import time: 2.7 ms', lines[0])
+        self.assertEqual('Imported modules: 4', lines[1])
+        self.assertFalse(exceeded)
+
+    def test_config_package__importtime__3(self):
+        """It measures the modules not imported on start up."""
+
+        timings = self.script['measure']()
+        self.assertIn('json', timings)
+        self.assertNotIn('sys', timings)
@@ -0,0 +1,154 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import os
+import pathlib
+import stat
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from zope.meta.daemon import ConfigDaemon
+from zope.meta.daemon import DaemonServer
+from zope.meta.daemon import default_socket_path
+from zope.meta.daemon import private_dir
+from zope.meta.daemon import send_request
+from zope.meta.shared import packages
+
+
+def make_package(parent, name='foo.bar', config_type='pure-python'):
+    """Create a minimal package `config-package` can be run on."""
+    path = pathlib.Path(parent) / name
+    (path / '.git').mkdir(parents=True)
+    (path / 'setup.py').write_text(
+        'from setuptools import setup\nsetup(name="foo.bar")\n')
+    (path / '.meta.toml').write_text(
+        f'[meta]\ntemplate = "{config_type}"\n\n'
+        '[coverage]\nfail-under = 90\n')
+    return path
+
+
+class ConfigDaemonTests(unittest.TestCase):
+
+    def setUp(self):
+        self.daemon = ConfigDaemon()
+
+    def test_daemon__handle__1(self):
+        """It reports unknown commands."""
+
+        response = self.daemon.handle({'command': 'foo'})
+        self.assertFalse(response['ok'])
+        self.assertEqual("Unknown command 'foo'.", response['error'])
+
+    def test_daemon__handle__2(self):
+        """It reports errors instead of stopping."""
+
+        response = self.daemon.handle({'command': 'query', 'what': 'foo'})
+        self.assertFalse(response['ok'])
+        self.assertIn("Cannot query 'foo'.", response['error'])
+
+    def test_daemon__do_query__1(self):
+        """It answers which configuration type a package uses."""
+
+        response = self.daemon.handle(
+            {'command': 'query', 'what': 'type', 'name': 'zope.interface'})
+        self.assertEqual({'ok': True, 'result': 'c-code', 'output': ''},
+                         response)
+
+    def test_daemon__do_query__2(self):
+        """It lists the packages of a configuration type."""
+
+        response = self.daemon.handle(
+            {'command': 'query', 'what': 'packages', 'type': 'toolkit'})
+        self.assertIn('zopetoolkit', response['result'])
+
+    def test_daemon__do_diff__1(self):
+        """It returns the changes without touching the package."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = make_package(tmp)
+            response = self.daemon.handle(
+                {'command': 'diff', 'argv': [str(path)]})
+            self.assertTrue(response['ok'], response.get('error'))
+            self.assertIn('tox.ini', response['result'])
+            self.assertIn('+    py310\n', response['result']['tox.ini'])
+            self.assertFalse((path / 'tox.ini').exists())
+
+    def test_daemon__do_configure__1(self):
+        """It does not add the package to a `packages.txt`."""
+
+        packages_txt = packages.BASE_PATH / 'pure-python' / 'packages.txt'
+        before = packages_txt.read_text()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = make_package(tmp)
+            response = self.daemon.handle(
+                {'command': 'configure', 'argv': [str(path)]})
+            self.assertTrue(response['ok'], response.get('error'))
+            self.assertIn('tox.ini', response['result'])
+        self.assertEqual(before, packages_txt.read_text())
+
+
+class DaemonServerTests(unittest.TestCase):
+
+    def test_daemon__send_request__1(self):
+        """It answers requests sent over the socket."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = pathlib.Path(tmp) / 'meta.sock'
+            with DaemonServer(socket_path, ConfigDaemon()) as server:
+                thread = threading.Thread(target=server.serve_forever)
+                thread.start()
+                try:
+                    response = send_request(socket_path, {'command': 'ping'})
+                finally:
+                    server.shutdown()
+                    thread.join()
+        self.assertEqual({'ok': True, 'result': 'pong', 'output': ''},
+                         response)
+
+    def test_daemon__DaemonServer__1(self):
+        """Only the current user can use the socket."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = pathlib.Path(tmp) / 'meta.sock'
+            with DaemonServer(socket_path, ConfigDaemon()):
+                self.assertEqual(
+                    0o600, stat.S_IMODE(socket_path.stat().st_mode))
+
+    def test_daemon__default_socket_path__1(self):
+        """It uses a private directory in the temporary directory."""
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict(os.environ, XDG_RUNTIME_DIR=''), \
+                mock.patch('tempfile.gettempdir', return_value=tmp):
+            socket_path = default_socket_path()
+            self.assertEqual(
+                pathlib.Path(tmp, f'zope-meta-{os.getuid()}', 'daemon.sock'),
+                socket_path)
+            self.assertEqual(
+                0o700, stat.S_IMODE(socket_path.parent.stat().st_mode))
+
+    def test_daemon__private_dir__1(self):
+        """It refuses a directory other users can access."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp, 'shared')
+            path.mkdir(mode=0o755)
+            path.chmod(0o755)
+            with self.assertRaises(PermissionError):
+                private_dir(path)
+            link = pathlib.Path(tmp, 'link')
+            link.symlink_to(private_dir(pathlib.Path(tmp, 'private')))
+            with self.assertRaises(PermissionError):
+                private_dir(link)
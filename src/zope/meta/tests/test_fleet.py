@@ -0,0 +1,137 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import ast
+import contextlib
+import io
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+import unittest.mock
+
+from zope.meta.fake_github import FakeGitHubServer
+from zope.meta.fake_github import gh
+from zope.meta.fleet import fleet_environ
+from zope.meta.fleet import generate
+from zope.meta.fleet import run
+
+
+class FleetTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.target = pathlib.Path(self.tmp.name).resolve() / 'fleet'
+        self.fleet = generate(self.target, 2, ['c-code', 'pure-python'])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fleet__generate__1(self):
+        """It creates remotes containing packages and lists them."""
+
+        self.assertEqual(
+            ['fleet.ccode0001', 'fleet.ccode0002',
+             'fleet.pure0001', 'fleet.pure0002'],
+            sorted(self.fleet['repos']))
+        self.assertEqual(
+            'fleet.pure0001\nfleet.pure0002\n',
+            (self.target / 'overrides' / 'pure-python' / 'packages.txt'
+             ).read_text())
+        clone = pathlib.Path(self.tmp.name) / 'clone'
+        subprocess.run(
+            ['git', 'clone', '--quiet',
+             str(self.target / 'remotes' / 'zopefoundation' /
+                 'fleet.ccode0001.git'), str(clone)], check=True)
+        ast.parse((clone / 'setup.py').read_text())
+        self.assertIn('template = "c-code"',
+                      (clone / '.meta.toml').read_text())
+        self.assertTrue(
+            (clone / 'src' / 'fleet' / 'ccode0001' / '_speedups.c').exists())
+
+    def serve(self):
+        server = FakeGitHubServer(self.target)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def gh(self, server, *argv):
+        stdout = io.StringIO()
+        env = {'ZOPE_META_FAKE_GITHUB': server.url}
+        with unittest.mock.patch.dict(os.environ, env), \
+                contextlib.redirect_stdout(stdout), \
+                contextlib.redirect_stderr(io.StringIO()):
+            returncode = gh(argv)
+        return returncode, stdout.getvalue()
+
+    def test_fake_github__gh__1(self):
+        """It answers the requests of the scripts like GitHub."""
+
+        server = self.serve()
+        repo = 'zopefoundation/fleet.pure0001'
+        path = ('/repos/zopefoundation/fleet.pure0001/branches/master'
+                '/protection')
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as input:
+            json.dump({'required_status_checks': {'contexts': ['lint']},
+                       'required_pull_request_reviews': None}, input)
+            input.flush()
+            self.assertEqual(0, self.gh(
+                server, 'api', '--method', 'PUT', path, '--input',
+                input.name)[0])
+
+        returncode, output = self.gh(
+            server, 'api', f'{path}/required_pull_request_reviews')
+        self.assertEqual(1, returncode)
+        self.assertEqual('Required pull request reviews not enabled.',
+                         json.loads(output)['message'])
+        returncode, output = self.gh(server, 'workflow', 'list', '-R', repo)
+        self.assertEqual(0, returncode)
+        self.assertTrue(output.startswith('tests\t'))
+        self.assertEqual(
+            1, self.gh(server, 'api', '/repos/zopefoundation/foo/pulls')[0])
+
+    def test_fleet__run__1(self):
+        """It runs a script on the fleet and counts the requests."""
+
+        returncode, duration, requests = run(self.target, [
+            sys.executable, '-c',
+            'import sys;'
+            'sys.argv = ["set-branch-protection-rules",'
+            ' "--I-am-authenticated"];'
+            'from zope.meta.set_branch_protection_rules import main; main()',
+        ])
+
+        self.assertEqual(0, returncode)
+        self.assertEqual(
+            {'GET /raw': 4, 'GET protection/required_pull_request_reviews': 4,
+             'PUT protection': 4}, requests)
+
+    def test_fleet__fleet_environ__1(self):
+        """It makes the scripts use the packages of the fleet."""
+
+        env = fleet_environ(self.target, 'http://localhost:1')
+        output = subprocess.run(
+            [sys.executable, '-c',
+             'from zope.meta.shared import packages;'
+             'print(packages.all_repos(), packages.GITHUB_RAW_URL)'],
+            env=env, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(
+            "('fleet.ccode0001', 'fleet.ccode0002', 'fleet.pure0001',"
+            " 'fleet.pure0002') http://localhost:1/raw\n", output)
@@ -0,0 +1,133 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import pathlib
+import tempfile
+import textwrap
+import unittest
+
+from zope.meta.legacy_python import scan_file
+from zope.meta.legacy_python import scan_packages
+
+
+LEGACY_MODULE = '''\
+"""Docstring mentioning sys.version_info, PY3 and ImportError."""
+import sys
+
+import six
+
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+try:
+    import zope.foo
+except ImportError:  # Python 3.9 does not matter here
+    zope = None
+
+PY3 = sys.version_info[0] == 3
+if sys.version_info >= (3, 8):
+    pass
+if sys.version_info >= (3, 12):
+    pass
+if (3, 10) > sys.version_info[:2]:
+    pass
+text = "sys.version_info < (3,)"
+
+
+class Foo:
+
+    def __unicode__(self):
+        return ''
+'''
+
+
+class LegacyPythonTests(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = pathlib.Path(tmp.name)
+
+    def scan(self, source, oldest='3.10'):
+        path = self.path / 'module.py'
+        path.write_text(textwrap.dedent(source))
+        return [(f['line'], f['kind']) for f in scan_file(path, oldest)]
+
+    def test_legacy_python__scan_file__1(self):
+        """It finds legacy code but not mentions in strings and comments."""
+
+        self.assertEqual([
+            (4, 'six'),
+            (7, 'import-fallback'),
+            (16, 'py2-flag'),
+            (16, 'version-check'),
+            (17, 'version-check'),
+            (21, 'version-check'),
+            (28, 'py2-method'),
+        ], self.scan(LEGACY_MODULE))
+
+    def test_legacy_python__scan_file__2(self):
+        """It considers the oldest supported Python version."""
+
+        source = '''\
+            import sys
+            if sys.version_info < (3, 12):
+                pass
+            if sys.hexversion >= 0x030B0000:
+                pass
+            '''
+        self.assertEqual([], self.scan(source, '3.10'))
+        self.assertEqual([(2, 'version-check'), (4, 'version-check')],
+                         self.scan(source, '3.12'))
+
+    def test_legacy_python__scan_file__3(self):
+        """It returns a finding for files it cannot parse."""
+
+        findings = self.scan('print sys.version\n')
+        self.assertEqual([(1, 'syntax-error')], findings)
+
+    def test_legacy_python__scan_file__4(self):
+        """It only reports the upper case compat flag names."""
+
+        source = '''\
+            import six
+            from zope.foo._compat import PY2
+            if PY2 or six.PY3 or PYTHON3 or PY3K:
+                pass
+            python3 = py3 = Py3k = 'python3'
+            options.python3
+            '''
+        self.assertEqual(
+            [(1, 'six'), (3, 'py2-flag'), (3, 'py2-flag'), (3, 'py2-flag'),
+             (3, 'py2-flag')],
+            self.scan(source))
+
+    def test_legacy_python__scan_packages__1(self):
+        """It scans the clones using their oldest Python version."""
+
+        for name, oldest in (('zope.interface', '3.12'),
+                             ('zope.component', '3.10')):
+            src = self.path / name / 'src' / 'zope'
+            src.mkdir(parents=True)
+            (src / 'compat.py').write_text(
+                'import sys\nPY312 = sys.version_info >= (3, 12)\n')
+            (self.path / name / '.meta.toml').write_text(
+                f'[python]\noldest-python = "{oldest}"\n')
+        findings = scan_packages(self.path, workers=2)
+        self.assertEqual(
+            [('zope.interface', 'version-check')],
+            sorted((f['package'], f['kind']) for f in findings))
+        self.assertEqual(
+            'PY312 = sys.version_info >= (3, 12)', findings[0]['code'])
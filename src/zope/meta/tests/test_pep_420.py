@@ -0,0 +1,138 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import os
+import pathlib
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from zope.meta.pep_420 import SETUP_PY_RULES
+from zope.meta.pep_420 import format_index
+from zope.meta.pep_420 import namespace_index
+from zope.meta.pep_420 import namespace_packages
+from zope.meta.shared.rewrite import Rewriter
+from zope.meta.tests.test_update_python_support import GIT_ENVIRON
+
+
+PKG_RESOURCES = "__import__('pkg_resources').declare_namespace(__name__)\n"
+PKGUTIL = "__path__ = __import__('pkgutil').extend_path(__path__, __name__)\n"
+
+
+def make_clone(path, files):
+    for file_name, content in files.items():
+        (path / file_name).parent.mkdir(parents=True, exist_ok=True)
+        (path / file_name).write_text(content)
+    with mock.patch.dict(os.environ, GIT_ENVIRON):
+        for command in (['git', 'init', '-q', '-b', 'master'],
+                        ['git', 'add', '.'],
+                        ['git', 'commit', '-q', '-m', 'Initial.']):
+            subprocess.run(command, cwd=path, check=True)
+
+
+class Pep420Tests(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = pathlib.Path(tmp.name)
+        make_clone(self.path / 'zope.app.foo', {
+            'setup.py': "setup(namespace_packages=['zope', 'zope.app'])\n",
+            'src/zope/__init__.py': PKG_RESOURCES,
+            'src/zope/app/__init__.py': PKG_RESOURCES,
+            'src/zope/app/foo/__init__.py': '',
+            # Not a namespace as it is inside a regular package:
+            'src/zope/app/foo/bar/__init__.py': PKG_RESOURCES,
+        })
+        make_clone(self.path / 'Products.Foo', {
+            'setup.py': 'setup()\n',
+            'src/Products/__init__.py': PKGUTIL,
+            'src/Products/Foo/__init__.py': '',
+        })
+        make_clone(self.path / 'zope.native', {
+            'setup.py': 'setup()\n',
+            'src/zope/native/__init__.py': '',
+        })
+
+    def test_pep_420__namespace_packages__1(self):
+        """It finds the nested namespaces in the working tree or a ref."""
+
+        expected = [
+            {'name': 'zope', 'depth': 1, 'style': 'pkg_resources'},
+            {'name': 'zope.app', 'depth': 2, 'style': 'pkg_resources'},
+        ]
+        path = self.path / 'zope.app.foo'
+        self.assertEqual(expected, namespace_packages(path))
+        (path / 'src' / 'zope' / 'app' / '__init__.py').unlink()
+        self.assertEqual(expected[:1], namespace_packages(path))
+        self.assertEqual(expected, namespace_packages(path, ref='HEAD'))
+
+    def test_pep_420__namespace_index__1(self):
+        """It lists the packages of a fleet which need a conversion."""
+
+        index = namespace_index(self.path)
+        self.assertEqual(
+            [('Products.Foo', 1, True), ('zope.app.foo', 2, True),
+             ('zope.native', 0, False)],
+            [(entry['package'], entry['depth'], entry['needs_conversion'])
+             for entry in index])
+        self.assertEqual(
+            'Products.Foo: depth 1: Products (pkgutil)\n'
+            'zope.app.foo: depth 2: zope (pkg_resources),'
+            ' zope.app (pkg_resources), setup.py namespace_packages\n'
+            '2 of 3 packages need a conversion.',
+            format_index(index))
+        self.assertEqual(
+            ['zope.native'],
+            [entry['package']
+             for entry in namespace_index(
+                 self.path, names={'zope.native'}, ref='HEAD')])
+
+    def test_pep_420__namespace_index__2(self):
+        """It reads `setup.py` from the ref, too."""
+
+        path = self.path / 'zope.app.foo'
+        (path / 'setup.py').write_text('setup()\n')
+        index = namespace_index(self.path, names={'zope.app.foo'}, ref='HEAD')
+        self.assertEqual(
+            [('zope.app.foo', True)],
+            [(entry['package'], entry['setup_py']) for entry in index])
+        (path / 'setup.py').unlink()
+        with mock.patch.dict(os.environ, GIT_ENVIRON):
+            subprocess.run(['git', 'commit', '-q', '-am', 'Remove setup.py.'],
+                           cwd=path, check=True)
+        (path / 'setup.py').write_text("setup(namespace_packages=['zope'])\n")
+        index = namespace_index(self.path, names={'zope.app.foo'}, ref='HEAD')
+        self.assertFalse(index[0]['setup_py'])
+
+    def test_pep_420__SETUP_PY_RULES__1(self):
+        """It removes the namespace options from `setup.py`."""
+
+        setup_py, fired = Rewriter(SETUP_PY_RULES).rewrite(
+            'from setuptools import find_packages\n'
+            'from setuptools import setup\n'
+            'setup(\n'
+            "    packages=find_packages('src'),\n"
+            "    package_dir={'': 'src'},\n"
+            "    namespace_packages=['zope'],\n"
+            "    extras_require={'test': ['zope.testrunner'],\n"
+            "                    'other': ['zope.testrunner >= 5']},\n"
+            ')\n')
+        self.assertEqual(
+            'from setuptools import setup\n'
+            'setup(\n'
+            "    extras_require={'test': ['zope.testrunner >= 6.4'],\n"
+            "                    'other': ['zope.testrunner >= 5']},\n"
+            ')\n', setup_py)
+        self.assertEqual(5, sum(fired.values()))
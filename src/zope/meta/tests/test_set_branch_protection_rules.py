@@ -0,0 +1,85 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import unittest
+
+from zope.meta.set_branch_protection_rules import required_checks
+
+
+def meta_toml(template='pure-python', github_actions=None, **python):
+    """Return the parts of a `.meta.toml` `required_checks` reads."""
+    python = {'with-pypy': False, 'with-windows': False, 'with-macos': False,
+              'with-docs': True, **python}
+    return {'meta': {'template': template}, 'python': python,
+            'github-actions': github_actions or {}}
+
+
+class RequiredChecksTests(unittest.TestCase):
+
+    def test_set_branch_protection_rules__required_checks__1(self):
+        """It requires the oldest and newest Python version."""
+
+        self.assertEqual(['linting', 'py310', 'py314', 'coverage', 'docs'],
+                         required_checks(meta_toml()))
+
+    def test_set_branch_protection_rules__required_checks__2(self):
+        """It requires each shard of the sharded test jobs."""
+
+        self.assertEqual(
+            ['linting', 'py310-1', 'py310-2', 'py314-1', 'py314-2',
+             'coverage', 'docs', 'pypy3-1', 'pypy3-2'],
+            required_checks(meta_toml(
+                github_actions={'shards': 2}, **{'with-pypy': True})))
+        self.assertEqual(
+            ['linting', 'ubuntu-coverage', 'ubuntu-py310-1',
+             'ubuntu-py310-2', 'ubuntu-py314-1', 'ubuntu-py314-2',
+             'windows-py310-1', 'windows-py310-2', 'windows-py314-1',
+             'windows-py314-2', 'ubuntu-docs'],
+            required_checks(meta_toml(
+                github_actions={'shards': 2}, **{'with-windows': True})))
+
+    def test_set_branch_protection_rules__required_checks__3(self):
+        """It ignores shards for templates which do not support them."""
+
+        self.assertIn('test (3.14, ubuntu-latest)', required_checks(
+            meta_toml('c-code', github_actions={'shards': 2})))
+
+    def test_set_branch_protection_rules__required_checks__4(self):
+        """It does not require PyPy on Windows in the `edges` matrix mode."""
+
+        python = {'with-pypy': True, 'with-windows': True}
+        self.assertIn('windows-pypy3', required_checks(meta_toml(**python)))
+        edges = required_checks(meta_toml(
+            github_actions={'matrix-mode': 'edges'}, **python))
+        self.assertIn('ubuntu-pypy3', edges)
+        self.assertIn('windows-py314', edges)
+        self.assertNotIn('windows-pypy3', edges)
+        c_code = required_checks(meta_toml(
+            'c-code', github_actions={'matrix-mode': 'edges'}, **python))
+        self.assertIn('test (pypy-3.11, ubuntu-latest)', c_code)
+        self.assertNotIn('test (pypy-3.11, windows-latest)', c_code)
+
+    def test_set_branch_protection_rules__required_checks__5(self):
+        """It only requires PyPy on Windows if the package is tested there."""
+
+        python = {'with-pypy': True, 'with-macos': True}
+        required = required_checks(meta_toml(**python))
+        self.assertIn('ubuntu-pypy3', required)
+        self.assertIn('macos-py314', required)
+        self.assertNotIn('windows-pypy3', required)
+        c_code = required_checks(meta_toml('c-code', **python))
+        self.assertIn('test (pypy-3.11, ubuntu-latest)', c_code)
+        self.assertNotIn('test (pypy-3.11, windows-latest)', c_code)
+        c_code = required_checks(meta_toml(
+            'c-code', **python, **{'with-windows': True}))
+        self.assertIn('test (pypy-3.11, windows-latest)', c_code)
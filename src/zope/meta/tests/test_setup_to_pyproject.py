@@ -0,0 +1,253 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import ast
+import contextlib
+import io
+import os
+import pathlib
+import random
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from zope.meta.fleet import package_files
+from zope.meta.setup_to_pyproject import SetupPyError
+from zope.meta.setup_to_pyproject import SetupPyEvaluator
+from zope.meta.setup_to_pyproject import convert_package
+from zope.meta.setup_to_pyproject import convert_packages
+from zope.meta.setup_to_pyproject import format_report
+from zope.meta.setup_to_pyproject import parse_setup_function
+from zope.meta.setup_to_pyproject import parse_setup_py
+from zope.meta.tests.test_update_python_support import GIT_ENVIRON
+
+
+SETUP_PY = '''\
+import os
+from os.path import join
+
+from setuptools import find_packages
+from setuptools import setup
+
+
+def read(*rnames):
+    with open(os.path.join(os.path.dirname(__file__), *rnames)) as f:
+        return f.read()
+
+
+version = '5.1'
+NAME = 'zope.%s' % 'foo'
+TESTS_REQUIRE = ['zope.testing']
+TESTS_REQUIRE += ['zope.testrunner']
+DOCS = [f'Sphinx>={version[0]}']
+DOCS.append('repoze.sphinx.autointerface')
+import sys  # noqa: E402
+sys.exit('setup.py must not be run.')
+
+setup(
+    name=NAME,
+    version=version,
+    description=read('README.rst').splitlines()[0],
+    long_description=(
+        read('README.rst') + '\\n\\n' + open(join('CHANGES.rst')).read()),
+    packages=find_packages('src'),
+    install_requires=['setuptools', 'zope.interface'] + TESTS_REQUIRE[:1],
+    extras_require=dict(test=TESTS_REQUIRE, docs=DOCS),
+    entry_points={'console_scripts': ['foo = zope.foo:main']},
+    cmdclass=cmdclass,
+)
+'''
+
+
+class SetupPyEvaluatorTests(unittest.TestCase):
+
+    def evaluate(self, source, expression):
+        evaluator = SetupPyEvaluator()
+        evaluator.run(ast.parse(source))
+        return evaluator.evaluate(ast.parse(expression, mode='eval').body)
+
+    def test_setup_to_pyproject__SetupPyEvaluator__1(self):
+        """It evaluates module-level assignments statically."""
+
+        source = 'A = ["a"]\nB = A + ["b"]\nC = "-".join(B).upper()\n'
+        self.assertEqual(['a', 'b', 'c'], self.evaluate(source, 'B + ["c"]'))
+        self.assertEqual('A-B', self.evaluate(source, 'C'))
+        self.assertEqual({'a': ['a'], 'b': 1},
+                         self.evaluate(source, '{"a": A, **{"b": 1}}'))
+
+    def test_setup_to_pyproject__parse_setup_function__1(self):
+        """It returns the source of values kept in `setup.py`."""
+
+        evaluator = SetupPyEvaluator()
+        setup_node = evaluator.run(ast.parse(
+            'import versioneer\nEXTRAS = {}\n'
+            'setup(cmdclass=versioneer.get_cmdclass(), extras_require=EXTRAS,'
+            ' ext_modules=EXT + [foo])\n'))
+        self.assertEqual({
+            'cmdclass': 'versioneer.get_cmdclass()',
+            'extras_require': {},
+            'ext_modules': 'EXT + [foo]',
+        }, parse_setup_function(setup_node, evaluator))
+
+    def test_setup_to_pyproject__parse_setup_function__2(self):
+        """It raises a `SetupPyError` for unknown values to be converted."""
+
+        evaluator = SetupPyEvaluator()
+        setup_node = evaluator.run(ast.parse(
+            'import versioneer\n'
+            'REQUIRES = [name for name in ["foo"]]\n'
+            'setup(version=versioneer.get_version(), name="foo",'
+            ' install_requires=REQUIRES)\n'))
+        with self.assertRaisesRegex(
+                SetupPyError,
+                r'^Cannot determine the value of'
+                r' version: versioneer\.get_version\(\),'
+                r' install_requires: REQUIRES$'):
+            parse_setup_function(setup_node, evaluator)
+
+
+class ParseSetupPyTests(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = pathlib.Path(tmp.name)
+        (self.path / 'README.rst').write_text('The foo package.\n')
+        (self.path / 'CHANGES.rst').write_text('Changes\n')
+
+    def test_setup_to_pyproject__parse_setup_py__1(self):
+        """It converts `setup.py` without running it."""
+
+        (self.path / 'setup.py').write_text(SETUP_PY)
+        leftover, toml_dict = parse_setup_py(self.path / 'setup.py')
+        self.assertEqual({}, leftover)
+        project = toml_dict['project']
+        self.assertEqual('zope.foo', project['name'])
+        self.assertEqual('5.1', project['version'])
+        self.assertEqual('The foo package.', project['description'])
+        self.assertEqual(
+            ['setuptools', 'zope.interface', 'zope.testing'],
+            project['dependencies'])
+        self.assertEqual({
+            'test': ['zope.testing', 'zope.testrunner'],
+            'docs': ['Sphinx>=5', 'repoze.sphinx.autointerface'],
+        }, project['optional-dependencies'])
+        self.assertEqual({'foo': 'zope.foo:main'}, project['scripts'])
+
+    def test_setup_to_pyproject__parse_setup_py__2(self):
+        """It raises a `SetupPyError` for unknown extras."""
+
+        (self.path / 'setup.py').write_text(
+            'from setuptools import setup\n'
+            'from extras import EXTRAS\n'
+            'setup(name="foo", extras_require=EXTRAS)\n')
+        with self.assertRaisesRegex(SetupPyError, 'EXTRAS'):
+            parse_setup_py(self.path / 'setup.py')
+
+
+class ConvertPackagesTests(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = pathlib.Path(tmp.name)
+        for name in ('fleet.pure0001', 'fleet.pure0002', 'fleet.pure0003'):
+            files, _ = package_files(name, 'pure-python', random.Random(name))
+            for file_name, content in files.items():
+                file_path = self.path / name / file_name
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_text(content)
+        (self.path / 'fleet.pure0002' / 'setup.py').write_text(
+            'from setuptools import setup\nsetup()\n')
+        (self.path / 'fleet.pure0003' / 'setup.py').write_text(
+            'from setuptools import setup\nfrom extras import EXTRAS\n'
+            'setup(name="fleet.pure0003", extras_require=EXTRAS)\n')
+
+    def convert(self, **kw):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return convert_packages(
+                sorted(self.path.glob('fleet.*')), self.path / 'results',
+                jobs=2, **kw)
+
+    def test_setup_to_pyproject__convert_packages__1(self):
+        """It classifies the packages and writes the diffs of a dry run."""
+
+        converted, already, manual = self.convert()
+        self.assertEqual(
+            ['converted', 'already-converted', 'manual'],
+            [converted['status'], already['status'], manual['status']])
+        self.assertEqual(
+            ['Cannot determine the value of extras_require: EXTRAS'],
+            manual['reasons'])
+        self.assertIn('+name = "fleet.pure0001"', converted['diff'])
+        self.assertEqual(
+            converted['diff'],
+            pathlib.Path(converted['diff_file']).read_text())
+        self.assertNotIn(
+            '[project]',
+            (self.path / 'fleet.pure0001' / 'pyproject.toml').read_text())
+        self.assertEqual(
+            'fleet.pure0003: manual\n'
+            '  reason: Cannot determine the value of extras_require: EXTRAS\n'
+            'fleet.pure0001: converted\n'
+            '  warning: XXX Found "setuptools" as install time dependency.\n'
+            '  warning: XXX Please check if it is really needed!\n'
+            f'  diff: {converted["diff_file"]}\n'
+            '3 packages: 0 failed, 1 manual, 1 converted,'
+            ' 1 already-converted',
+            format_report([converted, already, manual]))
+
+    def test_setup_to_pyproject__convert_package__1(self):
+        """It needs a manual fix for metadata computed at runtime."""
+
+        setup_py = self.path / 'fleet.pure0001' / 'setup.py'
+        setup_py.write_text(
+            setup_py.read_text().replace(
+                "version='", "version=get_version(), old_version='"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = convert_package(self.path / 'fleet.pure0001')
+        self.assertEqual('manual', report['status'])
+        self.assertEqual(
+            ['Cannot determine the value of version: get_version()'],
+            report['reasons'])
+        self.assertEqual('', report['diff'])
+
+    def test_setup_to_pyproject__convert_packages__2(self):
+        """It commits the conversion to a branch."""
+
+        path = self.path / 'fleet.pure0001'
+        (self.path / 'fleet.pure0002').rename(self.path / 'other')
+        (self.path / 'fleet.pure0003').rename(self.path / 'other2')
+        with mock.patch.dict(os.environ, GIT_ENVIRON):
+            for command in (['git', 'init', '-q', '-b', 'master'],
+                            ['git', 'add', '.'],
+                            ['git', 'commit', '-q', '-m', 'Initial.']):
+                subprocess.run(command, cwd=path, check=True)
+            report, = self.convert(dry_run=False, branch_name='convert')
+
+        self.assertEqual('convert', report['branch'])
+
+        def git(*args):
+            return subprocess.run(
+                ['git', *args], cwd=path, capture_output=True,
+                text=True).stdout.split()
+
+        self.assertEqual(
+            ['Move', 'package', 'metadata', 'from', 'setup.py', 'to',
+             'pyproject.toml.', 'Initial.'],
+            git('log', '--format=%s', 'convert'))
+        self.assertEqual(
+            ['CHANGES.rst', 'pyproject.toml', 'setup.py'],
+            git('show', '--name-only', '--format=', 'convert'))
+        self.assertEqual([], git('status', '--porcelain', '-uno'))
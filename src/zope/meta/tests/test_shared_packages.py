@@ -0,0 +1,133 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import zope.meta
+from zope.meta.shared.packages import all_repos
+from zope.meta.shared.packages import get_overrides_path
+from zope.meta.shared.packages import get_pyproject_toml
+from zope.meta.shared.packages import load_toml
+
+
+#: The modules containing the entry points of the console scripts.
+SCRIPT_MODULES = (
+    'zope.meta.benchmark',
+    'zope.meta.blast_radius',
+    'zope.meta.config_package',
+    'zope.meta.daemon',
+    'zope.meta.fleet',
+    'zope.meta.legacy_python',
+    'zope.meta.multi_call',
+    'zope.meta.pep_420',
+    'zope.meta.re_enable_actions',
+    'zope.meta.set_branch_protection_rules',
+    'zope.meta.setup_to_pyproject',
+    'zope.meta.update_python_support',
+)
+#: Modules which are only imported when they are actually needed.
+HEAVY_MODULES = {'jinja2', 'packaging', 'requests', 'tomlkit'}
+
+
+def import_times(module):
+    """Import `module` in a fresh interpreter using ``-X importtime``.
+
+    Return a mapping of the imported module names to their cumulative import
+    time in microseconds.
+    """
+    env = dict(os.environ)
+    src = str(pathlib.Path(zope.meta.__file__).parent.parent.parent)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [src, env.get('PYTHONPATH')]))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.partition(':')[2].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class PackagesTests(unittest.TestCase):
+
+    def test_packages__get_overrides_path__1(self):
+        """It returns the path given via ``--overrides``."""
+
+        self.assertEqual(
+            pathlib.Path('/tmp/overrides'),
+            get_overrides_path(
+                ['config-package', '.', '--with-docs', '--overrides',
+                 '/tmp/overrides']))
+        self.assertEqual(
+            pathlib.Path('/tmp/overrides'),
+            get_overrides_path(['config-package', '--overrides=/tmp/overrides',
+                                '.']))
+        self.assertEqual(
+            pathlib.Path('/tmp/overrides'),
+            get_overrides_path(['config-package', '--overr', '/tmp/overrides',
+                                '--unknown', '.']))
+
+    def test_packages__get_overrides_path__2(self):
+        """It returns `None` if there is no ``--overrides`` argument."""
+
+        self.assertIsNone(get_overrides_path(['config-package', '.']))
+        self.assertIsNone(
+            get_overrides_path(['config-package', '--overrides']))
+        self.assertIsNone(
+            get_overrides_path(['multi-call', '--', '--overrides=/tmp']))
+
+    def test_packages__all_repos__1(self):
+        """It lists the packages of all configuration types."""
+
+        repos = all_repos()
+        self.assertIn('zope.interface', repos)
+        self.assertIn('zopetoolkit', repos)
+        self.assertEqual(repos, all_repos())
+
+    def test_packages__load_toml__1(self):
+        """It returns the same values as the round-trip parser."""
+
+        root = pathlib.Path(zope.meta.__file__).parent.parent.parent.parent
+        for name in ('pyproject.toml', '.meta.toml'):
+            with self.subTest(name=name):
+                values = load_toml(root / name)
+                self.assertIs(type(values), dict)
+                self.assertEqual(
+                    get_pyproject_toml(root / name).unwrap(), values)
+
+    def test_packages__load_toml__2(self):
+        """It returns an empty dict for a missing file."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual({}, load_toml(pathlib.Path(tmp) / 'foo.toml'))
+
+
+class ImportTimeTests(unittest.TestCase):
+    """Importing the console scripts has to be cheap."""
+
+    def test_import_time__1(self):
+        """It does not import heavy dependencies before they are needed."""
+
+        for module in SCRIPT_MODULES:
+            with self.subTest(module=module):
+                imported = {
+                    name.partition('.')[0] for name in import_times(module)}
+                self.assertEqual(set(), imported & HEAVY_MODULES)
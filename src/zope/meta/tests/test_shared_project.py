@@ -0,0 +1,105 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import contextlib
+import io
+import pathlib
+import tempfile
+import unittest
+
+from zope.meta.shared.project import ProjectFiles
+
+
+class ProjectFilesTests(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = pathlib.Path(tmp.name)
+        (self.path / 'pyproject.toml').write_text(
+            '# comment\n[tool.foo]\nbar = 1\n')
+        (self.path / 'README.md').write_text('Hello\n')
+
+    def test_project__ProjectFiles__1(self):
+        """It keeps changes in memory until they are saved."""
+
+        project = ProjectFiles(self.path)
+        project.write_text('CHANGES.md', 'Changes\n')
+        project.write_text('.github/workflows/tests.yml', 'on: push\n')
+        self.assertEqual('Changes\n', project.read_text('CHANGES.md'))
+        self.assertFalse((self.path / 'CHANGES.md').exists())
+        self.assertEqual(
+            [self.path / 'CHANGES.md', self.path / 'README.md'],
+            project.glob('*.md'))
+        self.assertEqual(
+            ['CHANGES.md', '.github/workflows/tests.yml'], project.save())
+        self.assertEqual(
+            'on: push\n',
+            (self.path / '.github' / 'workflows' / 'tests.yml').read_text())
+
+    def test_project__ProjectFiles__2(self):
+        """It only writes files whose content changed."""
+
+        project = ProjectFiles(self.path)
+        project.write_text('README.md', 'Hello\n')
+        project.write_text('run.sh', '#!/bin/sh\n', executable=True)
+        self.assertEqual(['run.sh'], project.save())
+        self.assertEqual(0o755, (self.path / 'run.sh').stat().st_mode & 0o777)
+        project.write_text('run.sh', '#!/bin/sh\n')
+        self.assertEqual([], project.save())
+
+    def test_project__ProjectFiles__3(self):
+        """It parses a TOML file only once and writes back its changes."""
+
+        project = ProjectFiles(self.path)
+        doc = project.toml('pyproject.toml')
+        self.assertIs(doc, project.toml('pyproject.toml'))
+        doc['tool']['foo']['bar'] = 2
+        project.write_toml(
+            'pyproject.toml', lambda doc: f'# header\n{doc.as_string()}')
+        # Readers see the changed document:
+        self.assertEqual(
+            2, project.read_toml('pyproject.toml')['tool']['foo']['bar'])
+        doc['tool']['foo']['baz'] = 3
+        self.assertEqual(['pyproject.toml'], project.save())
+        self.assertEqual(
+            '# header\n# comment\n[tool.foo]\nbar = 2\nbaz = 3\n',
+            (self.path / 'pyproject.toml').read_text())
+
+    def test_project__ProjectFiles__4(self):
+        """It reads TOML values for reading only into plain dicts."""
+
+        project = ProjectFiles(self.path)
+        values = project.read_toml('pyproject.toml')
+        self.assertIs(type(values), dict)
+        self.assertEqual({'tool': {'foo': {'bar': 1}}}, values)
+        self.assertEqual({}, project.read_toml('missing.toml'))
+        self.assertFalse(project.exists('missing.toml'))
+
+
+class PackageConfigurationTests(unittest.TestCase):
+
+    def test_config_package__write_files__1(self):
+        """It returns only the files changed by rendering again."""
+        from zope.meta.benchmark import make_package
+        from zope.meta.config_package import PackageConfiguration
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                contextlib.redirect_stdout(io.StringIO()):
+            args = make_package(tmp, 'c-code', 'default')
+            written = PackageConfiguration(args).write_files()
+            self.assertIn('pyproject.toml', written)
+            self.assertIn('.manylinux.sh', written)
+            self.assertEqual(
+                0o755, (args.path / '.manylinux.sh').stat().st_mode & 0o777)
+            self.assertEqual([], PackageConfiguration(args).write_files())
@@ -0,0 +1,75 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import re
+import unittest
+
+from zope.meta.config_package import setup_py_rewriter
+from zope.meta.shared.rewrite import DELETE_LINE
+from zope.meta.shared.rewrite import Rewriter
+
+
+class RewriterTests(unittest.TestCase):
+
+    def test_rewrite__Rewriter__1(self):
+        """It applies literal, regex and line deletion rules in one pass."""
+
+        rewriter = Rewriter({
+            'a.b': 'X',
+            re.compile(r'v(\d+)'): lambda text: f'V{int(text[1:]) + 1}',
+            'delete': DELETE_LINE,
+            'other': DELETE_LINE,
+        })
+        text, fired = rewriter.rewrite(
+            'a.b axb v1\n'
+            'a.b delete me\n'
+            'v9 a.b\n'
+            'the other one')
+        self.assertEqual('X axb V2\nV10 X\n', text)
+        self.assertEqual(
+            {'a.b': 2, r'v(\d+)': 2, 'delete': 1, 'other': 1}, fired)
+
+    def test_rewrite__Rewriter__2(self):
+        """It applies the earlier rule if several match at one position."""
+
+        rewriter = Rewriter({'Zope': 'Plone', 'Zope Corporation': 'ZF'})
+        self.assertEqual(
+            ('Plone Corporation', {'Zope': 1}),
+            rewriter.rewrite('Zope Corporation'))
+        self.assertEqual(('text', {}), Rewriter({}).rewrite('text'))
+
+    def test_rewrite__Rewriter__3(self):
+        """It keeps the flags of compiled patterns."""
+
+        rewriter = Rewriter({
+            re.compile('zope corp', re.I): 'ZF',
+            re.compile(r'<.*?>', re.S): '',
+            re.compile(r'^old'): 'new',
+            re.compile(r'^line$', re.M): 'LINE',
+            re.compile(r'v \d  # version', re.X): 'V',
+        })
+        text, fired = rewriter.rewrite(
+            'old Zope Corp\n<a\nb>line\nold v1\nline\n')
+        self.assertEqual('new ZF\nline\nold V\nLINE\n', text)
+        self.assertEqual(5, len(fired))
+
+    def test_config_package__setup_py_rewriter__1(self):
+        """It updates outdated texts in `setup.py`."""
+
+        text, fired = setup_py_rewriter().rewrite(
+            "license='ZPL 2.1',\nauthor='Zope Corporation',\n"
+            "'Framework :: Zope2',\n'Framework :: Zope3',\n")
+        self.assertEqual(
+            "license='ZPL-2.1',\nauthor='Zope Foundation',\n"
+            "'Framework :: Zope :: 2',\n'Framework :: Zope :: 3',\n", text)
+        self.assertEqual(4, sum(fired.values()))
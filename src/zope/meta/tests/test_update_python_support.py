@@ -11,11 +11,59 @@
 #
 ##############################################################################
 
+import argparse
+import contextlib
+import io
+import json
+import os
+import pathlib
+import random
+import re
+import subprocess
 import tempfile
 import textwrap
 import unittest
+from unittest import mock
 
+from zope.meta.fleet import package_files
+from zope.meta.shared.packages import NEWEST_PYTHON_VERSION
+from zope.meta.update_python_support import apply_meta_toml_rules
+from zope.meta.update_python_support import file_hash
+from zope.meta.update_python_support import format_report
 from zope.meta.update_python_support import get_tox_ini_python_versions
+from zope.meta.update_python_support import python_version_changes
+from zope.meta.update_python_support import pyupgrade_files
+from zope.meta.update_python_support import update_packages
+
+
+GIT_ENVIRON = {
+    'GIT_AUTHOR_NAME': 'Tester',
+    'GIT_AUTHOR_EMAIL': 'tester@example.com',
+    'GIT_COMMITTER_NAME': 'Tester',
+    'GIT_COMMITTER_EMAIL': 'tester@example.com',
+}
+
+
+def make_clone(path, name):
+    """Create a clone of a package still supporting Python 3.9."""
+    files, _ = package_files(name, 'pure-python', random.Random(name))
+    files['setup.py'] = re.sub(
+        r"version='[^']*'", "version='1.0.dev0'", files['setup.py']).replace(
+        "        'Programming Language :: Python :: 3.10',\n",
+        "        'Programming Language :: Python :: 3.9',\n"
+        "        'Programming Language :: Python :: 3.10',\n").replace(
+        ">=3.10", ">=3.9")
+    files['tox.ini'] = '[tox]\nenvlist =\n' + ''.join(
+        f'    py3{minor}\n' for minor in range(9, 15))
+    files['.meta.toml'] += '[tox]\ntestenv-deps = ["py39: foo < 2"]\n'
+    for file_name, content in files.items():
+        (path / file_name).parent.mkdir(parents=True, exist_ok=True)
+        (path / file_name).write_text(content)
+    for command in (['git', 'init', '-q', '-b', 'master'],
+                    ['git', 'add', '.'],
+                    ['git', 'commit', '-q', '-m', 'Initial.'],
+                    ['git', 'tag', '0.9']):
+        subprocess.run(command, cwd=path, check=True)
 
 
 class TestUpdatePythonSupport(unittest.TestCase):
@@ -60,3 +108,158 @@ class TestUpdatePythonSupport(unittest.TestCase):
             tox_ini.flush()
             versions = get_tox_ini_python_versions(tox_ini.name)
             self.assertEqual({'3.13', '3.14'}, versions)
+
+
+class PyupgradeFilesTests(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = pathlib.Path(tmp.name)
+        self.cache_path = self.path / 'cache' / 'pyupgrade.json'
+        self.legacy = self.path / 'legacy.py'
+        self.legacy.write_text('class Foo(object):\n    pass\n')
+        self.modern = self.path / 'modern.py'
+        self.modern.write_text('class Foo:\n    pass\n')
+
+    def test_update_python_support__pyupgrade_files__1(self):
+        """It upgrades the files in parallel and returns the changed ones."""
+
+        changed, errors = pyupgrade_files(
+            [self.legacy, self.modern], '3.10', jobs=2,
+            cache_path=self.cache_path)
+        self.assertEqual([self.legacy], changed)
+        self.assertEqual({}, errors)
+        self.assertEqual('class Foo:\n    pass\n', self.legacy.read_text())
+
+    def test_update_python_support__pyupgrade_files__2(self):
+        """It skips files whose content is cached as already upgraded."""
+
+        pyupgrade_files([self.modern], '3.10', cache_path=self.cache_path)
+        # Pretend the legacy content was already upgraded:
+        cache = json.loads(self.cache_path.read_text())
+        key, = cache
+        cache[key].append(file_hash(self.legacy))
+        self.cache_path.write_text(json.dumps(cache))
+        self.assertEqual(([], {}), pyupgrade_files(
+            [self.legacy, self.modern], '3.10', cache_path=self.cache_path))
+        self.assertEqual(
+            'class Foo(object):\n    pass\n', self.legacy.read_text())
+        # The cache is kept per target version:
+        self.assertEqual(([self.legacy], {}), pyupgrade_files(
+            [self.legacy], '3.11', cache_path=self.cache_path))
+
+    def test_update_python_support__pyupgrade_files__3(self):
+        """It returns the errors of the files pyupgrade failed for."""
+
+        broken = self.path / 'broken.py'
+        broken.write_bytes(b'# caf\xe9\n')
+        changed, errors = pyupgrade_files(
+            [self.legacy, broken], '3.10', jobs=1,
+            cache_path=self.cache_path)
+        self.assertEqual([self.legacy], changed)
+        self.assertEqual([broken], list(errors))
+        self.assertIn('non-utf-8', errors[broken])
+        # Failed files are not cached, so they are retried next time:
+        changed, errors = pyupgrade_files(
+            [self.legacy, broken], '3.10', cache_path=self.cache_path)
+        self.assertEqual([], changed)
+        self.assertEqual([broken], list(errors))
+
+
+class UnattendedTests(unittest.TestCase):
+
+    def test_update_python_support__apply_meta_toml_rules__1(self):
+        """It removes list items mentioning only dropped versions."""
+        import tomlkit
+
+        meta_toml = tomlkit.loads(textwrap.dedent("""\
+            [python]
+            oldest-python = "3.8"
+
+            [tox]
+            testenv-deps = [
+                "py39: foo < 2",
+                "py39,py310: bar",
+                "baz",
+            ]
+            coverage-basepython = "python3.9"
+            """))
+        changes, review = apply_meta_toml_rules(
+            meta_toml, {'3.9'}, ['3.10', '3.11'])
+        self.assertEqual(
+            ["[tox] testenv-deps: removed 'py39: foo < 2'."], changes)
+        self.assertEqual([
+            "[tox] testenv-deps: 'py39,py310: bar' mentions dropped and"
+            " supported Python versions.",
+            '[tox] coverage-basepython mentions a dropped Python version.',
+            '[python] oldest-python keeps supporting Python 3.8.',
+        ], review)
+        self.assertIn('testenv-deps = [\n    "py39,py310: bar",\n',
+                      tomlkit.dumps(meta_toml))
+
+    def test_update_python_support__python_version_changes__1(self):
+        """It adds the newest version for `with-future-python` only once.
+
+        It is already in `tox.ini` then, but maybe not in the classifiers.
+        """
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict(os.environ, GIT_ENVIRON):
+            path = pathlib.Path(tmp)
+            make_clone(path, 'fleet.pure0001')
+            tox_ini = path / 'tox.ini'
+            future = {'python': {'with-future-python': True}}
+            self.assertEqual(({'3.9'}, set()),
+                             python_version_changes({}, tox_ini))
+            self.assertEqual(({'3.9'}, set()),
+                             python_version_changes(future, tox_ini))
+            setup_py = path / 'setup.py'
+            setup_py.write_text(setup_py.read_text().replace(
+                f"'Programming Language :: Python :: {NEWEST_PYTHON_VERSION}'",
+                "'Programming Language :: Python :: 3'"))
+            self.assertEqual(({'3.9'}, {NEWEST_PYTHON_VERSION}),
+                             python_version_changes(future, tox_ini))
+            self.assertEqual(({'3.9'}, set()),
+                             python_version_changes({}, tox_ini))
+
+    def test_update_python_support__update_packages__1(self):
+        """It updates the clones in parallel and reports the outcome."""
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict(os.environ, GIT_ENVIRON), \
+                mock.patch.dict(os.environ, XDG_CACHE_HOME=tmp), \
+                contextlib.redirect_stdout(io.StringIO()):
+            clones = pathlib.Path(tmp) / 'clones'
+            for name in ('fleet.pure0001', 'fleet.pure0002'):
+                (clones / name).mkdir(parents=True)
+                make_clone(clones / name, name)
+            (clones / 'fleet.pure0002' / 'tox.ini').unlink()
+            args = argparse.Namespace(
+                branch_name='update', with_future_python=False,
+                with_free_threaded_python=False, overrides_path=None,
+                run_tests=False, commit=True, push=False)
+            reports = update_packages(
+                sorted(clones.iterdir()), args, pathlib.Path(tmp) / 'logs',
+                jobs=2)
+
+            updated, failed = reports
+            self.assertEqual('updated', updated['status'])
+            self.assertEqual(['3.9'], updated['dropped'])
+            self.assertIn('setup.py', updated['files'])
+            self.assertEqual(
+                ["[tox] testenv-deps: removed 'py39: foo < 2'."],
+                updated['changes'])
+            log = subprocess.run(
+                ['git', 'log', '--format=%s', 'update'], capture_output=True,
+                text=True, cwd=clones / 'fleet.pure0001').stdout
+            self.assertEqual(['Update Python version support.', 'Initial.'],
+                             log.splitlines())
+            self.assertEqual('failed', failed['status'])
+            self.assertIn('KeyError', failed['error'])
+            self.assertIn('Traceback',
+                          pathlib.Path(failed['log']).read_text())
+            report = format_report(reports)
+            self.assertIn('fleet.pure0002: failed', report)
+            self.assertTrue(report.endswith(
+                '2 packages: 1 failed, 0 review, 1 updated, 0 unchanged'))
@@ -0,0 +1,177 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import contextlib
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+
+from zope.meta.config_package import TEMPLATE_RENDERERS
+from zope.meta.config_package import PackageConfiguration
+from zope.meta.config_package import handle_command_line_arguments
+from zope.meta.config_package import make_jinja_env
+from zope.meta.shared.diff import configured_files
+from zope.meta.shared.diff import unified_diffs
+from zope.meta.shared.templates import referenced_templates
+from zope.meta.shared.templates import templates_fed_by
+from zope.meta.tests.test_daemon import make_package
+from zope.meta.watch import InotifyWatcher
+from zope.meta.watch import PollingWatcher
+from zope.meta.watch import rerender
+from zope.meta.watch import watch
+
+
+TEMPLATES = pathlib.Path(__file__).parent.parent
+
+
+def jinja_env(config_type):
+    return make_jinja_env([TEMPLATES / config_type, TEMPLATES / 'default'])
+
+
+class TemplatesTests(unittest.TestCase):
+
+    def test_templates__referenced_templates__1(self):
+        """It returns the included templates, directly or not."""
+
+        self.assertEqual(
+            {'tox-envlist.j2', 'tox-testenv.j2', 'tox-lint.j2',
+             'tox-docs.j2', 'tox-bench.j2', 'tox-importtime.j2',
+             'tox-release-check.j2'},
+            referenced_templates(jinja_env('pure-python'), 'tox.ini.j2'))
+        self.assertEqual(
+            set(), referenced_templates(jinja_env('pure-python'),
+                                        'setup.cfg.j2'))
+
+    def test_templates__templates_fed_by__1(self):
+        """It returns the top-level templates using a changed one."""
+
+        self.assertEqual(
+            {'tox.ini.j2'},
+            templates_fed_by(jinja_env('toolkit'), TEMPLATE_RENDERERS,
+                             {'tox-release-check.j2'}))
+        self.assertEqual(
+            {'tests.yml.j2', 'setup.cfg.j2'},
+            templates_fed_by(jinja_env('c-code'), TEMPLATE_RENDERERS,
+                             {'tests-cache.j2', 'setup.cfg.j2'}))
+        self.assertEqual(
+            set(),
+            templates_fed_by(jinja_env('pure-python'), TEMPLATE_RENDERERS,
+                             {'tests-cache.j2'}))
+
+    def test_diff__unified_diffs__1(self):
+        """It only returns diffs for changed files."""
+
+        diffs = unified_diffs({'a': 'x\n', 'b': 'y\n'}, {'a': 'x\n', 'c': ''})
+        self.assertEqual(['b'], list(diffs))
+        self.assertIn('-y\n', diffs['b'])
+
+    def test_diff__configured_files__1(self):
+        """It returns the top-level files and the files below `.github`."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp)
+            (path / '.github' / 'workflows').mkdir(parents=True)
+            (path / 'src').mkdir()
+            for name in ('tox.ini', '.github/test-shards.py',
+                         '.github/workflows/tests.yml', 'src/foo.py'):
+                (path / name).write_text(name)
+            self.assertEqual(
+                ['.github/test-shards.py', '.github/workflows/tests.yml',
+                 'tox.ini'],
+                sorted(configured_files(path)))
+
+
+class WatcherTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = pathlib.Path(self.tmp.name).resolve()
+        self.template = self.folder / 'tox.ini.j2'
+        self.template.write_text('')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_watch__PollingWatcher__1(self):
+        """It yields the changed files."""
+
+        watcher = PollingWatcher([self.folder], interval=0)
+        mtime = self.template.stat().st_mtime_ns + 1_000_000_000
+        os.utime(self.template, ns=(mtime, mtime))
+        self.assertEqual({self.template}, next(iter(watcher)))
+
+    def test_watch__InotifyWatcher__1(self):
+        """It yields the changed files."""
+
+        try:
+            watcher = InotifyWatcher([self.folder], debounce=0)
+        except OSError:
+            self.skipTest('inotify not available')
+        self.template.write_text('changed')
+        self.assertEqual({self.template}, next(iter(watcher)))
+
+
+class RerenderTests(unittest.TestCase):
+
+    def test_watch__rerender__1(self):
+        """It only renders the outputs fed by the changed template."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = make_package(tmp)
+            overrides = pathlib.Path(tmp, 'overrides').resolve()
+            (overrides / 'default').mkdir(parents=True)
+            package = PackageConfiguration(handle_command_line_arguments(
+                [str(path), f'--overrides={overrides}']))
+            package.write_files()
+            (path / 'setup.cfg').write_text('left alone')
+
+            template = overrides / 'default' / 'tox-lint.j2'
+            template.write_text(
+                (TEMPLATES / 'default' / 'tox-lint.j2').read_text()
+                + '\n[testenv:foo]\n')
+            diffs = rerender(package, {template})
+
+            self.assertEqual(['tox.ini'], list(diffs))
+            self.assertIn('+[testenv:foo]\n', diffs['tox.ini'])
+            self.assertEqual('left alone', (path / 'setup.cfg').read_text())
+            self.assertEqual({}, rerender(package, {path / 'setup.py'}))
+
+    def test_watch__watch__1(self):
+        """It renders clones with the same name separately."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [make_package(pathlib.Path(tmp, parent))
+                     for parent in ('a', 'b')]
+            overrides = pathlib.Path(tmp, 'overrides').resolve()
+            (overrides / 'default').mkdir(parents=True)
+            template = overrides / 'default' / 'tox-lint.j2'
+
+            def watcher():
+                template.write_text(
+                    (TEMPLATES / 'default' / 'tox-lint.j2').read_text()
+                    + '\n[testenv:foo]\n')
+                yield {template}
+
+            args = handle_command_line_arguments(
+                [str(paths[0]), f'--overrides={overrides}'])
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                watch(args, paths, watcher=watcher())
+
+        for path in paths:
+            self.assertIn(f'Rendering {path.resolve()} …\n',
+                          output.getvalue())
+            self.assertIn(f'{path.resolve()}:\n--- a/tox.ini\n',
+                          output.getvalue())
@@ -12,15 +12,23 @@
 #
 ##############################################################################
 import collections
+import concurrent.futures
 import configparser
+import hashlib
+import json
 import os
 import pathlib
+import re
 import shutil
+import subprocess
 import sys
+import traceback
 
-import tomlkit
-
+from .legacy_python import format_findings
+from .legacy_python import python_files
+from .legacy_python import scan
 from .shared.call import call
+from .shared.call import output_to
 from .shared.call import wait_for_accept
 from .shared.git import create_pull_request
 from .shared.git import get_branch_name
@@ -28,6 +36,8 @@ from .shared.git import git_branch
 from .shared.packages import FUTURE_PYTHON_VERSION
 from .shared.packages import NEWEST_PYTHON_VERSION
 from .shared.packages import OLDEST_PYTHON_VERSION
+from .shared.packages import all_repos
+from .shared.packages import load_toml
 from .shared.packages import supported_python_versions
 from .shared.path import change_dir
 from .shared.script_args import get_shared_parser
@@ -49,6 +59,404 @@ def get_tox_ini_python_versions(path) -> set:
     return {v.rstrip('t') for v in versions}
 
 
+CLASSIFIER_VERSION = re.compile(r'Programming Language :: Python :: (3\.\d+)')
+
+
+def classifier_python_versions(path):
+    """Return the Python versions in the classifiers of the package at `path`.
+
+    They are read from `setup.py` and `pyproject.toml`.
+    """
+    versions = set()
+    for name in ('setup.py', 'pyproject.toml'):
+        file_path = pathlib.Path(path) / name
+        if file_path.exists():
+            versions.update(CLASSIFIER_VERSION.findall(file_path.read_text()))
+    return versions
+
+
+def python_version_changes(meta_toml, tox_ini_path):
+    """Return the Python versions to be dropped and to be added as sets.
+
+    `meta_toml` contains the values of `.meta.toml`.
+    """
+    python = meta_toml.get('python', {})
+    oldest_python_version = python.get('oldest-python', OLDEST_PYTHON_VERSION)
+    to_be_supported = set(supported_python_versions(oldest_python_version))
+    current_python_versions = get_tox_ini_python_versions(tox_ini_path)
+    no_longer_supported = current_python_versions - to_be_supported
+    not_yet_supported = to_be_supported - current_python_versions
+    if (python.get('with-future-python', False) and
+            NEWEST_PYTHON_VERSION in to_be_supported and
+            NEWEST_PYTHON_VERSION not in classifier_python_versions(
+                pathlib.Path(tox_ini_path).parent)):
+        # If with-future-python is enabled, the newest python version is
+        # already in `tox.ini` but maybe not yet in the classifiers:
+        not_yet_supported.add(NEWEST_PYTHON_VERSION)
+    return no_longer_supported, not_yet_supported
+
+
+def version_pattern(versions):
+    """Return a regex matching mentions of `versions` like `3.9` or `py39`.
+    """
+    alternatives = []
+    for version in sorted(versions):
+        alternatives.append(rf'(?<![\d.]){re.escape(version)}(?!\d)')
+        alternatives.append(rf'\bpy{version.replace(".", "")}(?!\d)')
+    return re.compile('|'.join(alternatives or ['(?!)']))
+
+
+def apply_meta_toml_rules(meta_toml, dropped, supported):
+    """Adapt the `.meta.toml` document `meta_toml` to the `dropped` versions.
+
+    Items of list options only mentioning `dropped` versions are removed.
+    Other options mentioning them need a human decision. Return the
+    descriptions of the changes and of the options to be reviewed.
+    """
+    dropped_re = version_pattern(dropped)
+    supported_re = version_pattern(supported)
+    changes = []
+    review = []
+    for section_name, section in meta_toml.items():
+        if not isinstance(section, dict):
+            continue
+        for key, value in section.items():
+            option = f'[{section_name}] {key}'
+            if isinstance(value, list):
+                for index in reversed(range(len(value))):
+                    item = value[index]
+                    if not isinstance(item, str) or not dropped_re.search(
+                            item):
+                        continue
+                    if supported_re.search(item):
+                        review.append(
+                            f'{option}: {str(item)!r} mentions dropped and'
+                            ' supported Python versions.')
+                    else:
+                        del value[index]
+                        changes.append(f'{option}: removed {str(item)!r}.')
+            elif isinstance(value, str) and dropped_re.search(value):
+                review.append(
+                    f'{option} mentions a dropped Python version.')
+    oldest = meta_toml.get('python', {}).get('oldest-python')
+    if oldest is not None and tuple(map(int, oldest.split('.'))) < tuple(
+            map(int, OLDEST_PYTHON_VERSION.split('.'))):
+        review.append(
+            f'[python] oldest-python keeps supporting Python {oldest}.')
+    return changes, review
+
+
+def pyupgrade_cache_path():
+    """Return the path of the file remembering already upgraded content."""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or (
+        pathlib.Path.home() / '.cache')
+    return pathlib.Path(cache_home) / 'zope.meta' / 'pyupgrade.json'
+
+
+def file_hash(path):
+    return hashlib.sha256(pathlib.Path(path).read_bytes()).hexdigest()
+
+
+def pyupgrade_executable():
+    """Return the `pyupgrade` script installed next to this interpreter."""
+    script = pathlib.Path(sys.executable).parent / 'pyupgrade'
+    if script.exists():
+        return str(script)
+    return shutil.which('pyupgrade') or 'pyupgrade'
+
+
+def _run_pyupgrade(paths, python_version):
+    """Run the `pyupgrade` script on `paths`.
+
+    Return its output if it failed, `None` otherwise.
+    """
+    result = subprocess.run(
+        [pyupgrade_executable(), '--exit-zero-even-if-changed',
+         f'--py{python_version.replace(".", "")}-plus', *map(str, paths)],
+        capture_output=True, text=True)
+    if not result.returncode:
+        return None
+    return '\n'.join(
+        line for line in (result.stdout + result.stderr).splitlines()
+        if line and not line.startswith('Rewriting ')) or (
+        f'pyupgrade exited with {result.returncode}')
+
+
+def _pyupgrade_chunk(paths, python_version):
+    """Run pyupgrade on `paths`, return the errors per path."""
+    if _run_pyupgrade(paths, python_version) is None:
+        return {}
+    # Find out which of the files failed:
+    errors = {}
+    for path in paths:
+        error = _run_pyupgrade([path], python_version)
+        if error is not None:
+            errors[path] = error
+    return errors
+
+
+def pyupgrade_files(paths, python_version, jobs=None, cache_path=None):
+    """Upgrade the syntax of `paths` to `python_version` in parallel.
+
+    The `pyupgrade` script runs in `jobs` processes at once, defaulting to
+    the number of CPUs, each one upgrading a part of the files. Files whose
+    content is recorded in `cache_path` as already upgraded for
+    `python_version` are skipped. Return the paths of the changed files and
+    the errors of the files pyupgrade failed for by path.
+    """
+    from importlib.metadata import version
+
+    key = f'pyupgrade-{version("pyupgrade")}-py{python_version}'
+    cache = {}
+    if cache_path is not None and cache_path.exists():
+        cache = json.loads(cache_path.read_text())
+    upgraded = set(cache.get(key, []))
+    hashes = {path: file_hash(path) for path in paths}
+    todo = [path for path, digest in hashes.items() if digest not in upgraded]
+    errors = {}
+    if todo:
+        count = min(len(todo), jobs or os.cpu_count())
+        with concurrent.futures.ThreadPoolExecutor(count) as pool:
+            for chunk_errors in pool.map(
+                    _pyupgrade_chunk,
+                    [todo[index::count] for index in range(count)],
+                    [python_version] * count):
+                errors.update(chunk_errors)
+    changed = []
+    for path in todo:
+        if path in errors:
+            continue
+        digest = file_hash(path)
+        upgraded.add(digest)
+        if digest != hashes[path]:
+            changed.append(path)
+    if cache_path is not None:
+        cache[key] = sorted(upgraded)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(cache))
+    return changed, errors
+
+
+def version_key(version):
+    return tuple(int(part) for part in version.split('.'))
+
+
+def changelog_entries(no_longer_supported, not_yet_supported,
+                      with_future_python=False):
+    """Return the change log entries describing the version changes."""
+    entries = []
+    if no_longer_supported:
+        version_spec = ', '.join(sorted(no_longer_supported, key=version_key))
+        entries.append(f'Drop support for Python {version_spec}.')
+    if not_yet_supported:
+        version_spec = ', '.join(sorted(not_yet_supported, key=version_key))
+        entries.append(f'Add support for Python {version_spec}.')
+    if with_future_python:
+        entries.append(
+            f'Add preliminary support for Python {FUTURE_PYTHON_VERSION}.')
+    return entries
+
+
+def update_package(path, args):
+    """Update the package at `path` to the supported Python versions.
+
+    In contrast to the interactive mode nothing is asked: `.meta.toml` is
+    adapted by `apply_meta_toml_rules()` instead of an editor,
+    ``zest.releaser``, ``check-python-versions``, ``config-package`` and
+    ``pyupgrade`` run in-process and all changes end up in a single commit.
+    Return a report of the changes and of what needs a human review.
+    """
+    import tomlkit
+    from check_python_versions.cli import parse_version_list
+    from check_python_versions.cli import update_versions
+    from zest.releaser import utils as zest_utils
+    from zest.releaser.addchangelogentry import AddChangelogEntry
+    from zest.releaser.bumpversion import BumpVersion
+
+    from .config_package import PackageConfiguration
+    from .config_package import handle_command_line_arguments
+
+    path = pathlib.Path(path).absolute()
+    report = {'package': path.name, 'status': 'unchanged', 'dropped': [],
+              'added': [], 'changes': [], 'review': [], 'files': []}
+    with change_dir(path):
+        meta_toml_path = pathlib.Path('.meta.toml')
+        meta_toml = tomlkit.loads(meta_toml_path.read_text())
+        values = collections.defaultdict(dict, **meta_toml.unwrap())
+        oldest_python_version = values['python'].get(
+            'oldest-python', OLDEST_PYTHON_VERSION)
+        supported = supported_python_versions(oldest_python_version)
+        no_longer_supported, not_yet_supported = python_version_changes(
+            values, 'tox.ini')
+        report['dropped'] = sorted(no_longer_supported, key=version_key)
+        report['added'] = sorted(not_yet_supported, key=version_key)
+        if not (no_longer_supported or not_yet_supported):
+            return report
+
+        branch_name = get_branch_name(
+            args.branch_name, values['meta']['template'])
+        updating = git_branch(branch_name)
+        start = call('git', 'rev-parse', 'HEAD',
+                     capture_output=True).stdout.strip()
+
+        zest_utils.AUTO_RESPONSE = True
+        try:
+            BumpVersion(feature=True).run()
+        except SystemExit as e:
+            # zest.releaser exits with 0 if no bump is needed.
+            if e.code:
+                raise
+        for entry in changelog_entries(
+                no_longer_supported, not_yet_supported,
+                args.with_future_python):
+            AddChangelogEntry(message=entry).run()
+        replacements = update_versions(
+            '.',
+            add=parse_version_list(','.join(supported))
+            if not_yet_supported else None,
+            drop=parse_version_list(','.join(report['dropped']))
+            if no_longer_supported else None,
+            dry_run=True,
+            only={'setup.py'})
+        for file_name, lines in replacements.items():
+            pathlib.Path(file_name).write_text(''.join(lines))
+
+        changes, review = apply_meta_toml_rules(
+            meta_toml, no_longer_supported, supported)
+        if changes:
+            meta_toml_path.write_text(tomlkit.dumps(meta_toml))
+        report['changes'].extend(changes)
+        report['review'].extend(review)
+
+        config_package_args = [
+            str(path), f'--branch={branch_name}', '--no-push', '--no-commit',
+            '--no-tests']
+        if args.with_future_python:
+            config_package_args.append('--with-future-python')
+        if args.with_free_threaded_python:
+            config_package_args.append('--with-free-threaded-python')
+        if args.overrides_path:
+            config_package_args.append(f'--overrides={args.overrides_path}')
+        PackageConfiguration(
+            handle_command_line_arguments(config_package_args)).write_files()
+
+        files = python_files(path)
+        changed, errors = pyupgrade_files(
+            files, oldest_python_version, cache_path=pyupgrade_cache_path())
+        for file_path in changed:
+            report['changes'].append(
+                f'pyupgrade: {file_path.relative_to(path)}')
+        for file_path, error in errors.items():
+            report['review'].append(
+                f'pyupgrade failed for {file_path.relative_to(path)}:'
+                f' {error}')
+        report['review'].extend(format_findings(
+            scan((file_path, oldest_python_version) for file_path in files),
+            path))
+
+        tests_passed = True
+        if args.run_tests:
+            tox_path = shutil.which('tox') or (path / 'bin' / 'tox')
+            tests_passed = subprocess.run(
+                [tox_path, '-p', 'auto']).returncode == 0
+            if not tests_passed:
+                report['review'].append('The tests failed, see the log.')
+
+        # zest.releaser commits each step, combine them into one commit:
+        call('git', 'reset', '--soft', start)
+        if args.commit:
+            call('git', 'add', '.')
+            call('git', 'commit', '-m', 'Update Python version support.')
+            if args.push and tests_passed:
+                call('git', 'push', '--set-upstream', 'origin', branch_name)
+                if not updating:
+                    call('gh', 'pr', 'create', '--fill', '--title',
+                         'Update Python version support.')
+        changed = call('git', 'diff', '--name-only', start,
+                       capture_output=True).stdout.splitlines()
+        untracked = call('git', 'ls-files', '--others', '--exclude-standard',
+                         capture_output=True).stdout.splitlines()
+        report['files'] = sorted({*changed, *untracked})
+        report['status'] = 'review' if report['review'] else 'updated'
+    return report
+
+
+def _update_package_logged(path, args, log_path):
+    """Call `update_package()` writing all output to `log_path`.
+
+    Questions are answered with EOF, so they fail the package instead of
+    waiting. Failures are returned as reports with the status `failed`.
+    """
+    with open(log_path, 'w') as log, output_to(log):
+        try:
+            report = update_package(path, args)
+        except (Exception, SystemExit):
+            traceback.print_exc()
+            report = {
+                'package': pathlib.Path(path).name,
+                'status': 'failed',
+                'error': traceback.format_exc().strip().splitlines()[-1]}
+    report['log'] = str(log_path)
+    return report
+
+
+def update_packages(paths, args, log_dir, jobs=None):
+    """Update the packages at `paths` in a pool of `jobs` processes.
+
+    The output of each package is written to a log file in `log_dir`.
+    Return the reports of the packages.
+    """
+    log_dir = pathlib.Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    reports = []
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = [
+            pool.submit(_update_package_logged, path, args,
+                        log_dir / f'{pathlib.Path(path).name}.log')
+            for path in paths]
+        for future in concurrent.futures.as_completed(futures):
+            report = future.result()
+            reports.append(report)
+            print(f'[{len(reports)}/{len(futures)}] {report["package"]}:'
+                  f' {report["status"]}')
+    return sorted(reports, key=lambda report: report['package'])
+
+
+#: Order of the statuses in the consolidated report.
+STATUSES = ('failed', 'review', 'updated', 'unchanged')
+
+
+def format_report(reports):
+    """Return the consolidated report of `update_package()` results."""
+    lines = []
+    for status in STATUSES:
+        for report in reports:
+            if report['status'] != status or status == 'unchanged':
+                continue
+            versions = []
+            if report.get('dropped'):
+                versions.append(f'dropped {", ".join(report["dropped"])}')
+            if report.get('added'):
+                versions.append(f'added {", ".join(report["added"])}')
+            details = f' ({"; ".join(versions)})' if versions else ''
+            lines.append(f'{report["package"]}: {status}{details}')
+            if report.get('error'):
+                lines.append(f'  error: {report["error"]}')
+            if report.get('files'):
+                lines.append(f'  changed: {", ".join(report["files"])}')
+            for change in report.get('changes', []):
+                lines.append(f'  {change}')
+            for item in report.get('review', []):
+                lines.append('  review: ' + item.replace('\n', '\n    '))
+            if status == 'failed' and report.get('log'):
+                lines.append(f'  log: {report["log"]}')
+    counts = collections.Counter(report['status'] for report in reports)
+    lines.append(
+        f'{len(reports)} packages: '
+        + ', '.join(f'{counts[status]} {status}' for status in STATUSES))
+    return '\n'.join(lines)
+
+
 def main():
     parser = get_shared_parser(
         'Update Python versions of a package to currently supported ones.',
@@ -65,9 +473,59 @@ def main():
         action='store_true',
         default=False,
         help='Also enable testing with free-threaded Python (nogil).')
+    parser.add_argument(
+        '--unattended',
+        dest='unattended',
+        action='store_true',
+        default=False,
+        help='Do not ask anything: adapt .meta.toml using rules, combine all'
+        ' changes into one commit and report what needs a review.')
+    parser.add_argument(
+        '--fleet',
+        dest='fleet',
+        action='store_true',
+        default=False,
+        help='`path` is a folder with clones of the packages: update all known'
+        ' packages cloned there in parallel. Implies --unattended. Nothing is'
+        ' pushed unless --push is given.')
+    parser.add_argument(
+        '--push',
+        dest='fleet_push',
+        action='store_true',
+        default=False,
+        help='With --fleet push the branches with passing tests and create'
+        ' pull requests.')
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Number of packages updated in parallel with --fleet. Defaults'
+        ' to the number of CPUs.')
+    parser.add_argument(
+        '--report',
+        type=pathlib.Path,
+        default=None,
+        help='Also write the report of an unattended run as JSON to this'
+        ' file.')
     args = parser.parse_args()
     path = args.path.absolute()
 
+    if args.fleet or args.unattended:
+        if args.fleet:
+            args.push = args.push and args.fleet_push
+            paths = [path / name for name in all_repos()
+                     if (path / name / '.meta.toml').exists()]
+            reports = update_packages(
+                paths, args, path / 'update-python-support-logs', args.jobs)
+        else:
+            reports = [update_package(path, args)]
+        print(format_report(reports))
+        if args.report:
+            args.report.write_text(json.dumps(reports, indent=2) + '\n')
+        if any(report['status'] == 'failed' for report in reports):
+            sys.exit(1)
+        return
+
     if not (path / '.git').exists():
         raise ValueError(
             '`path` does not point to a git clone of a repository!')
@@ -77,29 +535,15 @@ def main():
     with change_dir(path) as cwd_str:
         cwd = pathlib.Path(cwd_str)
         bin_dir = cwd / 'bin'
-        with open('.meta.toml', 'rb') as meta_f:
-            meta_toml = collections.defaultdict(dict, **tomlkit.load(meta_f))
+        meta_toml = collections.defaultdict(
+            dict, **load_toml(pathlib.Path('.meta.toml')))
         config_type = meta_toml['meta']['template']
         oldest_python_version = meta_toml['python'].get('oldest-python',
                                                         OLDEST_PYTHON_VERSION)
         branch_name = get_branch_name(args.branch_name, config_type)
         updating = git_branch(branch_name)
-        to_be_supported = set(supported_python_versions(oldest_python_version))
-
-        current_python_versions = get_tox_ini_python_versions('tox.ini')
-        no_longer_supported = (
-            current_python_versions -
-            to_be_supported
-        )
-        not_yet_supported = (
-            to_be_supported -
-            current_python_versions
-        )
-        if (meta_toml['python'].get('with-future-python', True) and
-                NEWEST_PYTHON_VERSION in to_be_supported):
-            # If with-future-python is enabled, the newest python version is
-            # already in `tox.ini` but not yet in `setup.py`:
-            not_yet_supported.add(NEWEST_PYTHON_VERSION)
+        no_longer_supported, not_yet_supported = python_version_changes(
+            meta_toml, 'tox.ini')
 
         non_interactive_params = []
         python_versions_args = []
@@ -163,37 +607,26 @@ def main():
                     f'--overrides={args.overrides_path}')
             call(*config_package_args, cwd=cwd_str)
             src = path.resolve() / 'src'
-            py_ver_plus = f'--py{oldest_python_version.replace(".", "")}-plus'
-            call('find', src, '-name', '*.py', '-exec', bin_dir / 'pyupgrade',
-                 '--py3-plus', py_ver_plus, '{}', ';')
-            call(bin_dir / 'pyupgrade',
-                 '--py3-plus',
-                 py_ver_plus,
-                 'setup.py',
-                 allowed_return_codes=(0, 1))
-
-            excludes = (
-                '--exclude-dir',
-                '__pycache__',
-                '--exclude-dir',
-                '*.egg-info',
-                '--exclude',
-                '*.pyc',
-                '--exclude',
-                '*.so')
-            print('Replace any remaining code that might'
-                  ' support legacy Python:')
-            call(
-                'egrep',
-                '-rn',
-                f'{"|".join(no_longer_supported)}|sys.version|PY3|Py3|Python 3'
-                '|__unicode__|ImportError',
-                src,
-                *excludes,
-                allowed_return_codes=(
-                    0,
-                    1))
-            wait_for_accept()
+            files = python_files(src.parent)
+            changed, errors = pyupgrade_files(
+                files, oldest_python_version,
+                cache_path=pyupgrade_cache_path())
+            print(f'pyupgrade changed {len(changed)} of {len(files)}'
+                  ' Python files.')
+            for file_path in changed:
+                print(f'  {file_path.relative_to(src.parent)}')
+            for file_path, error in errors.items():
+                print(f'pyupgrade failed for'
+                      f' {file_path.relative_to(src.parent)}: {error}')
+
+            findings = scan(
+                (file_path, oldest_python_version)
+                for file_path in python_files(src.parent))
+            if findings:
+                print('Replace the remaining code supporting legacy Python:')
+                for line in format_findings(findings, src.parent):
+                    print(line)
+                wait_for_accept()
 
             if args.run_tests:
                 tox_path = shutil.which('tox') or (cwd / 'bin' / 'tox')
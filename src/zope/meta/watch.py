@@ -0,0 +1,191 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Watch mode of `config-package`: re-render when templates change."""
+import argparse
+import collections
+import contextlib
+import ctypes
+import os
+import pathlib
+import select
+import struct
+import sys
+import time
+
+from .shared.diff import configured_files
+from .shared.diff import scratch_copy
+from .shared.diff import unified_diffs
+from .shared.templates import templates_fed_by
+
+
+class PollingWatcher:
+    """Detect changed files in `folders` by comparing modification times."""
+
+    def __init__(self, folders, interval=0.5):
+        self.folders = [pathlib.Path(f).resolve() for f in folders]
+        self.interval = interval
+        self._snapshot = self.snapshot()
+
+    def snapshot(self):
+        return {
+            path: path.stat().st_mtime_ns
+            for folder in self.folders if folder.is_dir()
+            for path in folder.iterdir() if path.is_file()}
+
+    def __iter__(self):
+        """Yield sets of changed, added or removed files."""
+        while True:
+            time.sleep(self.interval)
+            old, self._snapshot = self._snapshot, self.snapshot()
+            changed = {
+                path for path in old.keys() | self._snapshot.keys()
+                if old.get(path) != self._snapshot.get(path)}
+            if changed:
+                yield changed
+
+
+class InotifyWatcher:
+    """Detect changed files in `folders` using inotify (Linux only).
+
+    Raises `OSError` if inotify is not available.
+    """
+
+    # Editors often write a temporary file and move it over the original one.
+    MASK = (0x00000008  # IN_CLOSE_WRITE
+            | 0x00000080  # IN_MOVED_TO
+            | 0x00000200)  # IN_DELETE
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, folders, debounce=0.1):
+        if not sys.platform.startswith('linux'):
+            raise OSError('inotify is only available on Linux.')
+        self.debounce = debounce
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'Cannot initialize inotify.')
+        self._folders = {}
+        for folder in folders:
+            folder = pathlib.Path(folder).resolve()
+            if not folder.is_dir():
+                continue
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(folder), self.MASK)
+            if wd < 0:
+                os.close(self._fd)
+                raise OSError(ctypes.get_errno(), f'Cannot watch {folder}.')
+            self._folders[wd] = folder
+
+    def _read(self):
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if wd in self._folders and name:
+                changed.add(self._folders[wd] / os.fsdecode(name))
+        return changed
+
+    def __iter__(self):
+        """Yield sets of changed, added or removed files."""
+        try:
+            while True:
+                select.select([self._fd], [], [])
+                changed = self._read()
+                # Collect the further events of the same save.
+                while select.select([self._fd], [], [], self.debounce)[0]:
+                    changed |= self._read()
+                if changed:
+                    yield changed
+        finally:
+            os.close(self._fd)
+
+
+def make_watcher(folders):
+    """Return an inotify watcher for `folders` or a polling one."""
+    try:
+        return InotifyWatcher(folders)
+    except OSError:
+        return PollingWatcher(folders)
+
+
+def rerender(package, changed_paths):
+    """Render the outputs of `package` fed by the changed template files.
+
+    Return the changes as unified diffs.
+    """
+    from .config_package import TEMPLATE_RENDERERS
+
+    folders = {pathlib.Path(f).resolve() for f in package.template_folders}
+    changed_names = {
+        path.name for path in changed_paths
+        if pathlib.Path(path).parent in folders}
+    if not changed_names:
+        return {}
+    env = package.jinja_env
+    # Do not miss templates added in front of the one cached so far.
+    env.cache.clear()
+    template_names = templates_fed_by(
+        env, TEMPLATE_RENDERERS, changed_names)
+    before = configured_files(package.path)
+    package.render_templates(template_names)
+    return unified_diffs(before, configured_files(package.path))
+
+
+def watch(args, paths, watcher=None):
+    """Render `paths` and show the changes whenever a template changes.
+
+    The packages are rendered in temporary copies, the clones stay untouched.
+    The diffs show the effect of the last template change.
+    """
+    from .config_package import PackageConfiguration
+
+    paths = [pathlib.Path(path).resolve() for path in paths]
+    names = collections.Counter(path.name for path in set(paths))
+    # Clones with the same name are shown with their whole path.
+    labels = {path: path.name if names[path.name] == 1 else str(path)
+              for path in paths}
+    with contextlib.ExitStack() as stack:
+        packages = {}
+        for path in labels:
+            copy = stack.enter_context(scratch_copy(path))
+            package = PackageConfiguration(
+                argparse.Namespace(**dict(vars(args), path=copy)))
+            print(f'Rendering {labels[path]} …')
+            package.write_files()
+            packages[path] = package
+
+        folders = list(dict.fromkeys(
+            folder for package in packages.values()
+            for folder in package.template_folders))
+        if watcher is None:
+            watcher = make_watcher(folders)
+        print(f'Watching {len(folders)} template folders using'
+              f' {type(watcher).__name__}, press Ctrl-C to stop.')
+        try:
+            for changed_paths in watcher:
+                names = ', '.join(sorted(p.name for p in changed_paths))
+                print(f'*** Changed: {names} ***')
+                for path, package in packages.items():
+                    name = labels[path]
+                    diffs = rerender(package, changed_paths)
+                    if not diffs:
+                        print(f'{name}: no changes')
+                    for diff in diffs.values():
+                        print(f'{name}:')
+                        print(diff, end='')
+        except KeyboardInterrupt:
+            pass